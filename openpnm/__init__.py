@@ -54,19 +54,24 @@ It consists of the following submodules:
 
 from .__version__ import __version__
 
-from . import core
-from . import utils
-from . import network
-from . import geometry
-from . import phases
-from . import physics
-from . import models
-from . import algorithms
-from . import materials
-from . import topotools
-from . import io
-
-from .utils import Workspace, Project
-
 import numpy
 numpy.seterr(divide='ignore', invalid='ignore')
+
+# The submodules are only imported when first accessed (PEP 562), so scripts
+# that need a small part of OpenPNM don't pay for importing all of it
+_submodules = ['core', 'utils', 'network', 'geometry', 'phases', 'physics',
+               'models', 'algorithms', 'materials', 'topotools', 'io']
+_utils_attrs = ['Workspace', 'Project']
+
+
+def __getattr__(name):
+    import importlib
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    if name in _utils_attrs:
+        return getattr(importlib.import_module('.utils', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + _submodules + _utils_attrs)
@@ -452,11 +452,12 @@ class GenericTransport(GenericAlgorithm):
             raise Exception('conductance has not been defined on this algorithm')
         # Decide if caching of A and b is allowed
         # FIXME: this needs to be properly addressed (see issue #1548)
-        try:
-            if gvals in self._get_iterative_props():
-                self.settings.update({"cache_A": False, "cache_b": False})
-        except AttributeError:
-            pass
+        if self.settings['cache_A']:
+            try:
+                if gvals in self._get_iterative_props():
+                    self.settings.update({"cache_A": False, "cache_b": False})
+            except AttributeError:
+                pass
         if not self.settings['cache_A']:
             self._pure_A = None
         if self._pure_A is None:
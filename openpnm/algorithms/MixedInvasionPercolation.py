@@ -9,6 +9,7 @@ import logging
 import heapq as hq
 import scipy as sp
 import numpy as np
+import scipy.sparse as sprs
 from collections import namedtuple
 from openpnm.algorithms import GenericAlgorithm
 from openpnm.topotools import find_clusters, site_percolation
@@ -306,6 +307,20 @@ class MixedInvasionPercolation(GenericAlgorithm):
             The maximum pressure applied to the invading cluster. Any pores and
             throats with entry pressure above this value will not be invaded.
 
+        Notes
+        -----
+        The invasion is performed by a compiled engine which stores the queue
+        of each cluster as an array-backed pairing heap, so clusters can be
+        merged in constant time.  Pores and throats share a single index space
+        in the heaps, with pore ``i`` stored as ``2*i`` and throat ``i`` as
+        ``2*i + 1``, so that ties in entry pressure are broken in the same
+        order as the ``[pressure, index, type]`` entries held in ``queue``
+        (i.e. by index, then pores before throats).  Entries
+        for elements that were already invaded when their cluster was merged
+        are discarded as they reach the top of the heap rather than at the
+        time of merging.  The queues are converted back to lists when the
+        engine returns, so ``run`` can be called again.
+
         """
         if "throat.entry_pressure" not in self.keys():
             logger.error("Setup method must be run first")
@@ -317,118 +332,89 @@ class MixedInvasionPercolation(GenericAlgorithm):
         if len(self.queue) == 0:
             logger.warn("queue is empty, this network is fully invaded")
             return
+        net = self.project.network
+        Nc = len(self.queue)
         # track whether each cluster has reached the maximum pressure
-        self.max_p_reached = [False] * len(self.queue)
+        self.max_p_reached = [False] * Nc
         # starting invasion sequence
         self.count = 0
         # highest pressure reached so far - used for porosimetry curve
-        self.high_Pc = np.ones(len(self.queue)) * -np.inf
+        self.high_Pc = np.ones(Nc) * -np.inf
         outlets = self["pore.outlets"]
         terminate_clusters = np.sum(outlets) > 0
         if not hasattr(self, "invasion_running"):
-            self.invasion_running = [True] * len(self.queue)
+            self.invasion_running = [True] * Nc
         else:
             # created by set_residual
             pass
-        while np.any(self.invasion_running) and not np.all(self.max_p_reached):
-            # Loop over clusters
-            for c_num in np.argwhere(self.invasion_running).flatten():
-                self._invade_cluster(c_num)
-                queue = self.queue[c_num]
-                if len(queue) == 0 or self.max_p_reached[c_num]:
-                    # If the cluster contains no more entries invasion has
-                    # finished
-                    self.invasion_running[c_num] = False
-            if self.settings["invade_isolated_Ts"]:
-                self._invade_isolated_Ts()
-            if terminate_clusters:
-                # terminated clusters
-                tcs = np.unique(self["pore.cluster"][outlets]).astype(int)
-                tcs = tcs[tcs >= 0]
-                if len(tcs) > 0:
-                    for tc in tcs:
-                        if self.invasion_running[tc] is True:
-                            self.invasion_running[tc] = False
-                            logger.info(
-                                "Cluster "
-                                + str(tc)
-                                + " reached "
-                                + " outlet at sequence "
-                                + str(self.count)
-                            )
-
-    def _invade_cluster(self, c_num):
-        queue = self.queue[c_num]
-        pressure, elem_id, elem_type = hq.heappop(queue)
-        if elem_type == "pore":
-            self._interface_Ps[elem_id] = False
-        else:
-            self._interface_Ts[elem_id] = False
-        if pressure > self.max_pressure:
-            self.max_p_reached[c_num] = True
+        # Gather the queued entries into arrays
+        entries = [(e[0], 2*np.ravel(e[1])[0] + (e[2] == "throat"), c)
+                   for c, queue in enumerate(self.queue) for e in queue]
+        entries = np.array(entries, dtype=float).reshape(-1, 3)
+        t_entry = np.asarray(self["throat.entry_pressure"], dtype=float)
+        if t_entry.ndim == 1:
+            t_entry = np.vstack((t_entry, t_entry)).T
+        am = net.create_incidence_matrix(fmt="csr")
+        if self.settings["cooperative_pore_filling"] and hasattr(self, "tt_Pc"):
+            tt = self.tt_Pc.tocsr()
+            coop = True
         else:
-            elem_cluster = self[elem_type + ".cluster"][elem_id]
-            elem_cluster = elem_cluster.astype(int)
-            # Cluster is the uninvaded cluster
-            if elem_cluster == -1:
-                self.count += 1
-                # Record highest Pc cluster has reached
-                if self.high_Pc[c_num] < pressure:
-                    self.high_Pc[c_num] = pressure
-                # The newly invaded element is available for
-                # invasion
-                self[elem_type + ".invasion_sequence"][elem_id] = self.count
-                self[elem_type + ".cluster"][elem_id] = c_num
-                self[elem_type + ".invasion_pressure"][elem_id] = self.high_Pc[c_num]
-                if elem_type == "throat":
-                    self._add_ps2q(elem_id, queue)
-                elif elem_type == "pore":
-                    self._add_ts2q(elem_id, queue)
-                    if self.settings["cooperative_pore_filling"] and hasattr(
-                        self, "tt_Pc"
-                    ):
-                        self._check_coop(elem_id, queue)
-            # Element is part of existing cluster that is still invading
-            elif elem_cluster != c_num and self.invasion_running[elem_cluster]:
-                # The newly invaded element is part of an invading
-                # cluster. Merge the clusters using the existing
-                # cluster number)
-                self._merge_cluster(c2keep=c_num, c2empty=elem_cluster)
-                logger.info(
-                    "Merging cluster "
-                    + str(elem_cluster)
-                    + " into cluster "
-                    + str(c_num)
-                    + " at sequence "
-                    + str(self.count)
-                )
-            # Element is part of residual cluster - now invasion can start
-            elif elem_cluster != c_num and len(self.queue[elem_cluster]) > 0:
-                # The newly invaded element is part of an invading
-                # cluster. Merge the clusters using the existing
-                # cluster number)
-                self._merge_cluster(c2keep=c_num, c2empty=elem_cluster)
-                logger.info(
-                    "Merging residual cluster "
-                    + str(elem_cluster)
-                    + " into cluster "
-                    + str(c_num)
-                    + " at sequence "
-                    + str(self.count)
-                )
-            else:
-                pass
-
-    def _merge_cluster(self, c2keep, c2empty):
-        r"""
-        Little helper function to merger clusters but only add the uninvaded
-        elements
-        """
-        while len(self.queue[c2empty]) > 0:
-            temp = [_pc, _id, _type] = hq.heappop(self.queue[c2empty])
-            if self[_type + ".invasion_sequence"][_id] == -1:
-                hq.heappush(self.queue[c2keep], temp)
-        self.invasion_running[c2empty] = False
+            tt = sprs.csr_matrix((net.Nt, net.Nt))
+            coop = False
+        arrays = {
+            "pore.invasion_sequence": np.int64,
+            "throat.invasion_sequence": np.int64,
+            "pore.cluster": np.int64,
+            "throat.cluster": np.int64,
+            "pore.invasion_pressure": float,
+            "throat.invasion_pressure": float,
+        }
+        arrays = {k: self[k].astype(v) for k, v in arrays.items()}
+        running = np.array(self.invasion_running, dtype=bool)
+        max_p_reached = np.array(self.max_p_reached, dtype=bool)
+        engine = _get_engine()
+        self.count, q_key, q_uid, q_cluster = engine(
+            conns=net["throat.conns"].astype(np.int64),
+            indptr=am.indptr.astype(np.int64),
+            indices=am.indices.astype(np.int64),
+            p_entry=np.asarray(self["pore.entry_pressure"], dtype=float),
+            t_entry=t_entry,
+            bidirectional=self._bidirectional,
+            p_seq=arrays["pore.invasion_sequence"],
+            t_seq=arrays["throat.invasion_sequence"],
+            p_clu=arrays["pore.cluster"],
+            t_clu=arrays["throat.cluster"],
+            p_pc=arrays["pore.invasion_pressure"],
+            t_pc=arrays["throat.invasion_pressure"],
+            p_int=self._interface_Ps,
+            t_int=self._interface_Ts,
+            q_key=entries[:, 0].copy(),
+            q_uid=entries[:, 1].astype(np.int64),
+            q_cluster=entries[:, 2].astype(np.int64),
+            running=running,
+            max_p_reached=max_p_reached,
+            high_Pc=self.high_Pc,
+            outlets=outlets.astype(bool),
+            terminate=terminate_clusters,
+            isolated=bool(self.settings["invade_isolated_Ts"]),
+            max_pressure=float(self.max_pressure),
+            coop=coop,
+            tt_indptr=tt.indptr.astype(np.int64),
+            tt_indices=tt.indices.astype(np.int64),
+            tt_data=tt.data.astype(float),
+        )
+        for k, v in arrays.items():
+            self[k] = v
+        self.invasion_running = running.tolist()
+        self.max_p_reached = max_p_reached.tolist()
+        # Convert the remaining entries back to queues
+        self.queue = [[] for _ in range(Nc)]
+        types = np.array(["pore", "throat"])[q_uid % 2]
+        for k, i, t, c in zip(q_key, q_uid // 2, types, q_cluster):
+            self.queue[c].append([k, i, t])
+        for queue in self.queue:
+            hq.heapify(queue)
+        logger.info("Invasion finished at sequence " + str(self.count))
 
     def results(self, Pc):
         r"""
@@ -854,32 +840,331 @@ class MixedInvasionPercolation(GenericAlgorithm):
             if c_num > initial_num:
                 self.invasion_running[c_num] = False
 
-    def _invade_isolated_Ts(self):
-        r"""
-        Throats that are uninvaded connected to pores that are both invaded
-        should be invaded too.
-        """
-        net = self.project.network
-        Ts = net["throat.conns"].copy()
-        invaded_Ps = self["pore.invasion_sequence"] > -1
-        uninvaded_Ts = self["throat.invasion_sequence"] == -1
-        isolated_Ts = np.logical_and(invaded_Ps[Ts[:, 0]], invaded_Ps[Ts[:, 1]])
-        isolated_Ts = np.logical_and(isolated_Ts, uninvaded_Ts)
-        inv_Pc = self["pore.invasion_pressure"]
-        inv_seq = self["pore.invasion_sequence"]
-        if np.any(isolated_Ts):
-            max_array = Ts[:, 0]
-            second_higher = inv_seq[Ts][:, 1] > inv_seq[Ts][:, 0]
-            max_array[second_higher] = Ts[:, 1][second_higher]
-            mPc = inv_Pc[max_array]
-            mSeq = inv_seq[max_array]
-            mClu = self["pore.cluster"][max_array]
-            self["throat.invasion_pressure"][isolated_Ts] = mPc[isolated_Ts]
-            self["throat.invasion_sequence"][isolated_Ts] = mSeq[isolated_Ts]
-            self["throat.cluster"][isolated_Ts] = mClu[isolated_Ts]
-
     def _check_coop(self):
         r"""
         Not implemented in this class
         """
         pass
+
+
+_engine = []
+
+
+def _get_engine():
+    r"""
+    Compiles the invasion engine on first use and returns it
+
+    Notes
+    -----
+    (1) Numba is imported here rather than at the top of the module to keep
+    the OpenPNM import time down, and the compiled function is kept so it is
+    only compiled once per session.
+
+    (2) The queues of all clusters live in one pool of heap nodes, stored as
+    arrays of keys (entry pressure), unified element ids, origin clusters,
+    and the child and sibling pointers of a pairing heap.  Every node that
+    can be pushed during a run is accounted for when the pool is allocated,
+    so it never needs to grow.
+
+    (3) When a cluster is merged into another its heap is melded into the
+    other's in constant time.  Clusters are tracked in a union-find structure
+    which records the step at which each was merged, so a node that came from
+    a merged cluster can be recognized as stale (i.e. its element was invaded
+    before the merge) when it reaches the top of the heap.
+
+    """
+    if _engine:
+        return _engine[0]
+    from numba import njit
+
+    @njit
+    def less(key, uid, a, b):
+        return key[a] < key[b] or (key[a] == key[b] and uid[a] < uid[b])
+
+    @njit
+    def meld(key, uid, child, sib, a, b):
+        if a < 0:
+            return b
+        if b < 0:
+            return a
+        if less(key, uid, b, a):
+            a, b = b, a
+        sib[b] = child[a]
+        child[a] = b
+        return a
+
+    @njit
+    def pop(key, uid, child, sib, scratch, root):
+        # Two-pass pairing of the children of the root
+        n = 0
+        c = child[root]
+        while c >= 0:
+            scratch[n] = c
+            c_next = sib[c]
+            sib[c] = -1
+            c = c_next
+            n += 1
+        child[root] = -1
+        m = 0
+        i = 0
+        while i + 1 < n:
+            scratch[m] = meld(key, uid, child, sib, scratch[i], scratch[i+1])
+            m += 1
+            i += 2
+        if i < n:
+            scratch[m] = scratch[i]
+            m += 1
+        new_root = -1
+        for j in range(m - 1, -1, -1):
+            new_root = meld(key, uid, child, sib, scratch[j], new_root)
+        return new_root
+
+    @njit
+    def merged_at(parent, merge_step, c):
+        # Returns the step at which the cluster c was last merged into the
+        # cluster which now holds its nodes, compressing the path as it goes
+        r = c
+        last = -1
+        while parent[r] != r:
+            last = merge_step[r]
+            r = parent[r]
+        while parent[c] != c:
+            c_next = parent[c]
+            parent[c] = r
+            merge_step[c] = last
+            c = c_next
+        return last
+
+    @njit
+    def engine(conns, indptr, indices, p_entry, t_entry, bidirectional,
+               p_seq, t_seq, p_clu, t_clu, p_pc, t_pc, p_int, t_int,
+               q_key, q_uid, q_cluster, running, max_p_reached, high_Pc,
+               outlets, terminate, isolated, max_pressure, coop,
+               tt_indptr, tt_indices, tt_data):
+        Np = p_seq.size
+        Nt = t_seq.size
+        Nc = running.size
+        # Allocate the node pool
+        size = q_key.size + 4*Nt + 2*tt_data.size + 1
+        key = np.empty(size, np.float64)
+        uid = np.empty(size, np.int64)
+        origin = np.empty(size, np.int64)
+        child = np.full(size, -1, np.int64)
+        sib = np.full(size, -1, np.int64)
+        scratch = np.empty(size, np.int64)
+        roots = np.full(Nc, -1, np.int64)
+        n_nodes = 0
+        # Union-find of merged clusters
+        parent = np.arange(Nc)
+        merge_step = np.full(Nc, -1, np.int64)
+        # Step at which each element was invaded, -1 if before the run
+        never = np.iinfo(np.int64).max
+        inv_step = np.full(2*max(Np, Nt), never, np.int64)
+        for i in range(Np):
+            if p_seq[i] != -1:
+                inv_step[2*i] = -1
+        for i in range(Nt):
+            if t_seq[i] != -1:
+                inv_step[2*i + 1] = -1
+        for i in range(q_key.size):
+            key[n_nodes] = q_key[i]
+            uid[n_nodes] = q_uid[i]
+            origin[n_nodes] = q_cluster[i]
+            c = q_cluster[i]
+            roots[c] = meld(key, uid, child, sib, roots[c], n_nodes)
+            n_nodes += 1
+        # Clusters which have reached an outlet
+        touched = np.zeros(Nc, np.bool_)
+        if terminate:
+            for i in range(Np):
+                if outlets[i] and p_clu[i] >= 0:
+                    touched[p_clu[i]] = True
+        candidates = np.empty(indices.size, np.int64)
+        n_cand = 0
+        order = np.empty(Nc, np.int64)
+        count = 0
+        step = 0
+        first_round = True
+        while True:
+            if not np.any(running) or np.all(max_p_reached):
+                break
+            n_order = 0
+            for c in range(Nc):
+                if running[c]:
+                    order[n_order] = c
+                    n_order += 1
+            for k in range(n_order):
+                c = order[k]
+                # Pop the next entry, skipping stale ones
+                node = -1
+                while roots[c] >= 0:
+                    n = roots[c]
+                    roots[c] = pop(key, uid, child, sib, scratch, n)
+                    if inv_step[uid[n]] >= merged_at(parent, merge_step,
+                                                     origin[n]):
+                        node = n
+                        break
+                if node < 0:  # Cluster was merged earlier in this round
+                    running[c] = False
+                    continue
+                step += 1
+                pressure = key[node]
+                elem = uid[node] // 2
+                is_throat = uid[node] % 2 == 1
+                if is_throat:
+                    t_int[elem] = False
+                    elem_cluster = t_clu[elem]
+                else:
+                    p_int[elem] = False
+                    elem_cluster = p_clu[elem]
+                if pressure > max_pressure:
+                    max_p_reached[c] = True
+                elif elem_cluster == -1:
+                    count += 1
+                    if high_Pc[c] < pressure:
+                        high_Pc[c] = pressure
+                    inv_step[uid[node]] = step
+                    if is_throat:
+                        t_seq[elem] = count
+                        t_clu[elem] = c
+                        t_pc[elem] = high_Pc[c]
+                        # Add pores connected to the throat to the queue
+                        for j in range(2):
+                            P = conns[elem, j]
+                            if p_seq[P] <= 0:
+                                p_int[P] = True
+                                key[n_nodes] = p_entry[P]
+                                uid[n_nodes] = 2*P
+                                origin[n_nodes] = c
+                                roots[c] = meld(key, uid, child, sib,
+                                                roots[c], n_nodes)
+                                n_nodes += 1
+                    else:
+                        p_seq[elem] = count
+                        p_clu[elem] = c
+                        p_pc[elem] = high_Pc[c]
+                        if outlets[elem]:
+                            touched[c] = True
+                        # Add throats connected to the pore to the queue
+                        for j in range(indptr[elem], indptr[elem+1]):
+                            T = indices[j]
+                            if isolated:
+                                candidates[n_cand] = T
+                                n_cand += 1
+                            if t_seq[T] <= 0:
+                                t_int[T] = True
+                                pind = 0 if conns[T, 0] != elem else 1
+                                if not bidirectional:
+                                    pind = 0
+                                key[n_nodes] = t_entry[T, pind]
+                                uid[n_nodes] = 2*T + 1
+                                origin[n_nodes] = c
+                                roots[c] = meld(key, uid, child, sib,
+                                                roots[c], n_nodes)
+                                n_nodes += 1
+                        if coop:
+                            # Add cooperatively filled pores to the queue
+                            for j in range(indptr[elem], indptr[elem+1]):
+                                T1 = indices[j]
+                                if t_seq[T1] != -1:
+                                    continue
+                                a0, a1 = conns[T1, 0], conns[T1, 1]
+                                for i in range(tt_indptr[T1], tt_indptr[T1+1]):
+                                    if np.isnan(tt_data[i]):
+                                        continue
+                                    T2 = tt_indices[i]
+                                    b0, b1 = conns[T2, 0], conns[T2, 1]
+                                    if a0 == b0 and a1 != b1:
+                                        cP, u0, u1 = a0, a1, b1
+                                    elif a0 == b1 and a1 != b0:
+                                        cP, u0, u1 = a0, a1, b0
+                                    elif a1 == b0 and a0 != b1:
+                                        cP, u0, u1 = a1, a0, b1
+                                    elif a1 == b1 and a0 != b0:
+                                        cP, u0, u1 = a1, a0, b0
+                                    else:
+                                        continue
+                                    if (p_seq[u0] > -1 and p_seq[u1] > -1
+                                            and p_seq[cP] == -1):
+                                        key[n_nodes] = tt_data[i]
+                                        uid[n_nodes] = 2*cP
+                                        origin[n_nodes] = c
+                                        roots[c] = meld(key, uid, child, sib,
+                                                        roots[c], n_nodes)
+                                        n_nodes += 1
+                elif elem_cluster != c:
+                    # Remove stale entries from the top of the other queue
+                    e = elem_cluster
+                    while roots[e] >= 0:
+                        n = roots[e]
+                        if inv_step[uid[n]] >= merged_at(parent, merge_step,
+                                                         origin[n]):
+                            break
+                        roots[e] = pop(key, uid, child, sib, scratch, n)
+                    if running[e] or roots[e] >= 0:
+                        # The element is part of another invading cluster,
+                        # or a residual cluster which can now start invading
+                        roots[c] = meld(key, uid, child, sib, roots[c],
+                                        roots[e])
+                        roots[e] = -1
+                        parent[e] = c
+                        merge_step[e] = step
+                        running[e] = False
+                # Remove stale entries so an empty queue is seen as such
+                while roots[c] >= 0:
+                    n = roots[c]
+                    if inv_step[uid[n]] >= merged_at(parent, merge_step,
+                                                     origin[n]):
+                        break
+                    roots[c] = pop(key, uid, child, sib, scratch, n)
+                if roots[c] < 0 or max_p_reached[c]:
+                    running[c] = False
+            if isolated:
+                # Invade throats whose pores have both been invaded
+                step += 1
+                n_check = Nt if first_round else n_cand
+                for j in range(n_check):
+                    T = j if first_round else candidates[j]
+                    P1, P2 = conns[T, 0], conns[T, 1]
+                    if (t_seq[T] == -1 and p_seq[P1] > -1
+                            and p_seq[P2] > -1):
+                        P = P2 if p_seq[P2] > p_seq[P1] else P1
+                        t_pc[T] = p_pc[P]
+                        t_seq[T] = p_seq[P]
+                        t_clu[T] = p_clu[P]
+                        inv_step[2*T + 1] = step
+                n_cand = 0
+            if terminate:
+                for c in range(Nc):
+                    if touched[c]:
+                        running[c] = False
+            first_round = False
+        # Collect the remaining entries of each queue
+        n_left = 0
+        out_key = np.empty(n_nodes, np.float64)
+        out_uid = np.empty(n_nodes, np.int64)
+        out_cluster = np.empty(n_nodes, np.int64)
+        for c in range(Nc):
+            if roots[c] < 0:
+                continue
+            scratch[0] = roots[c]
+            n_stack = 1
+            while n_stack > 0:
+                n_stack -= 1
+                n = scratch[n_stack]
+                if inv_step[uid[n]] >= merged_at(parent, merge_step,
+                                                 origin[n]):
+                    out_key[n_left] = key[n]
+                    out_uid[n_left] = uid[n]
+                    out_cluster[n_left] = c
+                    n_left += 1
+                n = child[n]
+                while n >= 0:
+                    scratch[n_stack] = n
+                    n_stack += 1
+                    n = sib[n]
+        return (count, out_key[:n_left], out_uid[:n_left],
+                out_cluster[:n_left])
+
+    _engine.append(engine)
+    return engine
@@ -11,7 +11,7 @@ import logging
 import heapq as hq
 import scipy as sp
 import numpy as np
-from scipy.sparse import coo_matrix, dok_matrix
+from scipy.sparse import coo_matrix
 from openpnm.algorithms import MixedInvasionPercolation
 from transforms3d._gohlketransforms import angle_between_vectors
 
@@ -175,54 +175,32 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
         r"""
         Generate an array of pores with all connected throats and pairs of
         throats that connect to the same pore
+
+        Notes
+        -----
+        The throats of each pore are taken from the network's incidence matrix
+        in CSR form, sorted by pore then throat index.  The pairs are returned
+        in the same order, i.e. by pore, then by first and second throat.
         """
         network = self.project.network
-        # Collect all throat pairs sharing a pore as list of lists
-        neighbor_Ts = network.find_neighbor_throats(
-            pores=network.pores(), flatten=False
-        )
-        # Pores associated to throat
-        Ps = []
-        # Throats connected to each pore
-        Ts = []
-        # Pairs of throats sharing a pore
-        T1 = []
-        T2 = []
-        start = 0
-        # Build lookup pair index arrays for each coordination number up to the
-        # Maximum coordination max_c
-        max_c = np.amax(network.num_neighbors(pores=network.Ps, flatten=False))
-        pair_T1 = []
-        pair_T2 = []
-        logger.info("Building throat pair matrices")
-        for num_t in range(max_c + 1):
-            temp1 = []
-            temp2 = []
-            for t1 in range(num_t)[:-1]:
-                for t2 in range(num_t)[t1 + 1 :]:
-                    temp1.append(t1)
-                    temp2.append(t2)
-            pair_T1.append(np.asarray(temp1))
-            pair_T2.append(np.asarray(temp2))
-        for p, nTs in enumerate(neighbor_Ts):
-            num_t = len(nTs)
-            for i in range(num_t):
-                Ps.append(p)
-                Ts.append(nTs[i])
-            # Pair indices into Ts
-            tempt1 = pair_T1[num_t] + start
-            tempt2 = pair_T2[num_t] + start
-            for i in range(len(tempt1)):
-                T1.append(tempt1[i])
-                T2.append(tempt2[i])
-            start += num_t
+        conns = network["throat.conns"]
+        # Each throat appears once for each of its pores
+        Ps = conns.T.flatten()
+        Ts = np.tile(np.arange(network.Nt), 2)
+        order = np.lexsort((Ts, Ps))
         # Nt * 2 long
-        Ps = np.asarray(Ps)
-        Ts = np.asarray(Ts)
+        Ps = Ps[order]
+        Ts = Ts[order]
+        indptr = np.cumsum(np.bincount(Ps, minlength=network.Np))
+        # Number of partners of each entry, i.e. the throats after it in the
+        # row of its pore
+        row_end = indptr[Ps]
+        num_partners = row_end - np.arange(len(Ps)) - 1
         # indices into the above arrays based on throat pairs
-        T1 = np.asarray(T1)
-        T2 = np.asarray(T2)
-
+        T1 = np.repeat(np.arange(len(Ps)), num_partners)
+        first = np.cumsum(num_partners) - num_partners
+        offset = np.arange(len(T1)) - np.repeat(first, num_partners)
+        T2 = T1 + 1 + offset
         return Ps, Ts, T1, T2
 
     def _apply_cen_to_throats(self, p_cen, t_cen, t_norm, men_cen):
@@ -238,57 +216,37 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
         coords = t_cen + c3 * t_norm
         return coords
 
-    def _transform_point_normal(self, point, normal):
+    def _plane_intersect(self, normals_a, points_a, normals_b, points_b):
         r"""
-        Transforms point normal plane definition to parametric form
-        Ax + By +Cz + D = 0
-        """
-        return [
-            a
-            for a in zip(
-                normal[:, 0], normal[:, 1], normal[:, 2], -self._my_dot(point, normal)
-            )
-        ]
-
-    def _plane_intersect(self, a, b):
-        """
-        a, b   4-tuples/lists
-               Ax + By +Cz + D = 0
-               A, B, C, D in order
-        output: 2 points on line of intersection, np.arrays, shape (3,)
+        Finds the lines of intersection of pairs of planes, each given by a
+        normal vector and a point on the plane.  Returns two points on each
+        line, which are NaN where the planes are parallel.
         https://bit.ly/2LkBEyc
         """
-        a_vec, b_vec = np.array(a[:3]), np.array(b[:3])
-        aXb_vec = np.cross(a_vec, b_vec)
-        A = np.array([a_vec, b_vec, aXb_vec])
-        d = np.array([-a[3], -b[3], 0.0]).reshape(3, 1)
-        if np.linalg.det(A) == 0:
-            return None, None
-        else:
-            p_inter = np.linalg.solve(A, d).T
-            return p_inter[0], (p_inter + aXb_vec)[0]
-
-    def _t(self, p, q, r):
-        r"""
-        Equation of line passing through points p and q parameterized by t
-        https://bit.ly/2EpQ6DD
-        """
-        x = p - q
-        return np.dot(r - q, x) / np.dot(x, x)
+        aXb = np.cross(normals_a, normals_b)
+        A = np.stack((normals_a, normals_b, aXb), axis=1)
+        d = np.vstack(
+            (
+                self._my_dot(points_a, normals_a),
+                self._my_dot(points_b, normals_b),
+                np.zeros(len(aXb)),
+            )
+        ).T
+        p = np.full(aXb.shape, np.nan)
+        ok = np.linalg.det(A) != 0
+        if np.any(ok):
+            p[ok] = np.linalg.solve(A[ok], d[ok][:, :, np.newaxis])[:, :, 0]
+        return p, p + aXb
 
     def _distance(self, p, q, r):
         r"""
-        Shortest distance between line passing through p and q and point r
+        Shortest distance between each line passing through p and q and point
+        r
         https://bit.ly/2EpQ6DD
         """
-        return np.linalg.norm(self._t(p, q, r) * (p - q) + q - r)
-
-    def _pair_permutations(self, n):
-        perms = []
-        for i in range(n):
-            for j in range(n - (i + 1)):
-                perms.append([i, j + i + 1])
-        return perms
+        x = p - q
+        t = self._my_dot(r - q, x) / self._my_dot(x, x)
+        return np.linalg.norm(t[:, np.newaxis] * x + q - r, axis=1)
 
     def _perpendicular_vector(self, v, v_ref=None):
         if v_ref is None:
@@ -311,17 +269,76 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
     def setup_coop_filling(self, inv_points=None):
         r"""
         Populate the coop filling throat-throat pair matrix
+
+        Parameters
+        ----------
+        inv_points : array_like
+            The invasion pressures at which to assess cooperative pore
+            filling.  The default is 101 points from zero to the maximum entry
+            pressure.
+
+        Notes
+        -----
+        The pairs of throats whose menisci may touch are found once, then the
+        meniscus model is regenerated once for each pressure and both filling
+        conditions are checked for all pairs at the same time.  The first
+        pressure at which a pair passes is stored in ``tt_Pc``, a CSR matrix
+        with sorted indices, so the pairs of a throat are found by slicing
+        its row and a single pair by a binary search of that row.
+
         """
-        self._setup_coop_filling_creep(inv_points)
-        self._setup_coop_filling_bulge(inv_points)
+        start = time.time()
+        net = self.project.network
+        phase = self.project.find_phase(self)
+        all_phys = self.project.find_physics(phase=phase)
+        if inv_points is None:
+            inv_points = np.arange(0, 1.01, 0.01) * self._max_pressure()
+        cpf = self.settings["cooperative_pore_filling"]
+        Ps, Ts, T1, T2 = self._get_throat_pairs()
+        keep = self._setup_coop_filling_creep(Ps, Ts, T1, T2)
+        T1, T2 = T1[keep], T2[keep]
+        pt1, pt2 = Ts[T1], Ts[T2]
+        angles = self._throat_pair_angle(pt1, pt2, Ps[T1], net)
+        # Make sure throat normals are unit vector
+        t_norms = net["throat.normal"]
+        unit = np.linalg.norm(t_norms, axis=1)
+        t_norms /= np.vstack((unit, unit, unit)).T
+        creep_Pc = np.full(len(T1), np.nan)
+        bulge_Pc = np.full(len(T1), np.nan)
+        for Pc in inv_points:
+            # Don't use zero as can get strange numbers in menisci data
+            if Pc == 0.0:
+                Pc = 1e-6
+            # regenerate model with new target Pc
+            for phys in all_phys:
+                phys.models[cpf]["target_Pc"] = Pc
+                phys.regenerate_models(propnames=cpf)
+            # Combined filling angle of the menisci exceeds the angle between
+            # the throats
+            alpha = phase[cpf + ".alpha"]
+            fill_angle_sum = np.sum(alpha[np.vstack((pt1, pt2)).T], axis=1)
+            mask = np.isnan(creep_Pc) * (fill_angle_sum >= angles)
+            creep_Pc[mask] = Pc
+            mask = np.isnan(bulge_Pc)
+            mask[mask] = self._setup_coop_filling_bulge(Ps, Ts, T1[mask], T2[mask])
+            bulge_Pc[mask] = Pc
+        # The bulge condition is only used for pairs which never creep, and
+        # is stored both ways
+        bulge = np.isnan(creep_Pc) * ~np.isnan(bulge_Pc)
+        rows = np.concatenate((pt1, pt2[bulge]))
+        cols = np.concatenate((pt2, pt1[bulge]))
+        data = np.concatenate((np.where(bulge, bulge_Pc, creep_Pc), bulge_Pc[bulge]))
+        self.tt_Pc = coo_matrix((data, (rows, cols)), shape=(net.Nt, net.Nt)).tocsr()
+        self.tt_Pc.sort_indices()
+        logger.info(
+            "Coop filling finished in " + str(np.around(time.time() - start, 2)) + " s"
+        )
 
-    def _setup_coop_filling_creep(self, inv_points=None):
+    def _setup_coop_filling_creep(self, Ps, Ts, T1, T2):
         r"""
-        This coop filling model iterates through the invasion pressures set by
-        the inv_points variable and calls the meniscus model whose dictionary
-        key must be given in the algorithm's setup.
-        The meniscus model supplies the position of the meniscus inside each
-        throat as if there were a meniscus in every throat for a given pressure
+        Finds the pairs of throats whose menisci may eventually touch by
+        creeping along the throat walls, returning a mask over the given pairs.
+
         The contact line of the meniscus traces a circle around the inner
         surface of the throat which is assumed to be toroidal.
         The contact circle lies on a plane that is defined by the throat's
@@ -331,14 +348,13 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
         then the meniscus contact circles may eventually touch if they can
         advance enough. For highly wetting fluid the contact point may be
         advanced well into the throat whilst still being at negative capillary
-        pressure.
+        pressure.  Whether they do is then checked at each invasion pressure
+        by comparing the combined filling angle of the menisci with the angle
+        between the throats.
         """
-        start = time.time()
         net = self.project.network
         phase = self.project.find_phase(self)
         all_phys = self.project.find_physics(phase=phase)
-        if inv_points is None:
-            inv_points = np.arange(0, 1.01, 0.01) * self._max_pressure()
         # Throat centroids
         try:
             t_centroids = net["throat.centroid"]
@@ -352,88 +368,33 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
                 net["pore.coords"][net["throat.conns"][:, 1]]
                 - net["pore.coords"][net["throat.conns"][:, 0]]
             )
-        cpf = self.settings["cooperative_pore_filling"]
-        model = all_phys[0].models[cpf]
+        model = all_phys[0].models[self.settings["cooperative_pore_filling"]]
         # Throat Diameter and fiber radius
         try:
             t_rad = net[model["throat_diameter"]] / 2 + model["r_toroid"]
         except KeyError:
             t_rad = net["throat.diameter"] / 2
-        # Equations of throat planes at the center of each throat
-        planes = self._transform_point_normal(t_centroids, t_norms)
-        Nt = net.Nt
-        adj_mat = dok_matrix((Nt, Nt), dtype=int)
-        # Run through and build the throat-throat pair adjacency matrix
+        ta, tb = Ts[T1], Ts[T2]
         # If planes of throats intersect then meniscii in throats may also
         # Intersect at a given pressure.
-        for pore in net.Ps:
-            ts = net.find_neighbor_throats(pores=pore)
-            perms = self._pair_permutations(len(ts))
-            for perm in perms:
-                ta, tb = ts[perm]
-                p, q = self._plane_intersect(planes[ta], planes[tb])
-                if p is not None:
-                    d1 = self._distance(p, q, t_centroids[ta])
-                    d2 = self._distance(p, q, t_centroids[tb])
-                    if (t_rad[ta] >= d1) and (t_rad[tb] >= d2):
-                        adj_mat[ta, tb] = pore + 1
-        # Meniscus Filling Angle
-        tfill_angle = cpf + ".alpha"
-        # Capillary pressure adjacency maxtrix
-        pairs = np.asarray([list(key) for key in adj_mat.keys()])
-        pores = np.asarray([adj_mat[key] for key in adj_mat.keys()]) - 1
-        self.tt_Pc = adj_mat.copy().astype(float).tocsr()
-        # Initialize the pressure matrix with nans
-        # This is used to check for the first intersection pressure and
-        # Prevent overwriting
-        self.tt_Pc[pairs[:, 0], pairs[:, 1]] = np.nan
-        angles = self._throat_pair_angle(pairs[:, 0], pairs[:, 1], pores, net)
-        T1 = pairs[:, 0]
-        T2 = pairs[:, 1]
-        hits = []
-        for Pc in inv_points:
-            # Don't use zero as can get strange numbers in menisci data
-            if Pc == 0.0:
-                Pc = 1e-6
-            # regenerate model with new target Pc
-            for phys in all_phys:
-                phys.models[cpf]["target_Pc"] = Pc
-                phys.regenerate_models(propnames=cpf)
-            # check whether this throat pair already has a coop value
-            check_nans = np.asarray(np.isnan(self.tt_Pc[T1, T2]).tolist()[0])
-            fill_angle_sum = np.sum(phase[tfill_angle][pairs], axis=1)
-            coalescence = fill_angle_sum >= angles
-            mask = check_nans * coalescence
-            if np.any(mask):
-                self.tt_Pc[T1[mask], T2[mask]] = Pc
-                hits.append(Pc)
-        # Change to lil for single throat lookups
-        #        self.tt_Pc = self.tt_Pc.tolil()
-        logger.info(
-            "Coop filling finished in " + str(np.around(time.time() - start, 2)) + " s"
+        p, q = self._plane_intersect(
+            t_norms[ta], t_centroids[ta], t_norms[tb], t_centroids[tb]
         )
-        logger.info("Coop Hits", np.unique(np.asarray(hits)))
+        d1 = self._distance(p, q, t_centroids[ta])
+        d2 = self._distance(p, q, t_centroids[tb])
+        return (t_rad[ta] >= d1) * (t_rad[tb] >= d2)
 
-    def _setup_coop_filling_bulge(self, inv_points=None):
+    def _setup_coop_filling_bulge(self, Ps, Ts, T1, T2):
         r"""
-        Evaluate the cooperative pore filling condition that the combined
-        filling angle in next neighbor throats cannot exceed the geometric
-        angle between their throat planes.
+        Evaluate the cooperative pore filling condition that the menisci in
+        next neighbor throats bulge into the pore far enough to touch, at the
+        pressure currently set on the meniscus model, returning a mask over
+        the given pairs.
         This is used when the invading fluid has access to multiple throats
         connected to a pore
-
-        Parameters
-        ----------
-        inv_points : array_like
-            The invasion pressures at which to assess coopertive pore filling.
         """
         net = self.project.network
         phase = self.project.find_phase(self)
-        all_phys = self.project.find_physics(phase=phase)
-        if inv_points is None:
-            inv_points = np.arange(0, 1.01, 0.01) * self._max_pressure()
-
-        start = time.time()
         cpf = self.settings["cooperative_pore_filling"]
         tfill_angle = cpf + ".alpha"
         tmen_rad = cpf + ".radius"
@@ -451,97 +412,52 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
             t_centroids = np.mean(temp, axis=1)
             p_rad = net["pore.diameter"] / 2
             t_norms = net["throat.normal"]
-
-        Ps, Ts, T1, T2 = self._get_throat_pairs()
         # Network indices for the pairs
         pps = Ps[T1]
         pt1 = Ts[T1]
         pt2 = Ts[T2]
-        # Arrays to get upper and lower triangular for reference to later
-        # When checking for phase presence one throat at a time - need to
-        # Check all throat pairs
-        T_all_t1 = Ts[np.concatenate((T1, T2))]
-        # T_all_t2 = Ts[np.concatenate((T2, T1))]
-        # Throat-Throat cooperative filling pressure
-        data = np.ones(len(T_all_t1), dtype=float)
-        data.fill(np.nan)
-        # coo --> useful for building matrix
-        # coo = coo_matrix(
-        #     (data, (T_all_t1, T_all_t2)), shape=(len(T_all_t1), len(T_all_t2))
-        # )
-        # csr --> for indexing into entire matrix when populating with
-        # actual coop filling values
-        #        self.tt_Pc = coo.tocsr()
-        # Pair pore center and radius
-        pp_cen = p_centroids[pps]
-        pp_rad = p_rad[pps]
-        # Make sure throat normals are unit vector
-        unit = np.linalg.norm(t_norms, axis=1)
-        t_norms /= np.vstack((unit, unit, unit)).T
-
-        for Pc in inv_points:
-            # regenerate model with new target Pc
-            for phys in all_phys:
-                phys.models[cpf]["target_Pc"] = Pc
-                phys.regenerate_models(propnames=cpf)
-            men_cen_dist = phase[tmen_cen]
-            # Work out meniscii coord for each direction along the throat
-            men_cen_coord = self._apply_cen_to_throats(
-                p_centroids[Ps], t_centroids[Ts], t_norms[Ts], men_cen_dist[Ts]
-            )
-            # Pair centers
-            pc1 = men_cen_coord[T1]
-            pc2 = men_cen_coord[T2]
-            # Center to center vector between neighboring meniscii
-            c2c = pc1 - pc2
-            dist = np.linalg.norm(c2c, axis=1)
-            # Pair meniscii radii
-            pr1 = phase[tmen_rad][pt1]
-            pr2 = phase[tmen_rad][pt2]
-            # nans may exist if pressure is outside the range
-            # set these to zero to be ignored by next step without
-            # causing RuntimeWarning
-            pr1[np.isnan(pr1)] = 0
-            pr2[np.isnan(pr2)] = 0
-            # Negative mensicii radii means positive pressure
-            # Assume meniscii only interact when bulging into pore
-            check_neg = np.logical_and(pr1 < 0, pr2 < 0)
-            # simple initial distance check on sphere rads
-            check_rads = (np.abs(pr1 + pr2)) >= dist
-            # check whether the filling angle is ok at this Pc
-            check_alpha_T1 = ~np.isnan(phase[tfill_angle][pt1])
-            check_alpha_T2 = ~np.isnan(phase[tfill_angle][pt2])
-            check_alpha = check_alpha_T1 * check_alpha_T2
-            # check whether this throat pair already has a coop value
-            check_nans = np.asarray(np.isnan(self.tt_Pc[pt1, pt2]).tolist()[0])
-            mask = check_neg * check_alpha * check_nans * check_rads
-            # if all checks pass
-            if np.any(mask):
-                # Check if intersecting circle lies within pore
-                inter = self.trilaterate_v(
-                    P1=pc1[mask],
-                    P2=pc2[mask],
-                    P3=pp_cen[mask],
-                    r1=pr1[mask][:, np.newaxis],
-                    r2=pr2[mask][:, np.newaxis],
-                    r3=pp_rad[mask][:, np.newaxis],
-                )
-                inter = inter.flatten()
-                if np.any(inter):
-                    self.tt_Pc[pt1[mask][inter], pt2[mask][inter]] = Pc
-                    self.tt_Pc[pt2[mask][inter], pt1[mask][inter]] = Pc
-            # Save meniscii data for each throat into each connecting pore
-            men_data = {}
-            men_data["Ps"] = Ps
-            men_data["Ts"] = Ts
-            men_data["cen"] = men_cen_coord
-            men_data["rad"] = phase[tmen_rad][Ts]
-
-        # Change to lil for single throat lookups
-        self.tt_Pc = self.tt_Pc.tolil()
-        logger.info(
-            "Coop filling finished in " + str(np.around(time.time() - start, 2)) + " s"
+        men_cen_dist = phase[tmen_cen]
+        # Work out meniscii coord for each direction along the throat
+        pc1 = self._apply_cen_to_throats(
+            p_centroids[pps], t_centroids[pt1], t_norms[pt1], men_cen_dist[pt1]
         )
+        pc2 = self._apply_cen_to_throats(
+            p_centroids[pps], t_centroids[pt2], t_norms[pt2], men_cen_dist[pt2]
+        )
+        # Center to center vector between neighboring meniscii
+        c2c = pc1 - pc2
+        dist = np.linalg.norm(c2c, axis=1)
+        # Pair meniscii radii
+        pr1 = phase[tmen_rad][pt1]
+        pr2 = phase[tmen_rad][pt2]
+        # nans may exist if pressure is outside the range
+        # set these to zero to be ignored by next step without
+        # causing RuntimeWarning
+        pr1[np.isnan(pr1)] = 0
+        pr2[np.isnan(pr2)] = 0
+        # Negative mensicii radii means positive pressure
+        # Assume meniscii only interact when bulging into pore
+        check_neg = np.logical_and(pr1 < 0, pr2 < 0)
+        # simple initial distance check on sphere rads
+        check_rads = (np.abs(pr1 + pr2)) >= dist
+        # check whether the filling angle is ok at this Pc
+        check_alpha_T1 = ~np.isnan(phase[tfill_angle][pt1])
+        check_alpha_T2 = ~np.isnan(phase[tfill_angle][pt2])
+        check_alpha = check_alpha_T1 * check_alpha_T2
+        mask = check_neg * check_alpha * check_rads
+        # if all checks pass
+        if np.any(mask):
+            # Check if intersecting circle lies within pore
+            inter = self.trilaterate_v(
+                P1=pc1[mask],
+                P2=pc2[mask],
+                P3=p_centroids[pps][mask],
+                r1=pr1[mask][:, np.newaxis],
+                r2=pr2[mask][:, np.newaxis],
+                r3=p_rad[pps][mask][:, np.newaxis],
+            )
+            mask[mask] = inter.flatten()
+        return mask
 
     def _check_coop(self, pore, queue):
         r"""
@@ -564,9 +480,11 @@ class MixedInvasionPercolationCoop(MixedInvasionPercolation):
                 a = set(net["throat.conns"][throat])
                 # Get a list of pre-calculated coop filling pressures for all
                 # Throats this throat can coop fill with
-                ts_Pc = self.tt_Pc.data[throat]
+                indptr = self.tt_Pc.indptr
+                row = slice(indptr[throat], indptr[throat + 1])
+                ts_Pc = self.tt_Pc.data[row]
                 # Network indices of throats that can act as filling pairs
-                ts = self.tt_Pc.rows[throat]
+                ts = self.tt_Pc.indices[row]
                 # If there are any potential coop filling throats
                 if np.any(~np.isnan(ts_Pc)):
                     ts_Pc = np.asarray(ts_Pc)
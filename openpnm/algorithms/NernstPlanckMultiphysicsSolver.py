@@ -1,6 +1,7 @@
 import numpy as np
+from scipy.sparse.linalg import LinearOperator, gmres, splu
 from openpnm.algorithms import GenericAlgorithm
-from openpnm.utils import logging, Docorator, GenericSettings
+from openpnm.utils import logging, Docorator, GenericSettings, AndersonMixer
 docstr = Docorator()
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,13 @@ class NernstPlanckMultiphysicsSolverSettings(GenericSettings):
         The tolerance to use for stopping Gummel iterations
     g_max_iter : int (default = 10)
         The maximum number if times to perform the Gummel iteration
+    coupling : str (default = 'gummel')
+        How the equations are coupled. Options are 'gummel', which solves
+        the equations one after the other until the fields stop changing,
+        and 'newton', which solves them together using Newton's method.
+    anderson_depth : int (default = 0)
+        The number of previous Gummel iterations used to accelerate the
+        next one. 0 means no acceleration.
 
     """
     phase = None
@@ -33,6 +41,8 @@ class NernstPlanckMultiphysicsSolverSettings(GenericSettings):
     ions = []
     g_tol = 1e-8
     g_max_iter = 10
+    coupling = 'gummel'
+    anderson_depth = 0
 
 
 class NernstPlanckMultiphysicsSolver(GenericAlgorithm):
@@ -76,16 +86,14 @@ class NernstPlanckMultiphysicsSolver(GenericAlgorithm):
 
     def run(self, t=None):
         r"""
+        Solves the coupled system of ionic conduction and Nernst-Planck
+        equations, using either Gummel iterations or Newton's method
+        depending on ``settings['coupling']``.
         """
         print('―'*80)
         print('Running IonicTransport')
-        # Phase, potential and ions algorithms
-        phase = self.project.phases()[self.settings['phase']]
-        p_alg = self.project.algorithms()[self.settings['potential_field']]
-        e_alg = [self.project.algorithms()[self.settings['ions'][i]] for i in
-                 range(len(self.settings['ions']))]
-        algs = e_alg.copy()
-        algs.insert(0, p_alg)
+        phase, p_alg, e_alg = self._get_objects()
+        algs = [p_alg] + e_alg
         # Define initial conditions (if not defined by the user)
         for alg in algs:
             alg.settings.update({'cache_A': False, 'cache_b': False})
@@ -100,50 +108,268 @@ class NernstPlanckMultiphysicsSolver(GenericAlgorithm):
                         shape=[alg.Np, ], dtype=float)
 
         # Source term for Poisson or charge conservation (electroneutrality) eq
-        phys = p_alg.project.find_physics(phase=phase)
         p_alg._charge_conservation_eq_source_term(e_alg=e_alg)
 
-        # Initialize residuals & old/new fields for Gummel iterats
-        g_tol = self.settings['g_tol']
-        g_res = {}
-        g_old = {}
-        g_new = {}
+        if self.settings['coupling'] == 'newton':
+            converged = self._run_newton()
+        else:
+            converged = self._run_gummel()
+        if converged:
+            print('Solution converged')
+
+    def _get_objects(self):
+        r"""
+        Returns the phase, the potential algorithm and the list of ion
+        algorithms
+        """
+        phase = self.project.phases()[self.settings['phase']]
+        p_alg = self.project.algorithms()[self.settings['potential_field']]
+        e_alg = [self.project.algorithms()[name]
+                 for name in self.settings['ions']]
+        return phase, p_alg, e_alg
+
+    def _solve_ion(self, e, x0):
+        e._run_reactive(x0=x0)
+
+    def _assemble(self, alg):
+        r"""
+        Builds A and b of the given algorithm from the current state of the
+        physics, applying the source terms without under-relaxation
+        """
+        alg._build_A()
+        alg._build_b()
+        alg._apply_BCs()
+        alg._apply_sources(relax=False)
+
+    def _assemble_ion(self, e):
+        self._assemble(e)
+
+    def _get_state(self, algs):
+        return [alg[alg.settings['quantity']].copy() for alg in algs]
+
+    def _get_iterative_props(self, algs):
+        r"""
+        Returns the properties that depend on the fields of any of the given
+        algorithms
+        """
+        props = []
         for alg in algs:
-            g_res[alg.name] = 1e+06
-            g_old[alg.name] = None
-            g_new[alg.name] = None
+            props.extend([i for i in alg._get_iterative_props()
+                          if i not in props])
+        return props
+
+    def _set_state(self, algs, state, propnames=[]):
+        r"""
+        Writes the given fields onto the algorithms and the phase, then
+        updates the given properties on the phase and geometries, and all
+        the models of the physics
+        """
+        phase = self.project.phases()[self.settings['phase']]
+        for alg, x in zip(algs, state):
+            alg[alg.settings['quantity']] = x
+            phase[alg.settings['quantity']] = x
+        if len(propnames) > 0:
+            phase.regenerate_models(propnames=propnames)
+            for obj in self.project.geometries().values():
+                obj.regenerate_models(propnames)
+        for obj in self.project.find_physics(phase=phase):
+            obj.regenerate_models()
+
+    def _gummel_sweep(self):
+        r"""
+        Solves for each ion using the current potential, then for the
+        potential using the new concentrations
+        """
+        phase, p_alg, e_alg = self._get_objects()
+        phys = self.project.find_physics(phase=phase)
+        # Ions
+        for e in e_alg:
+            self._solve_ion(e, x0=e[e.settings['quantity']].copy())
+            phase[e.settings['quantity']] = e[e.settings['quantity']]
+        # Poisson eq
+        for obj in phys:
+            obj.regenerate_models()
+        p_alg._run_reactive(x0=p_alg[p_alg.settings['quantity']].copy())
+        phase[p_alg.settings['quantity']] = p_alg[p_alg.settings['quantity']]
+        # Update physics
+        for obj in phys:
+            obj.regenerate_models()
+
+    def _run_gummel(self):
+        r"""
+        Iterates (Gummel) until the fields stop changing, optionally using
+        Anderson acceleration
 
-        # Iterate (Gummel) until solutions converge
+        Returns
+        -------
+        converged : bool
+            Whether the tolerance was met within ``g_max_iter`` iterations
+
+        Notes
+        -----
+        If ``settings['anderson_depth']`` is greater than 0, the fields found
+        by each iteration are combined with those of previous iterations to
+        extrapolate the start of the next one (see ``AndersonMixer``), with
+        each field scaled by its maximum value.
+
+        """
+        phase, p_alg, e_alg = self._get_objects()
+        algs = [p_alg] + e_alg
+        g_tol = self.settings['g_tol']
+        depth = int(self.settings['anderson_depth'])
+        mixer = AndersonMixer(depth=depth) if depth > 0 else None
+        g_res = np.full(len(algs), 1e+06)
+        for itr in range(int(self.settings['g_max_iter'])):
+            logger.info('Gummel iter: %d, residuals: %s', itr+1, g_res)
+            g_old = self._get_state(algs)
+            self._gummel_sweep()
+            g_new = self._get_state(algs)
+            g_res = np.array([np.sum(np.absolute(x0**2 - x**2))
+                              for x0, x in zip(g_old, g_new)])
+            if g_res.max() < g_tol:
+                logger.info('Gummel iter: %d, residuals: %s', itr+1, g_res)
+                return True
+            if mixer is not None:
+                if itr == 0:
+                    scale = [np.absolute(x).max() or 1.0 for x in g_new]
+                x = mixer.update(_pack(g_old, scale), _pack(g_new, scale))
+                self._set_state(algs, _unpack(x, scale))
+        logger.warning('Gummel iterations did not converge: %s', g_res)
+        return False
+
+    def _run_newton(self):
+        r"""
+        Solves the coupled system with Newton's method
+
+        Returns
+        -------
+        converged : bool
+            Whether the tolerance was met within ``g_max_iter`` iterations
+
+        Notes
+        -----
+        The unknowns are the potential and the concentration of every ion,
+        each scaled by its maximum value.  The residual of each equation is
+        found from the same coefficient matrices used by the Gummel
+        iterations, so any source terms and boundary conditions are
+        included, and is normalized by the norm of its right hand side.
+        Each evaluation of the residual updates the models once, and only
+        those of the phase and geometries that depend on the fields, which
+        are found once.  The source terms are applied without
+        under-relaxation, so the residual does not change the state of the
+        algorithms.
+
+        The Newton steps are found with GMRES without forming the Jacobian,
+        whose products with vectors are approximated by finite differences.
+        The preconditioner is the block diagonal matrix of coefficient
+        matrices at the current iterate, whose factorizations are reused
+        for every GMRES iteration.  The step is shortened so that no
+        concentration becomes negative, then halved until the residual
+        decreases, and if that fails (or a coefficient matrix is singular)
+        a Gummel iteration is taken instead.  The iterations start from the
+        result of one Gummel iteration and stop when the change in the
+        fields meets the same criterion as the Gummel iterations.
+
+        """
+        phase, p_alg, e_alg = self._get_objects()
+        algs = [p_alg] + e_alg
+        g_tol = self.settings['g_tol']
+        # A Gummel iteration gives a consistent starting point (e.g. the
+        # ionic conductance is zero if all concentrations are zero)
+        self._gummel_sweep()
+        x_old = self._get_state(algs)
+        scale = [np.absolute(x).max() or 1.0 for x in x_old]
+        sizes = [alg.Np for alg in algs]
+        props = self._get_iterative_props(algs)
+
+        def residual(x):
+            self._set_state(algs, _unpack(x, scale), propnames=props)
+            As, bs = [], []
+            for alg in algs:
+                if alg is p_alg:
+                    self._assemble(alg)
+                else:
+                    self._assemble_ion(alg)
+                As.append(alg.A.tocsr())
+                bs.append(alg.b.copy())
+            norms = [np.linalg.norm(b) or 1.0 for b in bs]
+            r = [(A @ xi - b)/n for A, xi, b, n in
+                 zip(As, _unpack(x, scale), bs, norms)]
+            return np.hstack(r), As, norms
+
+        def gummel_step(x):
+            self._set_state(algs, _unpack(x, scale))
+            self._gummel_sweep()
+            x_new = _pack(self._get_state(algs), scale)
+            return (x_new, ) + residual(x_new)
+
+        x = _pack(x_old, scale)
+        r, As, norms = residual(x)
+        bounds = np.cumsum([0] + sizes)
+        g_res = np.full(len(algs), 1e+06)
         for itr in range(int(self.settings['g_max_iter'])):
-            g_r = [float(format(i, '.3g')) for i in g_res.values()]
-            g_r = str(g_r)[1:-1]
-            print('Gummel iter: '+str(itr+1)+', residuals: '+g_r)
-            g_convergence = max(i for i in g_res.values()) < g_tol
-            if not g_convergence:
-                # Ions
-                for e in e_alg:
-                    g_old[e.name] = (e[e.settings['quantity']].copy())
-                    e._run_reactive(x0=g_old[e.name])
-                    g_new[e.name] = (e[e.settings['quantity']].copy())
-                    # Residual
-                    g_res[e.name] = np.sum(np.absolute(
-                        g_old[e.name]**2-g_new[e.name]**2))
-                    phase.update(e.results())
-
-                # Poisson eq
-                for obj in phys:
-                    obj.regenerate_models()
-                g_old[p_alg.name] = p_alg[p_alg.settings['quantity']].copy()
-                p_alg._run_reactive(x0=g_old[p_alg.name])
-                g_new[p_alg.name] = p_alg[p_alg.settings['quantity']].copy()
-                # Residual
-                g_res[p_alg.name] = np.sum(np.absolute(
-                    g_old[p_alg.name]**2 - g_new[p_alg.name]**2))
-                # Update phase and physics
-                phase.update(p_alg.results())
-                for obj in phys:
-                    obj.regenerate_models()
-
-            if g_convergence:
-                print('Solution converged')
-                break
+            logger.info('Newton iter: %d, residuals: %s', itr+1, g_res)
+            try:
+                lus = [splu(A.tocsc()) for A in As]
+            except RuntimeError:  # e.g. zero conductance in some pores
+                logger.info('Singular preconditioner, taking a Gummel step')
+                x_new, r_new, As_new, norms_new = gummel_step(x)
+            else:
+                dx = self._newton_step(x, r, lus, bounds, norms, scale,
+                                       residual)
+                # Backtracking line search, keeping concentrations positive
+                lam, rnorm = 1.0, np.linalg.norm(r)
+                c, dc = x[bounds[1]:], dx[bounds[1]:]
+                neg = dc < 0
+                if np.any(neg):
+                    lam = min(1.0, 0.9*np.min(c[neg]/-dc[neg]))
+                for _ in range(6):
+                    x_new = x + lam*dx
+                    r_new, As_new, norms_new = residual(x_new)
+                    if np.linalg.norm(r_new) < (1 - 1e-4*lam)*rnorm:
+                        break
+                    lam = lam/2
+                else:
+                    logger.info('Line search failed, taking a Gummel step')
+                    x_new, r_new, As_new, norms_new = gummel_step(x)
+            g_res = np.array([np.sum(np.absolute(x0**2 - x1**2)) for x0, x1
+                              in zip(_unpack(x, scale), _unpack(x_new, scale))])
+            x, r, As, norms = x_new, r_new, As_new, norms_new
+            if g_res.max() < g_tol:
+                logger.info('Newton iter: %d, residuals: %s', itr+1, g_res)
+                return True
+        logger.warning('Newton iterations did not converge: %s', g_res)
+        return False
+
+    def _newton_step(self, x, r, lus, bounds, norms, scale, residual):
+        r"""
+        Finds the Newton step with GMRES, approximating the products of the
+        Jacobian with vectors by finite differences of the residual
+        """
+        def precondition(v):
+            out = np.empty_like(v)
+            for k, lu in enumerate(lus):
+                i, j = bounds[k], bounds[k+1]
+                out[i:j] = lu.solve(v[i:j])*norms[k]/scale[k]
+            return out
+
+        def jacobian(v):
+            nv = np.linalg.norm(v)
+            if nv == 0:
+                return np.zeros_like(v)
+            h = np.sqrt(np.finfo(float).eps)*(1 + np.linalg.norm(x))/nv
+            return (residual(x + h*v)[0] - r)/h
+
+        n = x.size
+        J = LinearOperator((n, n), matvec=jacobian)
+        M = LinearOperator((n, n), matvec=precondition)
+        dx, _ = gmres(J, -r, M=M, tol=1e-3, atol=0.0, restart=10, maxiter=1)
+        return dx
+
+
+def _pack(fields, scale):
+    return np.hstack([x/s for x, s in zip(fields, scale)])
+
+
+def _unpack(x, scale):
+    return [xi*s for xi, s in zip(np.split(x, len(scale)), scale)]
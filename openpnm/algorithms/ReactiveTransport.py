@@ -3,7 +3,7 @@ from openpnm.algorithms import GenericTransport
 # Uncomment this line when we stop supporting Python 3.6
 # from dataclasses import dataclass, field
 # from typing import List
-from openpnm.utils import logging, Docorator, GenericSettings
+from openpnm.utils import logging, Docorator, GenericSettings, AndersonMixer
 docstr = Docorator()
 logger = logging.getLogger(__name__)
 
@@ -58,6 +58,12 @@ class ReactiveTransportSettings(GenericSettings):
         Maximum number of iterations allowed for the nonlinear solver to
         converge. This parameter is different that ``GenericTransport``'s
         ``solver_max_iter``.
+    anderson_depth : int (default = 0)
+        The number of previous iterates used to extrapolate the next one
+        (Anderson acceleration). 0 means plain Picard iterations, relaxed
+        by ``relaxation_quantity``. Otherwise ``relaxation_quantity`` is
+        used as the damping factor of the extrapolation, which usually
+        converges in far fewer iterations without any tuning.
 
     ----
 
@@ -71,6 +77,7 @@ class ReactiveTransportSettings(GenericSettings):
     # relaxation = RelaxationSettings()
     relaxation_source = 1.0
     relaxation_quantity = 1.0
+    anderson_depth = 0
     # Swap the following 2 lines when we stop supporting Python 3.6
     # sources: List = field(default_factory=lambda: [])
     sources = []
@@ -105,7 +112,7 @@ class ReactiveTransport(GenericTransport):
     @docstr.dedent
     def setup(self, phase=None, quantity='', conductance='',
               nlin_max_iter=None, relaxation_source=None,
-              relaxation_quantity=None, **kwargs):
+              relaxation_quantity=None, anderson_depth=None, **kwargs):
         r"""
         This method takes several arguments that are essential to running
         the algorithm and adds them to the settings.
@@ -137,6 +144,8 @@ class ReactiveTransport(GenericTransport):
             self.settings['relaxation_source'] = relaxation_source
         if relaxation_quantity:
             self.settings['relaxation_quantity'] = relaxation_quantity
+        if anderson_depth is not None:
+            self.settings['anderson_depth'] = anderson_depth
         super().setup(**kwargs)
 
     def run(self, x0=None):
@@ -264,10 +273,17 @@ class ReactiveTransport(GenericTransport):
             for phys in physics:
                 phys.regenerate_models(iterative_props)
 
-    def _apply_sources(self):
+    def _apply_sources(self, relax=True):
         """r
         Update ``A`` and ``b`` applying source terms to specified pores.
 
+        Parameters
+        ----------
+        relax : bool
+            If ``False``, the source terms are applied as found on the phase,
+            without under-relaxation and without storing their values on the
+            algorithm or the phase.  The default is ``True``.
+
         Notes
         -----
         Applying source terms to ``A`` and ``b`` is performed after
@@ -302,19 +318,21 @@ class ReactiveTransport(GenericTransport):
             # Fetch S1/S2 and their old values (don't exist on 1st iter)
             S1 = phase[item + ".S1"][Ps]
             S2 = phase[item + ".S2"][Ps]
-            X1 = self[_item + ".S1.old"][Ps] if not first_iter else S1
-            X2 = self[_item + ".S2.old"][Ps] if not first_iter else S2
-            # Source term relaxation
-            S1 = phase[item + '.S1'][Ps] = w * S1 + (1.0 - w) * X1
-            S2 = phase[item + '.S2'][Ps] = w * S2 + (1.0 - w) * X2
+            if relax:
+                X1 = self[_item + ".S1.old"][Ps] if not first_iter else S1
+                X2 = self[_item + ".S2.old"][Ps] if not first_iter else S2
+                # Source term relaxation
+                S1 = phase[item + '.S1'][Ps] = w * S1 + (1.0 - w) * X1
+                S2 = phase[item + '.S2'][Ps] = w * S2 + (1.0 - w) * X2
             # Modify A and b based on "relaxed" S1/S2
             datadiag = self._A.diagonal().copy()
             datadiag[Ps] = datadiag[Ps] - S1
             self._A.setdiag(datadiag)
             self._b[Ps] = self._b[Ps] + S2
-            # Replace old values of S1/S2 by their current values
-            self[_item + ".S1.old"] = phase[item + ".S1"]
-            self[_item + ".S2.old"] = phase[item + ".S2"]
+            if relax:
+                # Replace old values of S1/S2 by their current values
+                self[_item + ".S1.old"] = phase[item + ".S1"]
+                self[_item + ".S2.old"] = phase[item + ".S2"]
 
     def _run_reactive(self, x0):
         r"""
@@ -347,6 +365,7 @@ class ReactiveTransport(GenericTransport):
         w = self.settings['relaxation_quantity']
         quantity = self.settings['quantity']
         max_it = self.settings['nlin_max_iter']
+        mixer = self._get_mixer()
         # Write initial guess to algorithm obj (for _update_iterative_props to work)
         self[quantity] = x = x0
         # Update A and b based on self[quantity]
@@ -358,7 +377,8 @@ class ReactiveTransport(GenericTransport):
 
         for itr in range(max_it):
             # Solve, use relaxation, and update solution on algorithm obj
-            self[quantity] = x = self._solve(x0=x) * w + x * (1 - w)
+            self[quantity] = x = self._next_iterate(x, self._solve(x0=x),
+                                                    w, mixer)
             self._update_A_and_b()
             # Check solution convergence
             if self._is_converged():
@@ -369,6 +389,27 @@ class ReactiveTransport(GenericTransport):
         if not self._is_converged():
             raise Exception(f"Not converged after {max_it} iterations.")
 
+    def _get_mixer(self):
+        r"""
+        Returns an ``AndersonMixer`` if Anderson acceleration is enabled
+        in ``settings['anderson_depth']``, otherwise ``None``
+        """
+        depth = int(self.settings['anderson_depth'])
+        if depth > 0:
+            return AndersonMixer(depth=depth,
+                                 beta=self.settings['relaxation_quantity'])
+        return None
+
+    def _next_iterate(self, x, x_new, w, mixer=None):
+        r"""
+        Combines the current iterate ``x`` with the solution ``x_new`` of
+        the linearized system, either by under-relaxation with weight ``w``
+        or by Anderson extrapolation if a mixer is given
+        """
+        if mixer is None:
+            return x_new * w + x * (1 - w)
+        return mixer.update(x, x_new)
+
     def _update_A_and_b(self):
         r"""
         Updates A and b based on the most recent solution stored on
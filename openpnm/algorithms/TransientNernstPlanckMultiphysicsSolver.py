@@ -80,6 +80,20 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
         self.settings.update(kwargs)
         self.settings.update(**kwargs)
 
+    def _solve_ion(self, e, x0):
+        e._t_run_reactive(x0=x0)
+
+    def _assemble_ion(self, e):
+        r"""
+        Updates A and b of the given ion in the same way as
+        ``_t_run_reactive``, using the matrices of the current time step
+        and the source terms without under-relaxation
+        """
+        e._A = e._A_t.copy()
+        e._b = e._b_t.copy()
+        e._apply_sources(relax=False)
+        e._correct_apply_sources()
+
     def run(self, t=None):
         r"""
 
@@ -154,8 +168,6 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
         t_tol = self.settings['t_tolerance']
         t_pre = self.settings['t_precision']
         s = self.settings['t_scheme']
-        g_tol = self.settings['g_tol']
-        g_max_iter = int(self.settings['g_max_iter'])
         # Initialize residuals & old/new fields for time marching
         t_res = {}
         t_old = {}
@@ -179,7 +191,6 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
         out = np.around(out, decimals=t_pre)
 
         # Source term for Poisson or charge conservation (electroneutrality) eq
-        phys = p_alg.project.find_physics(phase=phase)
         p_alg._charge_conservation_eq_source_term(e_alg=e_alg)
 
         if s == 'steady':  # If solver in steady mode, do one iteration
@@ -191,7 +202,7 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
             t_str = nbr_to_str(nbr=t, t_precision=self.settings['t_precision'])
             for alg in algs:
                 quant_init = alg[alg.settings['quantity']]
-                alg[alg.settings['quantity']+'@'+t_str] = quant_init
+                alg._write_output(t_str, quant_init)
             time = t + dt
             for time in np.arange(t+dt, tf+dt, dt):
                 t_r = [float(format(i, '.3g')) for i in t_res.values()]
@@ -204,58 +215,14 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
                     for alg in algs:  # Save the current fields
                         t_old[alg.name] = alg[alg.settings['quantity']].copy()
 
-                    # Initialize residuals & old/new fields for Gummel iterats
-                    g_res = {}
-                    g_old = {}
-                    g_new = {}
-                    for alg in algs:
-                        g_res[alg.name] = 1e+03
-                        g_old[alg.name] = None
-                        g_new[alg.name] = None
-
-                    # Iterate (Gummel) until solutions converge
-                    for itr in range(g_max_iter):
-                        g_r = [float(format(i, '.3g')) for i in g_res.values()]
-                        g_r = str(g_r)[1:-1]
-                        print('Start Gummel iter: ' + str(itr+1)
-                              + ', residuals: ' + g_r)
-                        g_convergence = max(i for i in g_res.values()) < g_tol
-                        if not g_convergence:
-                            # Ions
-                            for e in e_alg:
-                                g_old[e.name] = (
-                                    e[e.settings['quantity']].copy())
-
-                                e._t_run_reactive(x0=g_old[e.name])
-                                g_new[e.name] = (
-                                    e[e.settings['quantity']].copy()
-                                )
-                                # Residual
-                                g_res[e.name] = np.sum(np.absolute(
-                                    g_old[e.name]**2 - g_new[e.name]**2))
-                                phase.update(e.results())
-
-                            # Charge conservation eq
-                            for obj in phys:
-                                obj.regenerate_models()
-                            g_old[p_alg.name] = (
-                                p_alg[p_alg.settings['quantity']].copy())
-                            p_alg._run_reactive(x0=g_old[p_alg.name])
-                            g_new[p_alg.name] = (
-                                p_alg[p_alg.settings['quantity']].copy()
-                            )
-                            # Residual
-                            g_res[p_alg.name] = np.sum(np.absolute(
-                                g_old[p_alg.name]**2 - g_new[p_alg.name]**2))
-                            # Update phase and physics
-                            phase.update(p_alg.results())
-                            for obj in phys:
-                                obj.regenerate_models()
-
-                        elif g_convergence:
-                            print('Solution for time step: ' + str(time)
-                                  + ' s converged')
-                            break
+                    # Solve the coupled equations at this time step
+                    if self.settings['coupling'] == 'newton':
+                        converged = self._run_newton()
+                    else:
+                        converged = self._run_gummel()
+                    if converged:
+                        print('Solution for time step: ' + str(time)
+                              + ' s converged')
 
                     for alg in algs:  # Save new fields & compute t residuals
                         t_new[alg.name] = alg[alg.settings['quantity']].copy()
@@ -270,8 +237,7 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
                                            t_precision=self.settings['t_precision'])
                         print('\nExporting time step: ' + str(time) + ' s')
                         for alg in algs:
-                            alg[alg.settings['quantity']+'@'+t_str] = (
-                                t_new[alg.name])
+                            alg._write_output(t_str, t_new[alg.name])
 
                     # Update A matrix of the steady sys of eqs (WITHOUT BCs)
                     for e in e_alg:
@@ -297,8 +263,7 @@ class TransientNernstPlanckMultiphysicsSolver(NernstPlanckMultiphysicsSolver):
                                        t_precision=self.settings['t_precision'])
                     print('\nExporting time step: '+str(time)+' s')
                     for alg in algs:
-                        alg[alg.settings['quantity']+'@'+t_str] = (
-                            t_new[alg.name])
+                        alg._write_output(t_str, t_new[alg.name])
                     break
             if round(time, t_pre) == tf:
                 print('\nMaximum time step reached: '+str(time)+' s')
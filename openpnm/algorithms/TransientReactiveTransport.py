@@ -2,6 +2,7 @@ import numpy as np
 import scipy.sparse as sprs
 from decimal import Decimal as dc
 from openpnm.algorithms import ReactiveTransport
+from openpnm.algorithms.sinks import DictSink
 from openpnm.utils import logging, GenericSettings, Docorator
 docstr = Docorator()
 logger = logging.getLogger(__name__)
@@ -108,6 +109,10 @@ class TransientReactiveTransport(ReactiveTransport):
     'implicit' (fast, 1st order accurate) and 'cranknicolson' (slow, 2nd order
     accurate) both for transient simulations.
 
+    Where the transient solutions are stored is controlled with
+    ``set_output_sink``.  By default they are stored on the algorithm itself
+    under ``quantity@t``.
+
     """
 
     def __init__(self, settings={}, phase=None, **kwargs):
@@ -116,6 +121,7 @@ class TransientReactiveTransport(ReactiveTransport):
         self.settings.update(settings)
         # Initialize the steady sys of eqs A matrix
         self._A_steady = None
+        self._output_sink = DictSink()
         if phase is not None:
             self.setup(phase=phase)
         # Initialize the initial condition
@@ -181,6 +187,34 @@ class TransientReactiveTransport(ReactiveTransport):
             raise Exception('"quantity" has not been defined on this algorithm')
         self[quantity] = values
 
+    def set_output_sink(self, sink):
+        r"""
+        Sets where the transient solutions are stored at each output time
+
+        Parameters
+        ----------
+        sink : OpenPNM output sink
+            The object receiving the solutions.  The default, ``DictSink``,
+            stores them on the algorithm under ``quantity@t``, so memory use
+            grows with the number of outputs.  ``MemorySink`` can keep only
+            the most recent outputs, and ``ZarrSink`` streams them to disk.
+            See ``openpnm.algorithms.sinks`` for details.
+
+        Notes
+        -----
+        The ``results`` method fetches the time steps from the sink, so it
+        works the same way regardless of which sink is used.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[5, 1, 1])
+        >>> alg = op.algorithms.TransientReactiveTransport(network=pn)
+        >>> alg.set_output_sink(op.algorithms.sinks.MemorySink(max_steps=10))
+
+        """
+        self._output_sink = sink
+
     def _overwrite_ICs_with_value_BCs(self):
         ic_vals = self['pore.ic']
         # Ensure the given initial conditions have any value BC inserted
@@ -342,7 +376,7 @@ class TransientReactiveTransport(ReactiveTransport):
             # Export the initial field (t=t_initial)
             t_str = self._nbr_to_str(t)
             quant_init = self["pore.ic"]
-            self[quantity + '@' + t_str] = quant_init
+            self._write_output(t_str, quant_init)
             self[quantity] = quant_init
 
             for time in np.arange(t+dt, tf+dt, dt):
@@ -361,12 +395,19 @@ class TransientReactiveTransport(ReactiveTransport):
                 # value in outputs is exported.
                 if round(time, t_pre) in out:
                     t_str = self._nbr_to_str(time)
-                    self[quantity + '@' + t_str] = x_new
+                    self._write_output(t_str, x_new)
                     self.settings['t_solns'].append(t_str)
                     logger.info(f'        Exporting time step: {time} s')
 
             logger.info(f'    Maximum time step reached: {time} s')
 
+    def _write_output(self, t_str, values):
+        r"""
+        Passes the solution at the output time ``t_str`` to the output sink
+        """
+        sink = getattr(self, '_output_sink', None) or DictSink()
+        sink.write(obj=self, propname=self.settings['quantity'], t=t_str,
+                   values=values)
 
     def _t_run_reactive(self, x0=None):
         """r
@@ -387,13 +428,15 @@ class TransientReactiveTransport(ReactiveTransport):
 
         Notes
         -----
-        Description of 'relaxation_quantity' and 'nlin_max_iter' settings can be
-        found in the parent class 'ReactiveTransport' documentation.
+        Description of 'relaxation_quantity', 'anderson_depth' and
+        'nlin_max_iter' settings can be found in the parent class
+        'ReactiveTransport' documentation.
 
         """
         quantity = self.settings['quantity']
         w = self.settings['relaxation_quantity']
         max_it = int(self.settings['nlin_max_iter'])
+        mixer = self._get_mixer()
         x = np.zeros(self.Np, dtype=float) if x0 is None else x0.copy()
 
         # Write initial guess to algorithm for _update_iterative_props to work
@@ -414,7 +457,8 @@ class TransientReactiveTransport(ReactiveTransport):
                 return x
             logger.info(f'Tolerance not met: {res:.4e}')
             # Solve, use relaxation, and update solution on algorithm obj
-            self[quantity] = x = self._solve(x0=x) * w + x * (1 - w)
+            self[quantity] = x = self._next_iterate(x, self._solve(x0=x),
+                                                    w, mixer)
 
         # Check solution convergence after max_it iterations
         if not self._is_converged():
@@ -448,6 +492,10 @@ class TransientReactiveTransport(ReactiveTransport):
         t_pre = self.settings['t_precision']
         quantity = self.settings['quantity']
         q = [k for k in list(self.keys()) if quantity in k]
+        # Time steps held by the output sink rather than on self
+        sink = getattr(self, '_output_sink', None) or DictSink()
+        q += [quantity + '@' + i for i in sink.times(self, quantity)
+              if quantity + '@' + i not in q]
         if times is None:
             t = q
         elif times in ['final', 'actual']:
@@ -469,7 +517,8 @@ class TransientReactiveTransport(ReactiveTransport):
                                      np.around(strd_t, decimals=t_pre))
             if missing_t.size != 0:
                 logger.warning('Time(s) '+str(missing_t)+' not stored.')
-        d = {k: self[k] for k in t}
+        d = {k: self[k] if k in self.keys()
+             else sink.read(self, *k.split('@', 1)) for k in t}
         return d
 
     def _nbr_to_str(self, nbr, t_pre=None):
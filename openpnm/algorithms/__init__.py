@@ -45,4 +45,5 @@ from .TransientNernstPlanckMultiphysicsSolver import (
     TransientNernstPlanckMultiphysicsSolver
 )
 
+from . import sinks
 from . import metrics
@@ -1,4 +1,6 @@
 import numpy as np
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import splu
 from openpnm.utils import logging, Project, Workspace, PrintableDict
 from openpnm.phases import GenericPhase
 from openpnm.physics import GenericPhysics
@@ -92,6 +94,108 @@ class FormationFactor(GenericMetric):
         r"""
         Execute the diffusion simulations in the principle directions.
 
+        """
+        phase = self._get_phase()
+        g = phase['throat.diffusive_conductance']
+        L = self._build_laplacian(g)
+        helper = FickianDiffusion(network=self.network, phase=phase)
+        for bcs in self.settings['inlets'].keys():
+            Pin = self.network.pores(self.settings['inlets'][bcs])
+            Pout = self.network.pores(self.settings['outlets'][bcs])
+            x_bc = np.full(self.network.Np, np.nan)
+            x_bc[Pin] = 1.0
+            x_bc[Pout] = 0.0
+            x = _solve(L, x_bc[:, np.newaxis])[:, 0]
+            A, Le = self._get_area_and_length(bcs, Pin, Pout, helper)
+            R = np.sum((L @ x)[Pin])
+            Deff = R*Le/A  # Conc gradient and diffusivity were both unity
+            self.results[bcs] = 1/Deff
+        self._purge(phase, helper)
+
+    def run_tensor(self, directions={}):
+        r"""
+        Finds the full formation factor tensor of the network
+
+        Parameters
+        ----------
+        directions : dict, optional
+            Additional (off-axis) directions in which to find the formation
+            factor, given as ``{label: vector}`` (e.g. ``{'xy': [1, 1, 0]}``).
+            The result for each is added to ``results`` under its label.
+
+        Notes
+        -----
+        A linearly varying concentration is imposed on all the inlet and
+        outlet faces at once, so the coefficient matrix is the same for every
+        direction.  It is factorized once and all directions are solved
+        together.  The effective diffusivity tensor is found from the volume
+        averaged flux, and the formation factor tensor, which is its inverse,
+        is stored in ``tensor``.  Rows and columns of axes along which the
+        network has no extent (i.e. 2D networks) are ``nan``.
+
+        Because the concentration is fixed on the side faces, the diagonal
+        values differ slightly from those found by ``run``, where the side
+        faces are impermeable.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[5, 5, 5], spacing=1e-5)
+        >>> geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps,
+        ...                                throats=pn.Ts)
+        >>> F = op.algorithms.metrics.FormationFactor(network=pn)
+        >>> F.run_tensor(directions={'xy': [1, 1, 0]})
+        >>> F.tensor.shape
+        (3, 3)
+
+        """
+        net = self.network
+        coords = net['pore.coords']
+        axes = [ax for ax in self.settings['inlets'].keys()
+                if np.ptp(coords[:, 'xyz'.index(ax)]) > 0]
+        if len(axes) == 0:
+            raise Exception('No inlets found along an axis with nonzero '
+                            + 'extent')
+        dims = ['xyz'.index(ax) for ax in axes]
+        phase = self._get_phase()
+        g = phase['throat.diffusive_conductance']
+        L = self._build_laplacian(g)
+        helper = FickianDiffusion(network=net, phase=phase)
+        bc = np.zeros(net.Np, dtype=bool)
+        for ax in axes:
+            Pin = net.pores(self.settings['inlets'][ax])
+            Pout = net.pores(self.settings['outlets'][ax])
+            bc[Pin] = True
+            bc[Pout] = True
+            if ax == axes[0]:  # Domain volume from first direction
+                A, Le = self._get_area_and_length(ax, Pin, Pout, helper)
+                V = A*Le
+        self._purge(phase, helper)
+        # Imposed gradient is -e, so concentration is -(x . e)
+        E = np.eye(3)[:, dims]
+        E = np.hstack([E] + [np.array(v, dtype=float).reshape(3, 1)
+                             for v in directions.values()])
+        x_bc = np.full((net.Np, E.shape[1]), np.nan)
+        x_bc[bc] = -(coords[bc] @ E)
+        x = _solve(L, x_bc)
+        # Volume averaged flux for each imposed gradient
+        conns = net['throat.conns']
+        q = g[:, np.newaxis]*(x[conns[:, 0]] - x[conns[:, 1]])
+        d = coords[conns[:, 1]] - coords[conns[:, 0]]
+        J = d.T @ q / V
+        D = np.full((3, 3), np.nan)
+        D[np.ix_(dims, dims)] = J[dims, :len(dims)]
+        F = np.full((3, 3), np.nan)
+        F[np.ix_(dims, dims)] = np.linalg.inv(D[np.ix_(dims, dims)])
+        self.tensor = F
+        for i, label in enumerate(directions.keys()):
+            e = E[:, len(dims) + i]
+            self.results[label] = (e @ e)/(e @ J[:, len(dims) + i])
+
+    def _get_phase(self):
+        r"""
+        Creates a phase with unit diffusivity and the diffusive conductance
+        of each throat
         """
         phase = GenericPhase(network=self.network)
         phase['pore.diffusivity'] = 1.0
@@ -101,24 +205,38 @@ class FormationFactor(GenericMetric):
             phys = GenericPhysics(network=self.network,
                                   phase=phase, geometry=geom)
             phys.add_model(propname='throat.diffusive_conductance', model=mod)
-        for bcs in self.settings['inlets'].keys():
-            Diff = FickianDiffusion(network=self.project.network, phase=phase)
-            Pin = self.network.pores(self.settings['inlets'][bcs])
-            Diff.set_value_BC(pores=Pin, values=1.0)
-            Pout = self.network.pores(self.settings['outlets'][bcs])
-            Diff.set_value_BC(pores=Pout, values=0.0)
-            Diff.run()
-            A = self.settings['areas'][bcs]
-            if A is None:
-                A = Diff._get_domain_area()
-                self.settings['areas'][bcs] = A
-            L = self.settings['lengths'][bcs]
-            if L is None:
-                L = Diff._get_domain_length()
-                self.settings['lengths'][bcs] = L
-            R = Diff.rate(pores=Pin)
-            Deff = R*L/A  # Conc gradient and diffusivity were both unity
-            self.results[bcs] = 1/Deff[0]
+        return phase
+
+    def _purge(self, phase, alg):
+        r"""
+        Removes the objects used by ``run`` from the project
+        """
+        self.project.purge_object(alg)
+        for phys in self.project.find_physics(phase=phase):
+            self.project.purge_object(phys)
+        self.project.purge_object(phase)
+
+    def _build_laplacian(self, g):
+        r"""
+        Builds the Laplacian matrix of the network weighted by ``g``
+        """
+        am = self.network.create_adjacency_matrix(weights=g, fmt='coo')
+        return csgraph.laplacian(am).tocsr()
+
+    def _get_area_and_length(self, direction, inlets, outlets, alg):
+        r"""
+        Returns the area and length of the domain in the given direction,
+        estimating them with ``alg`` if they were not given in ``settings``
+        """
+        A = self.settings['areas'][direction]
+        if A is None:
+            A = alg._get_domain_area(inlets=inlets, outlets=outlets)
+            self.settings['areas'][direction] = A
+        L = self.settings['lengths'][direction]
+        if L is None:
+            L = alg._get_domain_length(inlets=inlets, outlets=outlets)
+            self.settings['lengths'][direction] = L
+        return A, L
 
     def set_inlets(self, direction, label):
         r"""
@@ -203,3 +321,19 @@ class FormationFactor(GenericMetric):
         setting dictionary under 'lengths'.
         """
         self.settings['lengths'][direction] = length
+
+
+def _solve(L, x_bc):
+    r"""
+    Solves the Laplace equation with the given values fixed in the pores
+    where ``x_bc`` is finite, for each column of ``x_bc``
+    """
+    x = np.array(x_bc, dtype=float)
+    bc = np.isfinite(x[:, 0])
+    A = L[~bc][:, ~bc].tocsc()
+    b = -L[~bc][:, bc] @ x[bc]
+    # The matrix is symmetric so use a symmetric ordering
+    lu = splu(A, permc_spec='MMD_AT_PLUS_A',
+              options=dict(SymmetricMode=True))
+    x[~bc] = lu.solve(b)
+    return x
@@ -1,4 +1,6 @@
 import numpy as np
+import scipy.sparse as sprs
+from numpy.linalg import norm
 from openpnm import models
 from openpnm.utils import logging
 from openpnm.phases import GenericPhase
@@ -16,6 +18,8 @@ default_settings = {
     'flow_inlet': None,
     'flow_outlet': None,
     'Snwp_num': None,
+    'reuse_assembly': True,
+    'processes': 1,
 }
 
 
@@ -43,6 +47,17 @@ class RelativePermeability(GenericAlgorithm):
        we only use the flow rate of the phase of interest in single and
        multiphase permeability calculation.
 
+    4. By default (``settings['reuse_assembly'] = True``) the coefficient
+       matrix structure for each flow direction is built once and only its
+       values are updated at each saturation, without regenerating the
+       multiphase models on the phases.  Each solve starts from the
+       solution at the previous saturation, which speeds up iterative
+       solvers (e.g. ``settings['solver_family'] = 'pyamg'``).  Any
+       settings starting with ``'solver_'`` are passed on to the
+       ``StokesFlow`` algorithms used internally.  The saturation points
+       can also be split over several processes using
+       ``settings['processes']``.
+
     """
 
     def __init__(self, settings={}, **kwargs):
@@ -194,8 +209,7 @@ class RelativePermeability(GenericAlgorithm):
         are contributing to the darcy's law.
 
         """
-        network = self.project.network
-        St_p = StokesFlow(network=network, phase=phase)
+        St_p = self._flow_algorithm(phase)
         St_p.set_value_BC(pores=flow_pores[0], values=1)
         St_p.set_value_BC(pores=flow_pores[1], values=0)
         St_p.run()
@@ -241,12 +255,11 @@ class RelativePermeability(GenericAlgorithm):
            relative permeability ratio.
 
         """
-        network = self.project.network
         self._regenerate_models()
         if self.settings['wp'] is not None:
             wp = self.project[self.settings['wp']]
-            St_mp_wp = StokesFlow(network=network, phase=wp)
-            St_mp_wp.setup(conductance='throat.conduit_hydraulic_conductance')
+            St_mp_wp = self._flow_algorithm(
+                wp, conductance='throat.conduit_hydraulic_conductance')
             St_mp_wp.set_value_BC(pores=flow_pores[0], values=1)
             St_mp_wp.set_value_BC(pores=flow_pores[1], values=0)
             St_mp_wp.run()
@@ -256,16 +269,228 @@ class RelativePermeability(GenericAlgorithm):
             Kewp = None
             pass
         nwp = self.project[self.settings['nwp']]
-        St_mp_nwp = StokesFlow(network=network, phase=nwp)
+        St_mp_nwp = self._flow_algorithm(
+            nwp, conductance='throat.conduit_hydraulic_conductance')
         St_mp_nwp.set_value_BC(pores=flow_pores[0], values=1)
         St_mp_nwp.set_value_BC(pores=flow_pores[1], values=0)
-        St_mp_nwp.setup(conductance='throat.conduit_hydraulic_conductance')
         St_mp_nwp.run()
         Kenwp = np.sum(abs(St_mp_nwp.rate(pores=flow_pores[1])))
         Kenwp = Kenwp
         self.project.purge_object(obj=St_mp_nwp)
         return [Kewp, Kenwp]
 
+    def _flow_algorithm(self, phase, conductance=None):
+        r"""
+        Creates a StokesFlow algorithm for the given phase, passing on any
+        solver settings given to this algorithm.
+        """
+        network = self.project.network
+        alg = StokesFlow(network=network, phase=phase)
+        if conductance is not None:
+            alg.setup(conductance=conductance)
+        alg.settings.update({k: v for k, v in self.settings.items()
+                             if k.startswith('solver_')})
+        return alg
+
+    def _build_system(self, flow_pores):
+        r"""
+        Builds the parts of the flow problem that do not change with
+        saturation for the given flow direction.
+
+        Parameters
+        ----------
+        flow_pores: list of np.ndarrays
+            The inlet and outlet pores, as in ``_abs_perm_calc``.
+
+        Returns
+        -------
+        system: dict
+            The indices needed to assemble the coefficient matrix and RHS
+            of the problem on the pores not subject to boundary conditions
+            from a given set of conductance values, and to compute the
+            flow rate through the outlet pores.
+
+        Notes
+        -----
+        The inlet and outlet pores are eliminated from the problem rather
+        than replaced by rows of the identity matrix, which gives the same
+        solution but keeps the matrix structure fixed.
+
+        """
+        network = self.project.network
+        Np = network.Np
+        conns = network['throat.conns'].astype(np.int64)
+        rows = np.hstack((conns[:, 0], conns[:, 1], conns[:, 0], conns[:, 1]))
+        cols = np.hstack((conns[:, 1], conns[:, 0], conns[:, 0], conns[:, 1]))
+        # Sorting by row then column gives the entries in CSR order
+        keys, inv = np.unique(rows*Np + cols, return_inverse=True)
+        rows, cols = keys // Np, keys % Np
+        x_bc = np.full(Np, np.nan)
+        x_bc[flow_pores[0]] = 1
+        x_bc[flow_pores[1]] = 0
+        free = np.isnan(x_bc)
+        ind = np.cumsum(free) - 1
+        Nf = free.sum()
+        keep = free[rows] & free[cols]
+        indptr = np.zeros(Nf + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(ind[rows[keep]], minlength=Nf))
+        bsel = free[rows] & ~free[cols]
+        outlet = np.zeros(Np, dtype=bool)
+        outlet[flow_pores[1]] = True
+        osel = outlet[rows]
+        system = {'inv': inv, 'Nnz': keys.size, 'free': free, 'x_bc': x_bc,
+                  'keep': keep, 'indices': ind[cols[keep]], 'indptr': indptr,
+                  'bsel': bsel, 'brow': ind[rows[bsel]],
+                  'bval': x_bc[cols[bsel]],
+                  'osel': osel, 'ocol': cols[osel]}
+        return system
+
+    def _flow_rate(self, system, alg, g, x0=None):
+        r"""
+        Solves the flow problem for the given conductance values and
+        returns the flow rate through the outlet pores.
+
+        Parameters
+        ----------
+        system: dict
+            The problem structure returned by ``_build_system``.
+        alg: StokesFlow
+            The algorithm whose solver settings are used.
+        g: np.ndarray
+            The conductance of each throat.
+        x0: np.ndarray, optional
+            The initial guess for the pressure in the pores not subject to
+            boundary conditions.
+
+        Returns
+        -------
+        rate, x: float, np.ndarray
+            The absolute flow rate through the outlet pores and the
+            pressure in the pores not subject to boundary conditions.
+
+        """
+        data = np.bincount(system['inv'], weights=np.hstack((-g, -g, g, g)),
+                           minlength=system['Nnz'])
+        Nf = system['indptr'].size - 1
+        A = sprs.csr_matrix((data[system['keep']], system['indices'],
+                             system['indptr']), shape=(Nf, Nf))
+        b = -np.bincount(system['brow'],
+                         weights=data[system['bsel']]*system['bval'],
+                         minlength=Nf)
+        x0 = np.zeros(Nf) if x0 is None else x0
+        tol = alg.settings['solver_tol']
+        atol = alg.settings['solver_atol']
+        atol = norm(b)*tol if atol is None else atol
+        rtol = alg.settings['solver_rtol']
+        if rtol is None:
+            res0 = norm(A*x0 - b)
+            rtol = atol/res0 if res0 > 0 else tol
+        max_it = alg.settings['solver_max_iter']
+        if alg.settings['solver_family'] == 'pyamg':
+            # The matrix is symmetric positive definite, and classical AMG
+            # copes better with the large contrast in conductance
+            import pyamg
+            ml = pyamg.ruge_stuben_solver(A)
+            x = ml.solve(b=b, x0=x0, tol=tol, maxiter=max_it, accel='cg')
+        else:
+            solver = alg._get_solver()
+            x = solver(A, b, atol=atol, rtol=rtol, max_it=max_it, x0=x0)
+        res = norm(A*x - b)
+        if not np.isfinite(res):
+            raise Exception(f"Solution diverged, undefined residual: {res:.4e}")
+        if res > norm(b)*tol:
+            raise Exception("Solver did not converge.")
+        p = system['x_bc'].copy()
+        p[system['free']] = x
+        osel = system['osel']
+        rate = np.abs(np.sum(data[osel]*p[system['ocol']]))
+        return rate, x
+
+    def _conduit_conductance(self, phase, i):
+        r"""
+        Returns the conduit conductance of the given phase when the pores
+        and throats with invasion sequence below ``i`` are invaded, using
+        the same rule as the ``conduit_conductance`` model in 'medium'
+        mode.
+        """
+        network = self.project.network
+        Tinv = self['throat.invasion_sequence'] < i
+        Pinv = self['pore.invasion_sequence'] < i
+        if phase.name == self.settings['wp']:
+            mask = Tinv + np.all(Pinv[network['throat.conns']], axis=1)
+        else:
+            mask = ~Tinv + np.all(~Pinv[network['throat.conns']], axis=1)
+        g = phase[self.settings['hydraulic_conductance']].copy()
+        g[mask] = g[mask]*1e-6
+        return g
+
+    def _phases(self):
+        phases = [self.project[self.settings['nwp']]]
+        if self.settings['wp'] is not None:
+            phases.insert(0, self.project[self.settings['wp']])
+        return phases
+
+    def _abs_perm_fast(self, flow_pores):
+        r"""
+        Calculates the absolute permeability for each phase in the
+        direction defined by flow_pores, returning a list ordered as
+        ``[wp, nwp]`` (or ``[nwp]`` if there is no defending phase).
+        """
+        system = self._build_system(flow_pores)
+        K_abs = []
+        for phase in self._phases():
+            alg = self._flow_algorithm(phase)
+            g = phase[self.settings['hydraulic_conductance']]
+            K_abs.append(self._flow_rate(system, alg, g)[0])
+            self.project.purge_object(obj=alg)
+        return K_abs
+
+    def _eff_perm_fast(self, flow_pores, seq):
+        r"""
+        Calculates the effective permeability of each phase at each of the
+        given invasion sequence limits, reusing the problem structure and
+        starting each solve from the previous solution.
+
+        Returns
+        -------
+        output: list of lists
+            The effective permeabilities of each phase at each sequence
+            limit, ordered as ``[wp, nwp]`` (or ``[nwp]`` if there is no
+            defending phase).
+
+        """
+        system = self._build_system(flow_pores)
+        K_eff = []
+        for phase in self._phases():
+            alg = self._flow_algorithm(phase)
+            rates, x = [], None
+            for i in seq:
+                g = self._conduit_conductance(phase, i)
+                rate, x = self._flow_rate(system, alg, g, x0=x)
+                rates.append(rate)
+            K_eff.append(rates)
+            self.project.purge_object(obj=alg)
+        return K_eff
+
+    def _eff_perm_batch(self, flow_pores, seq):
+        r"""
+        Runs ``_eff_perm_fast`` on the given sequence limits, splitting
+        them into contiguous chunks over ``settings['processes']`` worker
+        processes if more than one is requested.
+        """
+        processes = self.settings['processes']
+        if processes in [None, 1] or len(seq) < 2:
+            return self._eff_perm_fast(flow_pores, seq)
+        from openpnm.utils import ParameterSweep
+        chunks = np.array_split(np.asarray(seq), min(processes, len(seq)))
+        params = [{'name': self.name, 'flow_pores': flow_pores, 'seq': c}
+                  for c in chunks]
+        sweep = ParameterSweep(self.project, _eff_perm_chunk,
+                               processes=processes)
+        results = sweep.run(params)
+        return [sum([r[k] for r in results], [])
+                for k in range(len(results[0]))]
+
     def _sat_occ_update(self, i):
         r"""
         Calculates the saturation of each phase using the invasion
@@ -321,6 +546,11 @@ class RelativePermeability(GenericAlgorithm):
            phase is then calculated. Relative permeability is defined by
            devision of K_eff and K_abs.
 
+        3. If ``settings['reuse_assembly']`` is ``True`` (default), the
+           effective permeabilities are calculated by ``_eff_perm_fast``,
+           which does not update the ``conduit_hydraulic_conductance``
+           models on the phases.
+
         """
         if Snwp_num is None:
             Snwp_num = self.settings['Snwp_num']
@@ -329,6 +559,12 @@ class RelativePermeability(GenericAlgorithm):
         for dim in K_dir:
             flow_pores = [net.pores(self.settings['flow_inlets'][dim]),
                           net.pores(self.settings['flow_outlets'][dim])]
+            if self.settings['reuse_assembly']:
+                K_abs = self._abs_perm_fast(flow_pores)
+                self.Kr_values['perm_abs_nwp'].update({dim: K_abs[-1]})
+                if self.settings['wp'] is not None:
+                    self.Kr_values['perm_abs_wp'].update({dim: K_abs[0]})
+                continue
             if self.settings['wp'] is not None:
                 phase = self.project[self.settings['wp']]
                 K_abs = self._abs_perm_calc(phase, flow_pores)
@@ -355,7 +591,19 @@ class RelativePermeability(GenericAlgorithm):
             Snwparr = []
             flow_pores = [net.pores(self.settings['flow_inlets'][dirs]),
                           net.pores(self.settings['flow_outlets'][dirs])]
-            for j in range(start, stop, step):
+            if self.settings['reuse_assembly']:
+                seq = list(range(start, stop, step))
+                Snwparr = [self._sat_occ_update(j) for j in seq]
+                K_eff = self._eff_perm_batch(flow_pores, seq)
+                Kabs = self.Kr_values['perm_abs_nwp'][dirs]
+                relperm_nwp = [K/Kabs for K in K_eff[-1]]
+                if self.settings['wp'] is not None:
+                    Kabs = self.Kr_values['perm_abs_wp'][dirs]
+                    relperm_wp = [K/Kabs for K in K_eff[0]]
+                seq = []
+            else:
+                seq = range(start, stop, step)
+            for j in seq:
                 sat = self._sat_occ_update(j)
                 Snwparr.append(sat)
                 [Kewp, Kenwp] = self._eff_perm_calc(flow_pores)
@@ -411,3 +659,10 @@ class RelativePermeability(GenericAlgorithm):
             self.Kr_values['results']['kr_wp'] = None
         self.Kr_values['results']['kr_nwp'] = self.Kr_values['relperm_nwp']
         return self.Kr_values['results']
+
+
+def _eff_perm_chunk(project, name, flow_pores, seq):
+    r"""
+    Runs part of the effective permeability calculation in a worker process
+    """
+    return project[name]._eff_perm_fast(flow_pores, seq)
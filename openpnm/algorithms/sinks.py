@@ -0,0 +1,187 @@
+r"""
+Output sinks receive the solutions produced by transient algorithms at each
+output time, and decide where and for how long they are kept.
+
++---------------+-------------------------------------------------------------+
+| Sink          | Description                                                 |
++===============+=============================================================+
+| ``DictSink``  | Stores each time step on the algorithm as                   |
+|               | ``'pore.quantity@t'`` (default)                             |
++---------------+-------------------------------------------------------------+
+| ``MemorySink``| Keeps time steps in memory, optionally only the most recent |
+|               | ones (i.e. a ring buffer)                                   |
++---------------+-------------------------------------------------------------+
+| ``ZarrSink``  | Streams each time step to a Zarr store on disk as it is     |
+|               | produced, as written by ``openpnm.io.Zarr``                 |
++---------------+-------------------------------------------------------------+
+
+"""
+import numpy as np
+from collections import OrderedDict
+
+
+class GenericSink:
+    r"""
+    The interface shared by all output sinks.  Subclasses must implement
+    ``write``, ``read`` and ``times``.
+    """
+
+    def write(self, obj, propname, t, values):
+        r"""
+        Stores the values of ``propname`` on ``obj`` at time ``t``
+
+        Parameters
+        ----------
+        obj : OpenPNM Algorithm
+            The algorithm producing the values
+        propname : string
+            The name of the quantity (e.g. ``'pore.concentration'``)
+        t : string
+            The output time, as formatted by the algorithm
+        values : ND-array
+            The values of the quantity at time ``t``
+
+        """
+        raise NotImplementedError
+
+    def read(self, obj, propname, t):
+        r"""
+        Returns the values of ``propname`` on ``obj`` at time ``t``, raising
+        a ``KeyError`` if the time step is not held by the sink
+        """
+        raise NotImplementedError
+
+    def times(self, obj, propname):
+        r"""
+        Returns a list of the times held by the sink for ``propname`` on
+        ``obj``, in the order they were written
+        """
+        raise NotImplementedError
+
+
+class DictSink(GenericSink):
+    r"""
+    Stores time steps on the algorithm itself under ``'pore.quantity@t'``,
+    which was the only option before sinks were introduced
+    """
+
+    def write(self, obj, propname, t, values):
+        obj[propname + '@' + t] = values
+
+    def read(self, obj, propname, t):
+        return obj[propname + '@' + t]
+
+    def times(self, obj, propname):
+        return [k.split('@', 1)[1] for k in obj.keys()
+                if k.startswith(propname + '@')]
+
+
+class MemorySink(GenericSink):
+    r"""
+    Keeps time steps in memory, separate from the algorithm's dictionary
+
+    Parameters
+    ----------
+    max_steps : int, optional
+        The maximum number of time steps kept per quantity.  When exceeded
+        the oldest time step is discarded, so the memory used stays constant
+        regardless of the simulation length.  If not given then all time
+        steps are kept.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> sink = op.algorithms.sinks.MemorySink(max_steps=2)
+    >>> alg = op.algorithms.GenericAlgorithm(network=op.network.Cubic([3, 1, 1]))
+    >>> for t in ['0', '1', '2']:
+    ...     sink.write(alg, 'pore.x', t, [1, 2, 3])
+    >>> sink.times(alg, 'pore.x')
+    ['1', '2']
+
+    """
+
+    def __init__(self, max_steps=None):
+        self.max_steps = max_steps
+        self._data = {}
+
+    def write(self, obj, propname, t, values):
+        steps = self._data.setdefault((obj.name, propname), OrderedDict())
+        steps[t] = np.array(values, copy=True)
+        steps.move_to_end(t)
+        if self.max_steps is not None:
+            while len(steps) > self.max_steps:
+                steps.popitem(last=False)
+
+    def read(self, obj, propname, t):
+        return self._data.get((obj.name, propname), {})[t]
+
+    def times(self, obj, propname):
+        return list(self._data.get((obj.name, propname), {}).keys())
+
+    def clear(self):
+        r"""
+        Removes all stored time steps
+        """
+        self._data = {}
+
+
+class ZarrSink(GenericSink):
+    r"""
+    Streams time steps to a Zarr store on disk
+
+    Parameters
+    ----------
+    filename : string or path object
+        The name of the store.  If it already exists the time steps are
+        added to it, so it can be an existing project store written with
+        ``openpnm.io.Zarr.save_project``.
+    compressor : numcodecs Codec, optional
+        The compressor to use.  The default is that of ``openpnm.io.Zarr``.
+    chunks : boolean, int or tuple
+        The chunking of each time step, as in ``openpnm.io.Zarr``.
+    num_threads : int, optional
+        The number of threads used by Blosc to compress each time step.
+
+    Notes
+    -----
+    Each time step is written as soon as it is produced, so the memory used
+    does not grow with the number of outputs.  The store can be read from
+    another process while the simulation is still running, using
+    ``openpnm.io.Zarr.load_project``.  Calling ``results`` on the algorithm
+    reads the requested time steps back from the store.
+
+    """
+
+    def __init__(self, filename, compressor=None, chunks=True,
+                 num_threads=None):
+        self.filename = filename
+        self.compressor = compressor
+        self.chunks = chunks
+        self.num_threads = num_threads
+
+    def write(self, obj, propname, t, values):
+        from openpnm.io import Zarr
+        Zarr.append_time_step(filename=self.filename, obj=obj, t=t,
+                              data={propname: values},
+                              compressor=self.compressor, chunks=self.chunks,
+                              num_threads=self.num_threads)
+
+    def read(self, obj, propname, t):
+        import zarr
+        from openpnm.io import Zarr
+        f = Zarr._parse_filename(self.filename, 'zarr')
+        try:
+            arr = zarr.open_group(str(f), mode='r')[obj.name]['@time'][propname]
+        except (KeyError, ValueError):
+            raise KeyError(propname + '@' + t)
+        times = list(arr.attrs['times'])
+        if t not in times:
+            raise KeyError(propname + '@' + t)
+        return arr[times.index(t)]
+
+    def times(self, obj, propname):
+        from openpnm.io import Zarr
+        try:
+            return Zarr.load_times(self.filename, obj, propname)
+        except (KeyError, ValueError):
+            return []
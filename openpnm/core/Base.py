@@ -254,6 +254,10 @@ class Base(dict):
         if key in self.keys():
             # Get values if present on self
             vals = super().__getitem__(key)
+            if not isinstance(vals, np.ndarray):
+                # Read arrays that were lazily loaded from file
+                vals = np.array(vals)
+                super().__setitem__(key, vals)
         elif key in self.keys(mode='all', deep=True):
             # Interleave values from geom if found there
             vals = self.interleave_data(key)
@@ -1179,7 +1183,7 @@ class Base(dict):
         N = self.project.network._count(element)
 
         # Attempt to fetch the requested array from each object
-        arrs = [obj.get(prop, None) for obj in sources]
+        arrs = [obj[prop] if prop in obj.keys() else None for obj in sources]
 
         # Check for missing sources, and add None to arrs if necessary
         if N > sum([obj._count(element) for obj in sources]):
@@ -1276,7 +1280,7 @@ class Base(dict):
             The dictionary key to the values to be interpolated.
         mode : string
             The method used for interpolation.  Options are 'mean' (default),
-            'min', and 'max'.
+            'min', 'max' and 'sum'.
 
         Returns
         -------
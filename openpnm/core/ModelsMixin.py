@@ -1,3 +1,4 @@
+import heapq
 import inspect
 import numpy as np
 from openpnm.utils import PrintableDict, logging, Workspace
@@ -51,15 +52,60 @@ class ModelsDict(PrintableDict):
         dependency_map
 
         """
-        import networkx as nx
-
-        dtree = self.dependency_graph()
-        cycles = list(nx.simple_cycles(dtree))
-        if cycles:
+        # The graph is sorted here rather than with NetworkX, which takes
+        # longer to import than most models take to run, and the order is
+        # the same as nx.lexicographical_topological_sort(dtree, sorted)
+        nodes, edges = self._dependency_edges()
+        children = {node: [] for node in nodes}
+        indegree = {node: 0 for node in nodes}
+        for u, v in edges:
+            children[u].append(v)
+            indegree[v] += 1
+        order = {node: i for i, node in enumerate(nodes)}
+        ready = [(sorted(n), order[n], n) for n in nodes if indegree[n] == 0]
+        heapq.heapify(ready)
+        d = []
+        while ready:
+            node = heapq.heappop(ready)[2]
+            for child in children[node]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(ready, (sorted(child), order[child], child))
+            d.append(node)
+        if len(d) < len(nodes):
+            import networkx as nx
+            cycles = list(nx.simple_cycles(self.dependency_graph()))
             raise Exception('Cyclic dependency found: ' + ' -> '.join(
                             cycles[0] + [cycles[0][0]]))
-        d = nx.algorithms.dag.lexicographical_topological_sort(dtree, sorted)
-        return list(d)
+        return d
+
+    def _dependency_edges(self, deep=False):
+        r"""
+        Returns the nodes and edges of the dependency graph, in the order in
+        which they are added to it
+        """
+        models = list(self.keys())
+        # Fetch model-less props: those w/o any model, like temperature
+        # otherwise, they won't get picked up in the dependency graph.
+        all_props = list(self._find_parent().keys())
+        exclude_keys = ["pore.all", "throat.all"]
+        pure_props = np.setdiff1d(all_props, models + exclude_keys).tolist()
+
+        nodes = {}
+        edges = {}
+        for model in models:
+            nodes[model] = None
+            # Filter pore/throat props only
+            dependencies = set()
+            for param in self[model].values():
+                if is_valid_propname(param):
+                    dependencies.add(param)
+            # Add depenency from model's parameters
+            for d in dependencies:
+                if deep or (d in models + pure_props):
+                    nodes[d] = None
+                    edges[(d, model)] = None
+        return list(nodes), list(edges)
 
     def dependency_graph(self, deep=False):
         r"""
@@ -102,27 +148,9 @@ class ModelsDict(PrintableDict):
         import networkx as nx
 
         dtree = nx.DiGraph()
-        models = list(self.keys())
-        # Fetch model-less props: those w/o any model, like temperature
-        # otherwise, they won't get picked up in the dependency graph.
-        all_props = list(self._find_parent().keys())
-        exclude_keys = ["pore.all", "throat.all"]
-        pure_props = np.setdiff1d(all_props, models + exclude_keys).tolist()
-
-        for model in models:
-            dtree.add_node(model)
-            # Filter pore/throat props only
-            dependencies = set()
-            for param in self[model].values():
-                if is_valid_propname(param):
-                    dependencies.add(param)
-            # Add depenency from model's parameters
-            for d in dependencies:
-                if not deep:
-                    if d in models + pure_props:
-                        dtree.add_edge(d, model)
-                else:
-                    dtree.add_edge(d, model)
+        nodes, edges = self._dependency_edges(deep=deep)
+        dtree.add_nodes_from(nodes)
+        dtree.add_edges_from(edges)
 
         return dtree
 
@@ -350,7 +378,11 @@ class ModelsMixin:
         if model.__defaults__:
             vals = list(inspect.getfullargspec(model).defaults)
             keys = inspect.getfullargspec(model).args[-len(vals):]
+            # The locations of local models are not parameters
+            locs = getattr(model, 'locality', None)
             for k, v in zip(keys, vals):  # Put defaults into kwargs
+                if locs and k == locs + 's':
+                    continue
                 if k not in kwargs:  # Skip if argument was given in kwargs
                     kwargs.update({k: v})
         self.models[propname] = ModelWrapper(kwargs)  # Store all kwargs
@@ -358,7 +390,8 @@ class ModelsMixin:
         if regen_mode not in ['deferred', 'explicit']:
             self._regen(propname)
 
-    def regenerate_models(self, propnames=None, exclude=[], deep=False):
+    def regenerate_models(self, propnames=None, exclude=[], deep=False,
+                          pores=None, throats=None):
         r"""
         Re-runs the specified model or models.
 
@@ -381,6 +414,36 @@ class ModelsMixin:
             The default is ``False``.  The method does not work in reverse,
             so regenerating models on a Physics will not update a Phase.
 
+        pores, throats : array_like, optional
+            The locations on this object where the data have changed.  If
+            given, models that declare their locality (see Notes) are only
+            run at the locations affected by the changes, while all other
+            models are run everywhere as usual.
+
+        Notes
+        -----
+        A model declares its locality with the ``openpnm.utils.locality``
+        decorator.  A 'pore' model is run on the given pores, while a
+        'throat' model is run on the given throats and on the throats
+        connected to the given pores.  The results are written into the
+        existing arrays, so the cost of the update is proportional to the
+        number of affected locations.
+
+        Examples
+        --------
+        >>> import openpnm as op
+        >>> pn = op.network.Cubic(shape=[5, 5, 5])
+        >>> geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps,
+        ...                                throats=pn.Ts)
+        >>> air = op.phases.Air(network=pn)
+        >>> phys = op.physics.Standard(network=pn, phase=air, geometry=geo)
+        >>> g = phys['throat.hydraulic_conductance'].copy()
+        >>> air['pore.viscosity'][[0, 1]] *= 2
+        >>> phys.regenerate_models('throat.hydraulic_conductance', pores=[0, 1])
+        >>> Ts = pn.find_neighbor_throats(pores=[0, 1])
+        >>> bool((phys['throat.hydraulic_conductance'][Ts] < g[Ts]).all())
+        True
+
         """
         # If empty list of propnames was given, do nothing and return
         if isinstance(propnames, list) and len(propnames) == 0:
@@ -395,31 +458,67 @@ class ModelsMixin:
             propnames = [i for i in propnames if i not in exclude]
         # Re-order given propnames according to dependency tree
         self_models = self.models.dependency_list()
-        propnames = [i for i in self_models if i in propnames]
-
         if deep:
             other_models = None  # Will trigger regen of ALL models
         else:
             # Make list of given propnames that are not in self
-            other_models = list(set(propnames).difference(set(self_models)))
+            other_models = [i for i in propnames if i not in self_models]
+        propnames = [i for i in self_models if i in propnames]
+        # Find the locations of local models to regenerate, if any
+        local = (pores is not None) or (throats is not None)
+        if local:
+            pores = np.unique(self._parse_indices(pores))
+            throats = np.unique(self._parse_indices(throats))
+            locs = {'pore': pores,
+                    'throat': self._affected_throats(pores, throats)}
+        else:
+            locs = None
         # The following has some redundant lines, but is easier to understand
         if self._isa('phase'):
             # Start be regenerating models on self
             for item in propnames:
-                self._regen(item)
+                self._regen(item, locs=locs)
             # Then regen models on associated objects, if any in other_models
             for phys in self.project.find_physics(phase=self):
-                phys.regenerate_models(propnames=other_models, deep=False)
+                if local:
+                    Ps, Ts = _to_subdomain(phys, **locs)
+                    phys.regenerate_models(propnames=other_models, deep=False,
+                                           pores=Ps, throats=Ts)
+                else:
+                    phys.regenerate_models(propnames=other_models, deep=False)
         elif self._isa('network'):  # Repeat for other object types
             for item in propnames:
-                self._regen(item)
+                self._regen(item, locs=locs)
             for geom in self.project.geometries().values():
-                geom.regenerate_models(propnames=other_models, deep=False)
+                if local:
+                    Ps, Ts = _to_subdomain(geom, **locs)
+                    geom.regenerate_models(propnames=other_models, deep=False,
+                                           pores=Ps, throats=Ts)
+                else:
+                    geom.regenerate_models(propnames=other_models, deep=False)
         else:
             for item in propnames:
-                self._regen(item)
+                self._regen(item, locs=locs)
 
-    def _regen(self, prop):
+    def _affected_throats(self, pores, throats):
+        r"""
+        Returns the given throats along with the throats on this object that
+        are connected to the given pores, all as indices on this object
+        """
+        if len(pores) == 0:
+            return throats
+        boss = self.project.find_full_domain(self)
+        if boss is self:
+            Ps = pores
+        else:
+            Ps = boss._get_indices(element='pore', labels=self.name)[pores]
+        network = self.project.network
+        Ts = network.find_neighbor_throats(pores=Ps)
+        if boss is not self:
+            Ts = _to_subdomain(self, pore=[], throat=Ts)[1]
+        return np.union1d(throats, Ts).astype(int)
+
+    def _regen(self, prop, locs=None):
         # Create a temporary dict of all model arguments
         try:
             kwargs = self.models[prop].copy()
@@ -429,6 +528,24 @@ class ModelsMixin:
         # Pop model and regen_mode from temporary dict
         model = kwargs.pop('model')
         regen_mode = kwargs.pop('regen_mode', None)
+        # Only run local models at the given locations, if any
+        element = getattr(model, 'locality', None)
+        if (locs is not None) and (element == prop.split('.')[0]) \
+                and (prop in self.keys()) \
+                and not self.settings['freeze_models'] \
+                and (regen_mode != 'constant'):
+            inds = locs[element]
+            if len(inds) > 0:
+                kwargs[element + 's'] = inds
+                vals = np.asarray(model(target=self, **kwargs))
+                data = self[prop]
+                if np.can_cast(vals.dtype, data.dtype, 'same_kind'):
+                    data[inds] = vals
+                else:  # e.g. integer values now have decimals
+                    data = data.astype(np.result_type(data, vals))
+                    data[inds] = vals
+                    self[prop] = data
+            return
         # Only regenerate model if regen_mode is correct
         if self.settings['freeze_models']:
             # Don't run ANY models if freeze_models is set to True
@@ -490,3 +607,20 @@ class ModelsMixin:
             self.add_model(propname=model, **dict_[model])
 
     models = property(fget=_get_models, fset=_set_models)
+
+
+def _to_subdomain(obj, pore, throat):
+    r"""
+    Converts pore and throat indices on the full domain into indices on the
+    given subdomain object, dropping the locations not on it
+    """
+    boss = obj.project.find_full_domain(obj)
+    out = []
+    for element, inds in zip(['pore', 'throat'], [pore, throat]):
+        inds = np.asarray(inds, dtype=int)
+        own = boss._get_indices(element=element, labels=obj.name)
+        pos = np.searchsorted(own, inds)
+        hit = pos < own.size
+        hit[hit] = own[pos[hit]] == inds[hit]
+        out.append(pos[hit])
+    return out
@@ -19,7 +19,7 @@ class Subdomain(Base):
     def __getitem__(self, key):
         element = key.split('.')[0]
         # Try to get vals directly first
-        vals = self.get(key)
+        vals = super().__getitem__(key) if key in self.keys() else None
         if vals is None:  # Otherwise invoke search
             # Find boss object (either phase or network)
             boss = self.project.find_full_domain(self)
@@ -1,3 +1,4 @@
+import numpy as np
 import openpnm.models as mods
 from openpnm.geometry import GenericGeometry
 
@@ -67,6 +68,10 @@ class StickAndBall(GenericGeometry):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        # The models are added without being run, then their values are all
+        # found at once by ``_regenerate_fused``
+        regen_mode = self.settings.pop('regen_mode', None)
+        self.settings['regen_mode'] = 'deferred'
 
         self.add_model(propname='pore.seed',
                        model=mods.misc.random,
@@ -128,3 +133,95 @@ class StickAndBall(GenericGeometry):
                        model=mods.geometry.throat_length.conduit_lengths,
                        throat_endpoints='throat.endpoints',
                        throat_length='throat.length')
+
+        if regen_mode is None:
+            del self.settings['regen_mode']
+        else:
+            self.settings['regen_mode'] = regen_mode
+        regen_mode = regen_mode or 'normal'
+        for item in self.models.values():
+            item['regen_mode'] = regen_mode
+        if regen_mode not in ['deferred', 'explicit']:
+            self._regenerate_fused()
+
+    def _regenerate_fused(self):
+        r"""
+        Runs all the models added above in a single pass
+
+        Notes
+        -----
+        This gives the same values as running the models one after the
+        other, but fetches the network data (connections, coordinates and
+        the locations of this geometry) only once, passing the arrays from
+        one step to the next.  The models that only use data on this
+        geometry are run as usual.  If some data is missing the models are
+        run one after the other instead.
+
+        """
+        gm = mods.geometry
+        network = self.project.network
+        if (network is None) or self.settings['freeze_models']:
+            self.regenerate_models()
+            return
+        Ps = network.pores(self.name)
+        Ts = network.throats(self.name)
+        conns = network['throat.conns']
+        coords = network['pore.coords']
+        cn = conns[Ts]
+        C1, C2 = coords[cn[:, 0]], coords[cn[:, 1]]
+        try:
+            self._regen('pore.seed')
+            # Largest sphere on every site of the network
+            model = self.models['pore.max_size']
+            try:
+                D = network[model['fixed_diameter']]
+                D[np.isnan(D)] = 0
+            except KeyError:
+                D = None
+            D = gm.pore_size._largest_sphere(conns, coords, D=D,
+                                             iters=model['iters'],
+                                             tol=model.get('tol', 0))
+            self['pore.max_size'] = D[Ps]
+            for prop in ['pore.diameter', 'pore.area', 'pore.volume']:
+                self._regen(prop)
+            # Throat size from the pores on each end, including those on
+            # other geometries
+            model = self.models['throat.max_size']
+            Dp = network[model['prop']]
+            self['throat.max_size'] = mods.misc.neighbor_lookups.\
+                _from_neighbor_pores(Dp[cn], mode=model['mode'],
+                                     ignore_nans=model['ignore_nans'])
+            self._regen('throat.diameter')
+            # Throat endpoints, lengths and conduit lengths, accounting for
+            # throat centroids off the line between the pores if present
+            model = self.models['throat.endpoints']
+            D1, D2 = network[model['pore_diameter']][cn].T
+            Dt = self[model['throat_diameter']]
+            L = np.linalg.norm(C1 - C2, axis=1) + 1e-15
+            TC = _get_throat_centroids(network, model, Ts)
+            EP = gm.throat_endpoints._spherical_pores(coords, cn, L, Dt,
+                                                      D1, D2, TC)
+            self['throat.endpoints'] = EP
+            model = self.models['throat.length']
+            TC = _get_throat_centroids(network, model, Ts)
+            self['throat.length'] = gm.throat_length._piecewise(EP['head'],
+                                                                EP['tail'], TC)
+            for prop in ['throat.surface_area', 'throat.volume',
+                         'throat.area']:
+                self._regen(prop)
+            self['throat.conduit_lengths'] = gm.throat_length.\
+                _conduit_lengths(C1, C2, EP['head'], EP['tail'],
+                                 self['throat.length'])
+        except KeyError:
+            self.regenerate_models()
+
+
+def _get_throat_centroids(network, model, Ts):
+    r"""
+    Returns the throat centroids used by the given model at the throats
+    ``Ts``, or ``None`` if the network does not define them
+    """
+    try:
+        return network[model.get('throat_centroid', 'throat.centroid')][Ts]
+    except KeyError:
+        return None
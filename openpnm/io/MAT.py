@@ -1,4 +1,3 @@
-import scipy.io as spio
 from flatdict import FlatDict
 from openpnm.io import GenericIO, Dict
 from openpnm.utils import sanitize_dict, logging, Workspace
@@ -65,6 +64,7 @@ class MAT(GenericIO):
             new_key = key.replace('|', '_').replace('.', '_')
             new_d[new_key] = d.pop(key)
 
+        import scipy.io as spio
         spio.savemat(file_name=filename, mdict=new_d)
 
     @classmethod
@@ -96,6 +96,7 @@ class MAT(GenericIO):
         If no project object is supplied then one will be created and returned.
 
         """
+        import scipy.io as spio
         filename = cls._parse_filename(filename=filename, ext='mat')
         data = spio.loadmat(filename)
         # Reinsert the '.' separator into the array names
@@ -1,12 +1,13 @@
 import json
-import json_tricks as jsont
+import zlib
+import itertools
 import numpy as np
 import importlib
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from openpnm.utils import Workspace, Project
 from openpnm.utils import logging
 from openpnm.io import GenericIO
-from h5py import File as hdfFile
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -14,15 +15,73 @@ ws = Workspace()
 class PNM(GenericIO):
     r"""
     This is the official way to save and load OpenPNM projects
+
+    Notes
+    -----
+    The file is an HDF5 file with one group per object, holding one dataset
+    per array plus the settings and models stored as group attributes.
+    Arrays are stored in chunks along the first axis so that very large
+    projects can be written with compression applied in parallel, and read
+    back selectively (see the ``objects`` and ``lazy`` arguments of
+    ``load_project``).
+
     """
+
     @classmethod
-    def save_project(cls, project, filename=None):
+    def save_project(cls, project, filename=None, compression='gzip',
+                     compression_opts=None, chunks=True, num_workers=None):
+        r"""
+        Saves the given Project to a ``.pnm`` file
+
+        Parameters
+        ----------
+        project : OpenPNM Project
+            The project to be saved
+        filename : string or path object, optional
+            The name of the file.  If not given the project name is used.
+        compression : string or None
+            The compression filter applied to each array.  Options are:
+
+            **'gzip'** : (default) Good compression but slow.  The level can
+            be set with ``compression_opts``.
+
+            **'lzf'** : Very fast with moderate compression
+
+            **None** : No compression, which is the fastest option but
+            produces the largest files
+
+        compression_opts : int, optional
+            The gzip compression level between 0 and 9.  The default is 4.
+        chunks : boolean, int or tuple
+            Controls how arrays are split into chunks on disk.  If ``True``
+            (default) chunks of roughly 1 MB are used.  An integer gives the
+            number of rows per chunk, and a tuple gives the full chunk shape
+            as understood by h5py.  ``False`` stores arrays contiguously,
+            which is only possible without compression.
+        num_workers : int, optional
+            The number of threads used to compress chunks when ``'gzip'`` is
+            used.  The default is the number of available processors.  The
+            data are written in chunks that are compressed concurrently then
+            written directly to the file, bypassing the serial HDF5 filter
+            pipeline.
+
+        """
         if filename is None:
             filename = project.name + '.pnm'
+        if compression in ['none', 'None']:
+            compression = None
+        if compression not in [None, 'gzip', 'lzf']:
+            raise Exception(f'Unsupported compression: {compression}')
+        if compression == 'gzip' and compression_opts is None:
+            compression_opts = 4
+        if (chunks is False) and (compression is not None):
+            raise Exception('Compression requires chunked storage')
 
+        from h5py import File as hdfFile
         # Make a directory using the given file name
         f = cls._parse_filename(filename, 'pnm')
-        with hdfFile(f, mode='w') as root:
+        with hdfFile(f, mode='w') as root, \
+                ThreadPoolExecutor(max_workers=num_workers) as pool:
             # root = hdfFile(f, mode='w')
             root.attrs['version'] = ws.version
             date = datetime.today().strftime("%Y %h %d %H:%M:%S")
@@ -30,53 +89,56 @@ class PNM(GenericIO):
             root.attrs['name'] = project.name
             # root.attrs['comments'] = project.comments
             for obj in project:
-                found_attrs = set(obj.__dict__.keys())
-                known_attrs = set(['settings', '_models_dict',
-                                   '_am', '_im',
-                                   '_spacing', '_shape'])
-                foreign_attrs = found_attrs.difference(known_attrs)
-                if len(foreign_attrs) > 0:
-                    line_break = f"\n{'':13}"
-                    logger.critical(f"{obj.name} has the following attributes that will"
-                                    + f" not be saved: {[i for i in foreign_attrs]}"
-                                    + f"{line_break}Consider using Pickle instead")
                 item = root.create_group(obj.name)
                 for arr in obj.keys():  # Store data
                     try:
-                        item.create_dataset(name=arr, data=obj[arr],
-                                            shape=obj[arr].shape,
-                                            compression="gzip")
+                        _write_array(group=item, name=arr, data=obj[arr],
+                                     compression=compression,
+                                     compression_opts=compression_opts,
+                                     chunks=chunks, pool=pool)
                     except TypeError:  # Deal with 'object' arrays
                         logger.warning(arr + ' is being converted to a string')
-                        b = jsont.dumps(obj[arr])
-                        c = b.encode()
-                        d = np.void(c)
-                        item.create_dataset(name=arr, data=d)
-                # Store settings dict as metadata
-                item.attrs['settings'] = json.dumps(obj.settings)
-                # Store models dict as metadata
-                if hasattr(obj, 'models'):
-                    obj_models = {}
-                    for model in obj.models.keys():
-                        temp = {k: v for k, v in obj.models[model].items()
-                                if k != 'model'}
-                        if 'model' in obj.models[model].keys():
-                            a = obj.models[model]['model']
-                            temp['model'] = a.__module__ + '|' + \
-                                a.__code__.co_name
-                        obj_models[model] = temp
-                    try:
-                        item.attrs['models'] = json.dumps(obj_models)
-                    except TypeError:
-                        logger.critical('The model ' + model + ' and it\'s '
-                                        + 'parameters could not be written '
-                                        + 'to file')
-                item.attrs['class'] = str(obj.__class__)
+                        if arr in item.keys():
+                            del item[arr]
+                        item.create_dataset(name=arr, data=_to_void(obj[arr]))
+                # Store settings, models and class as metadata
+                item.attrs.update(_get_attrs(obj))
 
     @classmethod
-    def load_project(cls, filename):
+    def load_project(cls, filename, objects=None, lazy=False):
+        r"""
+        Loads a Project from a ``.pnm`` file
+
+        Parameters
+        ----------
+        filename : string or path object
+            The name of the file to load
+        objects : list of strings, optional
+            The names of the objects to load.  The network is always loaded
+            since all other objects depend on it.  If not given then all
+            objects in the file are loaded.
+        lazy : boolean
+            If ``True`` the arrays are not read from the file until they are
+            first accessed, at which point they are loaded and stored on the
+            object as usual.  The ``'pore.all'`` and ``'throat.all'`` arrays
+            are always read immediately.  The default is ``False``.
+
+        Returns
+        -------
+        project : OpenPNM Project
+            The project containing the loaded objects
+
+        Notes
+        -----
+        When ``lazy`` is ``True`` the file remains open for reading until all
+        the lazily loaded arrays have been accessed or the objects deleted,
+        so it should not be overwritten in the meantime.
+
+        """
+        from h5py import File as hdfFile
         f = cls._parse_filename(filename, 'pnm')
-        with hdfFile(f, mode='r') as root:
+        root = hdfFile(f, mode='r')
+        try:
             logger.info('Loading project from file ' + f.name)
             try:  # Create an empty project with old name
                 proj = Project(name=root.attrs['name'])
@@ -87,21 +149,179 @@ class PNM(GenericIO):
                                + ' already exists, renaming to ' + proj.name)
             logger.info('Created using OpenPNM version ' + root.attrs['version'])
             logger.info('Saved on ' + root.attrs['date saved'])
+            names = list(root.keys())
+            if objects is not None:
+                if isinstance(objects, str):
+                    objects = [objects]
+                missing = set(objects).difference(names)
+                if len(missing) > 0:
+                    raise KeyError(f'{missing} not found in {f.name}')
+                names = [n for n in names if (n in objects)
+                         or ('network' in root[n].attrs['class'])]
             loglevel = ws.settings['loglevel']
             ws.settings['loglevel'] = 50
-            for name in root.keys():
+            for name in names:
                 if 'network' in root[name].attrs['class']:
-                    proj, obj = create_obj(root, name, proj)
-            for name in root.keys():
+                    proj, obj = create_obj(root, name, proj, lazy=lazy)
+            for name in names:
                 if 'network' not in root[name].attrs['class']:
-                    proj, obj = create_obj(root, name, proj)
+                    proj, obj = create_obj(root, name, proj, lazy=lazy)
             ws.settings['loglevel'] = loglevel
+        except Exception:
+            root.close()
+            raise
+        if not lazy:  # Lazy arrays keep the file open until released
+            root.close()
         return proj
 
 
-def create_obj(root, name, proj):
+class _LazyArray:
+    r"""
+    A placeholder for an array stored in a ``.pnm`` file, which is read from
+    disk when first accessed through the object holding it.  Slicing reads
+    only the requested portion.  Copying or pickling the placeholder reads
+    the full array, so that the copy does not depend on the open file.
+    """
+
+    def __init__(self, dataset):
+        self._dataset = dataset
+
+    def __repr__(self):
+        return f'<lazy array {self._dataset.name}, shape {self.shape}>'
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None):
+        a = self._dataset[...]
+        return a if dtype is None else a.astype(dtype)
+
+    def __getitem__(self, ind):
+        return self._dataset[ind]
+
+    def __deepcopy__(self, memo):
+        return np.asarray(self)
+
+    def __reduce__(self):
+        return (np.asarray, (np.asarray(self), ))
+
+    @property
+    def shape(self):
+        return self._dataset.shape
+
+    @property
+    def ndim(self):
+        return self._dataset.ndim
+
+    @property
+    def dtype(self):
+        return self._dataset.dtype
+
+
+def _get_chunks(data, chunks):
+    r"""
+    Returns the chunk shape to use for the given array, or ``None`` for
+    contiguous storage
+    """
+    if (chunks is False) or (chunks is None) or (data.size == 0) \
+            or (data.ndim == 0):
+        return None
+    if chunks is True:
+        row_bytes = max(data.itemsize * int(np.prod(data.shape[1:])), 1)
+        chunks = 2**20 // row_bytes
+    if isinstance(chunks, (int, np.integer)):
+        chunks = (min(max(int(chunks), 1), data.shape[0]), ) + data.shape[1:]
+    return tuple(chunks)
+
+
+def _write_array(group, name, data, compression, compression_opts, chunks,
+                 pool):
+    r"""
+    Writes an array to the given group.  Gzip compressed numerical arrays have
+    their chunks compressed concurrently by ``pool`` and written directly.
+    """
+    if not isinstance(data, np.ndarray):
+        data = np.array(data)
+    chunks = _get_chunks(data, chunks)
+    if chunks is None:  # Empty and scalar arrays are stored uncompressed
+        compression = None
+    kwargs = {'compression': compression, 'chunks': chunks}
+    if compression == 'gzip':
+        kwargs['compression_opts'] = compression_opts
+    if (compression != 'gzip') or (data.dtype.kind not in 'biufc'):
+        group.create_dataset(name=name, data=data, shape=data.shape, **kwargs)
+        return
+    data = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder('='))
+    dset = group.create_dataset(name=name, shape=data.shape, dtype=data.dtype,
+                                **kwargs)
+    ranges = [range(0, n, c) for n, c in zip(data.shape, chunks)]
+    offsets = list(itertools.product(*ranges))
+
+    def compress(offset):
+        block = data[tuple(slice(o, o+c) for o, c in zip(offset, chunks))]
+        if block.shape != chunks:  # Edge chunks are stored at full size
+            pad = [(0, c - n) for n, c in zip(block.shape, chunks)]
+            block = np.pad(block, pad)
+        return zlib.compress(np.ascontiguousarray(block).tobytes(),
+                             compression_opts)
+
+    for offset, buffer in zip(offsets, pool.map(compress, offsets)):
+        dset.id.write_direct_chunk(offset, buffer)
+
+
+def _get_attrs(obj):
+    r"""
+    Returns the settings, models and class of an object serialized as
+    strings, for storing as metadata alongside the object's arrays
+    """
+    found_attrs = set(obj.__dict__.keys())
+    known_attrs = set(['settings', '_models_dict',
+                       '_am', '_im',
+                       '_spacing', '_shape'])
+    foreign_attrs = found_attrs.difference(known_attrs)
+    if len(foreign_attrs) > 0:
+        line_break = f"\n{'':13}"
+        logger.critical(f"{obj.name} has the following attributes that will"
+                        + f" not be saved: {[i for i in foreign_attrs]}"
+                        + f"{line_break}Consider using Pickle instead")
+    attrs = {}
+    attrs['settings'] = json.dumps(obj.settings)
+    if hasattr(obj, 'models'):
+        obj_models = {}
+        for model in obj.models.keys():
+            temp = {k: v for k, v in obj.models[model].items()
+                    if k != 'model'}
+            if 'model' in obj.models[model].keys():
+                a = obj.models[model]['model']
+                temp['model'] = a.__module__ + '|' + \
+                    a.__code__.co_name
+            obj_models[model] = temp
+        try:
+            attrs['models'] = json.dumps(obj_models)
+        except TypeError:
+            logger.critical('The model ' + model + ' and it\'s '
+                            + 'parameters could not be written '
+                            + 'to file')
+    attrs['class'] = str(obj.__class__)
+    return attrs
+
+
+def _to_void(arr):
+    r"""
+    Converts an array that cannot be stored directly (e.g. of dtype object)
+    into a json string held in a void scalar
+    """
+    import json_tricks as jsont
+    b = jsont.dumps(arr)
+    c = b.encode()
+    return np.void(c)
+
+
+def create_obj(root, name, proj, lazy=False):
     r"""
-    Reproduces an OpenPNM object, given the hdf5 file and name
+    Reproduces an OpenPNM object, given the hdf5 file and name.  If ``lazy``
+    is ``True`` the numerical arrays are attached as placeholders which are
+    read from the file on first access.
     """
     import openpnm as op
     # regenerate object as same class
@@ -114,11 +334,19 @@ def create_obj(root, name, proj):
     obj._name = name
     # Add data to obj
     for arr in root[name].keys():
-        a = np.array(root[name][arr])
+        dset = root[name][arr]
+        if not hasattr(dset, 'shape'):  # Skip sub-groups
+            continue
+        if lazy and (arr.split('.', 1)[1] != 'all') \
+                and not str(dset.dtype).startswith("|V"):
+            obj.update({arr: _LazyArray(dset)})
+            continue
+        a = np.array(dset)
         if str(a.dtype).startswith("|V"):
             logger.warning(arr + ' is being converted from string')
             b = np.string_(a)
             c = b.astype(str)
+            import json_tricks as jsont
             a = jsont.loads(c)
         obj.update({arr: a})
     # Add settings to obj
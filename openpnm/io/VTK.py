@@ -1,6 +1,9 @@
+import base64
 import numpy as np
 from flatdict import FlatDict
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+from concurrent.futures import ThreadPoolExecutor
 from openpnm.io import GenericIO, Dict
 from openpnm.utils import logging, Workspace
 logger = logging.getLogger(__name__)
@@ -19,23 +22,19 @@ class VTK(GenericIO):
 
     """
 
-    _TEMPLATE = """
-    <?xml version="1.0" ?>
-    <VTKFile byte_order="LittleEndian" type="PolyData" version="0.1">
-        <PolyData>
-            <Piece NumberOfLines="0" NumberOfPoints="0">
-                <Points>
-                </Points>
-                <Lines>
-                </Lines>
-                <PointData>
-                </PointData>
-                <CellData>
-                </CellData>
-            </Piece>
-        </PolyData>
-    </VTKFile>
-    """.strip()
+    _dtype_map = {
+        "int8": "Int8",
+        "int16": "Int16",
+        "int32": "Int32",
+        "int64": "Int64",
+        "uint8": "UInt8",
+        "uint16": "UInt16",
+        "uint32": "UInt32",
+        "uint64": "UInt64",
+        "float32": "Float32",
+        "float64": "Float64",
+        "str": "String",
+    }
 
     @classmethod
     def save(cls, *args, **kwargs):
@@ -46,7 +45,8 @@ class VTK(GenericIO):
 
     @classmethod
     def export_data(cls, network, phases=[], filename="", delim=" | ",
-                    fill_nans=None, fill_infs=None):
+                    fill_nans=None, fill_infs=None, encoding="ascii",
+                    pieces=1, num_workers=None):
         r"""
         Save network and phase data to a single vtp file for visualizing in
         Paraview.
@@ -76,6 +76,31 @@ class VTK(GenericIO):
             which means that property arrays containing ``None`` will *not*
             be written to the file, and a warning will be issued.  A useful
             value is
+        encoding : string
+            How the arrays are written to the file.  Options are:
+
+            **'ascii'** : (default) Human readable text, which produces large
+            files that are slow to write and read.
+
+            **'base64'** : Binary data encoded as base64 text inside each
+            array's XML element.
+
+            **'appended'** : Raw binary data appended to the end of the file,
+            which gives the smallest files and fastest writes.
+
+        pieces : int
+            The number of pieces to split the data into.  If greater than 1,
+            each piece is written to its own vtp file and a pvtp file named
+            after ``filename`` is written that refers to them, which Paraview
+            opens as a single dataset.  The default is 1.
+        num_workers : int, optional
+            The number of threads used to write the pieces concurrently.  The
+            default is the number of available processors.
+
+        Notes
+        -----
+        The file is written directly as it is generated, so the full XML
+        document is never held in memory.
 
         """
         project, network, phases = cls._parse_args(network=network, phases=phases)
@@ -85,9 +110,12 @@ class VTK(GenericIO):
             logger.warning(
                 "vtp format does not support transient data, " + "use xdmf instead"
             )
+        if encoding not in ["ascii", "base64", "appended"]:
+            raise Exception(f"Unsupported encoding: {encoding}")
         if filename == "":
             filename = project.name
-        filename = cls._parse_filename(filename=filename, ext="vtp")
+        ext = "vtp" if pieces == 1 else "pvtp"
+        filename = cls._parse_filename(filename=filename, ext=ext)
 
         am = Dict.to_dict(
             network=network,
@@ -104,28 +132,17 @@ class VTK(GenericIO):
         num_points = np.shape(points)[0]
         num_throats = np.shape(pairs)[0]
 
-        root = ET.fromstring(VTK._TEMPLATE)
-        piece_node = root.find("PolyData").find("Piece")
-        piece_node.set("NumberOfPoints", str(num_points))
-        piece_node.set("NumberOfLines", str(num_throats))
-        points_node = piece_node.find("Points")
-        coords = VTK._array_to_element("coords", points.T.ravel("F"), n=3)
-        points_node.append(coords)
-        lines_node = piece_node.find("Lines")
-        connectivity = VTK._array_to_element("connectivity", pairs)
-        lines_node.append(connectivity)
-        offsets = VTK._array_to_element("offsets", 2 * np.arange(len(pairs)) + 2)
-        lines_node.append(offsets)
-
-        point_data_node = piece_node.find("PointData")
-        cell_data_node = piece_node.find("CellData")
+        point_data = []
+        cell_data = []
         for key in key_list:
             array = am[key]
             if array.dtype == "O":
                 logger.warning(key + " has dtype object," + " will not write to file")
-            else:
-                if array.dtype == np.bool:
-                    array = array.astype(int)
+                continue
+            if array.dtype == bool:
+                array = array.astype(int)
+            # Only search for nans and infs if some values are not finite
+            if array.dtype.kind == "f" and not np.isfinite(array).all():
                 if np.any(np.isnan(array)):
                     if fill_nans is None:
                         logger.warning(key + " has nans," + " will not write to file")
@@ -138,21 +155,129 @@ class VTK(GenericIO):
                         continue
                     else:
                         array[np.isinf(array)] = fill_infs
-                element = VTK._array_to_element(key, array)
-                if array.size == num_points:
-                    point_data_node.append(element)
-                elif array.size == num_throats:
-                    cell_data_node.append(element)
-
-        tree = ET.ElementTree(root)
-        tree.write(filename)
-
-        with open(filename, "r+") as f:
-            string = f.read()
-            string = string.replace("</DataArray>", "</DataArray>\n\t\t\t")
-            f.seek(0)
-            # consider adding header: '<?xml version="1.0"?>\n'+
-            f.write(string)
+            if array.size == num_points:
+                point_data.append((key, array))
+            elif array.size == num_throats:
+                cell_data.append((key, array))
+
+        if pieces == 1:
+            cls._write_piece(filename, points, pairs, point_data, cell_data,
+                             encoding)
+            return
+
+        # Split the pores into contiguous blocks, and assign each throat to
+        # the block containing its first pore
+        bounds = np.linspace(0, num_points, pieces + 1).astype(int)
+        owner = np.searchsorted(bounds, pairs[:, 0], side="right") - 1
+        names = [f"{filename.stem}_{i}.vtp" for i in range(pieces)]
+
+        def write(i):
+            Ts = np.where(owner == i)[0]
+            Ps = np.union1d(np.arange(bounds[i], bounds[i + 1]),
+                            pairs[Ts].ravel())
+            conns = np.searchsorted(Ps, pairs[Ts])
+            cls._write_piece(filename.parent / names[i], points[Ps], conns,
+                             [(k, a[Ps]) for k, a in point_data],
+                             [(k, a[Ts]) for k, a in cell_data], encoding)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            list(pool.map(write, range(pieces)))
+        cls._write_master(filename, names, points, point_data, cell_data)
+
+    @classmethod
+    def _write_piece(cls, filename, points, pairs, point_data, cell_data,
+                     encoding):
+        r"""
+        Writes a single vtp file, streaming each array to the file in turn
+        """
+        num_points = np.shape(points)[0]
+        num_throats = np.shape(pairs)[0]
+        if np.size(pairs) == 0:
+            pairs = np.zeros((0, 2), dtype=int)
+        sections = [
+            ("Points", [("coords", points.ravel(), 3)]),
+            ("Lines", [("connectivity", pairs.ravel(), 1),
+                       ("offsets", 2 * np.arange(num_throats) + 2, 1)]),
+            ("PointData", [(k, a, 1) for k, a in point_data]),
+            ("CellData", [(k, a, 1) for k, a in cell_data]),
+        ]
+        header = ' header_type="UInt64"' if encoding != "ascii" else ""
+        appended = []
+        offset = 0
+        with open(filename, "wb") as f:
+            f.write(
+                f'<VTKFile byte_order="LittleEndian" type="PolyData"'
+                f' version="0.1"{header}>\n  <PolyData>\n'
+                f'    <Piece NumberOfLines="{num_throats}"'
+                f' NumberOfPoints="{num_points}">\n'.encode()
+            )
+            for section, arrays in sections:
+                f.write(f"      <{section}>\n".encode())
+                for name, array, n in arrays:
+                    array = cls._to_vtk_dtype(array)
+                    if array is None:
+                        continue
+                    attrs = (
+                        f"type={quoteattr(cls._dtype_map[str(array.dtype)])}"
+                        f" Name={quoteattr(name)}"
+                        f' NumberOfComponents="{n}"'
+                    )
+                    if encoding == "appended":
+                        f.write(
+                            f'        <DataArray {attrs} format="appended"'
+                            f' offset="{offset}"/>\n'.encode()
+                        )
+                        appended.append(array)
+                        offset += 8 + array.nbytes
+                        continue
+                    fmt = "binary" if encoding == "base64" else "ascii"
+                    f.write(f'        <DataArray {attrs} format="{fmt}">'.encode())
+                    if encoding == "ascii":
+                        f.write("\t".join(map(str, array.ravel())).encode())
+                    else:
+                        size = np.array([array.nbytes], dtype="<u8")
+                        f.write(base64.b64encode(size.tobytes() + array.tobytes()))
+                    f.write(b"</DataArray>\n")
+                f.write(f"      </{section}>\n".encode())
+            f.write(b"    </Piece>\n  </PolyData>\n")
+            if encoding == "appended":
+                f.write(b'  <AppendedData encoding="raw">\n   _')
+                for array in appended:
+                    f.write(np.array([array.nbytes], dtype="<u8").tobytes())
+                    f.write(array.tobytes())
+                f.write(b"\n  </AppendedData>\n")
+            f.write(b"</VTKFile>\n")
+
+    @classmethod
+    def _write_master(cls, filename, names, points, point_data, cell_data):
+        r"""
+        Writes the pvtp file that collects the pieces into a single dataset
+        """
+        def tags(arrays, n=1):
+            lines = []
+            for name, array in arrays:
+                array = cls._to_vtk_dtype(array)
+                if array is None:
+                    continue
+                t = cls._dtype_map[str(array.dtype)]
+                lines.append(
+                    f"      <PDataArray type={quoteattr(t)}"
+                    f' Name={quoteattr(name)} NumberOfComponents="{n}"/>'
+                )
+            return "\n".join(lines)
+
+        with open(filename, "w") as f:
+            f.write(
+                '<VTKFile byte_order="LittleEndian" type="PPolyData"'
+                ' version="0.1">\n  <PPolyData GhostLevel="0">\n'
+                f"    <PPoints>\n{tags([('coords', points)], n=3)}\n"
+                "    </PPoints>\n"
+                f"    <PPointData>\n{tags(point_data)}\n    </PPointData>\n"
+                f"    <PCellData>\n{tags(cell_data)}\n    </PCellData>\n"
+            )
+            for name in names:
+                f.write(f"    <Piece Source={quoteattr(name)}/>\n")
+            f.write("  </PPolyData>\n</VTKFile>\n")
 
     @classmethod
     def load(cls, *args, **kwargs):
@@ -179,25 +304,39 @@ class VTK(GenericIO):
         net = {}
 
         filename = cls._parse_filename(filename, ext="vtp")
-        tree = ET.parse(filename)
-        piece_node = tree.find("PolyData").find("Piece")
+        with open(filename, "rb") as f:
+            raw = f.read()
+        # Raw appended data is not valid XML so split it off before parsing
+        appended = None
+        i = raw.find(b"<AppendedData")
+        if i >= 0:
+            start = raw.index(b"_", raw.index(b">", i)) + 1
+            appended = memoryview(raw)[start:]
+            raw = raw[:i] + b"</VTKFile>"
+        root = ET.fromstring(raw)
+        header = root.get("header_type", "UInt32")
+        piece_node = root.find("PolyData").find("Piece")
+
+        def to_array(element, n=1):
+            return VTK._element_to_array(element, n, header=header,
+                                         appended=appended)
 
         # Extract connectivity
         conn_element = piece_node.find("Lines").find("DataArray")
-        conns = VTK._element_to_array(conn_element, 2)
+        conns = to_array(conn_element, 2)
         # Extract coordinates
         coord_element = piece_node.find("Points").find("DataArray")
-        coords = VTK._element_to_array(coord_element, 3)
+        coords = to_array(coord_element, 3)
 
         # Extract pore data
         for item in piece_node.find("PointData").iter("DataArray"):
             key = item.get("Name")
-            array = VTK._element_to_array(item)
+            array = to_array(item)
             net[key] = array
         # Extract throat data
         for item in piece_node.find("CellData").iter("DataArray"):
             key = item.get("Name")
-            array = VTK._element_to_array(item)
+            array = to_array(item)
             net[key] = array
 
         if project is None:
@@ -216,35 +355,42 @@ class VTK(GenericIO):
         return project
 
     @classmethod
-    def _array_to_element(cls, name, array, n=1):
-        dtype_map = {
-            "int8": "Int8",
-            "int16": "Int16",
-            "int32": "Int32",
-            "int64": "Int64",
-            "uint8": "UInt8",
-            "uint16": "UInt16",
-            "uint32": "UInt32",
-            "uint64": "UInt64",
-            "float32": "Float32",
-            "float64": "Float64",
-            "str": "String",
-        }
-        element = None
-        if str(array.dtype) in dtype_map.keys():
-            element = ET.Element("DataArray")
-            element.set("Name", name)
-            element.set("NumberOfComponents", str(n))
-            element.set("type", dtype_map[str(array.dtype)])
-            element.text = "\t".join(map(str, array.ravel()))
-        return element
+    def _to_vtk_dtype(cls, array):
+        r"""
+        Returns the array as a contiguous little endian array of a type
+        supported by VTK, or ``None`` if that is not possible
+        """
+        array = np.asarray(array)
+        if array.dtype.kind not in "iuf":
+            return None
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        if str(array.dtype) not in cls._dtype_map.keys():
+            return None
+        return array
 
     @classmethod
-    def _element_to_array(cls, element, n=1):
-        string = element.text
-        dtype = element.get("type")
-        array = np.fromstring(string, sep="\t")
-        array = array.astype(dtype.lower())
+    def _element_to_array(cls, element, n=1, header="UInt32", appended=None):
+        dtype = np.dtype(element.get("type").lower()).newbyteorder("<")
+        fmt = element.get("format", "ascii")
+        htype = np.dtype(header.lower()).newbyteorder("<")
+        if fmt == "ascii":
+            string = element.text
+            array = np.fromstring(string, sep="\t")
+            array = array.astype(dtype)
+        elif fmt == "binary":
+            buffer = base64.b64decode(element.text.strip())
+            size = int(np.frombuffer(buffer[:htype.itemsize], dtype=htype)[0])
+            array = np.frombuffer(buffer[htype.itemsize:htype.itemsize + size],
+                                  dtype=dtype)
+        elif fmt == "appended":
+            start = int(element.get("offset"))
+            size = int(np.frombuffer(appended[start:start + htype.itemsize],
+                                     dtype=htype)[0])
+            start += htype.itemsize
+            array = np.frombuffer(appended[start:start + size], dtype=dtype)
+        else:
+            raise Exception(f"Unsupported DataArray format: {fmt}")
+        array = array.astype(dtype.newbyteorder("="))
         if n != 1:
             array = array.reshape(array.size // n, n)
         return array
@@ -0,0 +1,239 @@
+import numpy as np
+from datetime import datetime
+from openpnm.utils import Workspace, Project
+from openpnm.utils import logging
+from openpnm.io import GenericIO
+from openpnm.io.PNM import create_obj, _get_attrs, _get_chunks, _to_void
+logger = logging.getLogger(__name__)
+ws = Workspace()
+
+
+class Zarr(GenericIO):
+    r"""
+    Saves and loads entire projects as a Zarr store of chunked, compressed
+    arrays
+
+    Notes
+    -----
+    Each object is stored as a group holding one array per property, with
+    the settings and models stored as group attributes, in the same way as
+    the ``PNM`` format.  Transient results (i.e. ``'pore.quantity@t'``) are
+    collected into one 2D array per quantity under the ``'@time'`` sub-group
+    of the object, with one row per time step and the time strings listed
+    in the array's ``'times'`` attribute.  New time steps can be appended to
+    an existing store (see ``save_project`` and ``append_time_step``), so
+    long transient simulations can be checkpointed cheaply and the results
+    read by another process while the simulation is still running.
+
+    Compression is done with Blosc, which uses several threads per chunk.
+
+    For more information visit the website:
+    `zarr.readthedocs.io <https://zarr.readthedocs.io>`_
+
+    """
+
+    @classmethod
+    def save_project(cls, project, filename=None, compressor=None,
+                     chunks=True, num_threads=None, append=False):
+        r"""
+        Saves the given Project to a Zarr directory store
+
+        Parameters
+        ----------
+        project : OpenPNM Project
+            The project to be saved
+        filename : string or path object, optional
+            The name of the store.  If not given the project name is used.
+        compressor : numcodecs Codec, optional
+            The compressor applied to each chunk.  The default is Blosc with
+            the 'zstd' codec and byte shuffling.
+        chunks : boolean, int or tuple
+            Controls how arrays are split into chunks.  If ``True`` (default)
+            chunks of roughly 1 MB are used.  An integer gives the number of
+            rows per chunk, and a tuple gives the full chunk shape.
+        num_threads : int, optional
+            The number of threads used by Blosc.  The default lets Blosc
+            decide.
+        append : boolean
+            If ``True`` the project is written into an existing store, and
+            only time steps not already present in the store are written
+            for transient results.  All other arrays are overwritten.  The
+            default is ``False``, which replaces any existing store.
+
+        """
+        import zarr
+        if filename is None:
+            filename = project.name + '.zarr'
+        compressor = cls._get_compressor(compressor, num_threads)
+        f = cls._parse_filename(filename, 'zarr')
+        mode = 'a' if append else 'w'
+        root = zarr.open_group(str(f), mode=mode)
+        root.attrs.update({'version': ws.version,
+                           'date saved': datetime.today().strftime(
+                               "%Y %h %d %H:%M:%S"),
+                           'name': project.name})
+        for obj in project:
+            item = root.require_group(obj.name)
+            series = {}
+            for arr in obj.keys():
+                if '@' in arr:  # Collect transient results for later
+                    key, t = arr.split('@', 1)
+                    series.setdefault(t, {})[key] = obj[arr]
+                    continue
+                data = obj[arr]
+                if data.dtype.kind not in 'biufc':
+                    logger.warning(arr + ' is being converted to a string')
+                    data = _to_void(data)
+                item.array(name=arr, data=data, overwrite=True,
+                           chunks=_get_chunks(data, chunks) or True,
+                           compressor=compressor)
+            for t in sorted(series.keys(), key=float):
+                cls._append(group=item, t=t, data=series[t],
+                            compressor=compressor, chunks=chunks)
+            item.attrs.update(_get_attrs(obj))
+
+    @classmethod
+    def append_time_step(cls, filename, obj, t, data, compressor=None,
+                         chunks=True, num_threads=None):
+        r"""
+        Appends the arrays of a single time step to the store
+
+        Parameters
+        ----------
+        filename : string or path object
+            The name of an existing store, as written by ``save_project``
+        obj : OpenPNM object or string
+            The object (or its name) to which the data belong
+        t : string or scalar
+            The time step, which is used when naming the arrays upon loading
+            (i.e. ``'pore.quantity@t'``)
+        data : dict
+            The arrays to append, keyed by propname (e.g.
+            ``{'pore.concentration': c}``)
+
+        Notes
+        -----
+        The ``compressor``, ``chunks`` and ``num_threads`` arguments are as
+        in ``save_project``, and only apply to quantities that are not yet
+        stored.  If the time step is already stored it is overwritten.
+
+        """
+        import zarr
+        compressor = cls._get_compressor(compressor, num_threads)
+        f = cls._parse_filename(filename, 'zarr')
+        root = zarr.open_group(str(f), mode='a')
+        name = obj if isinstance(obj, str) else obj.name
+        cls._append(group=root.require_group(name), t=str(t), data=data,
+                    compressor=compressor, chunks=chunks)
+
+    @classmethod
+    def load_times(cls, filename, obj, quantity):
+        r"""
+        Returns the time steps stored for the given quantity
+
+        Parameters
+        ----------
+        filename : string or path object
+            The name of an existing store
+        obj : OpenPNM object or string
+            The object (or its name) to which the data belong
+        quantity : string
+            The propname of the quantity (e.g. ``'pore.concentration'``)
+
+        Returns
+        -------
+        times : list of strings
+            The stored time steps, in the order they were written
+
+        """
+        import zarr
+        f = cls._parse_filename(filename, 'zarr')
+        root = zarr.open_group(str(f), mode='r')
+        name = obj if isinstance(obj, str) else obj.name
+        return list(root[name]['@time'][quantity].attrs['times'])
+
+    @classmethod
+    def load_project(cls, filename, objects=None, lazy=False):
+        r"""
+        Loads a Project from a Zarr store
+
+        Parameters
+        ----------
+        filename : string or path object
+            The name of the store to load
+        objects : list of strings, optional
+            The names of the objects to load.  The network is always loaded
+            since all other objects depend on it.  If not given then all
+            objects in the store are loaded.
+        lazy : boolean
+            If ``True`` the arrays are not read from the store until they are
+            first accessed.  Transient results are always read immediately.
+            The default is ``False``.
+
+        Returns
+        -------
+        project : OpenPNM Project
+            The project containing the loaded objects
+
+        """
+        import zarr
+        f = cls._parse_filename(filename, 'zarr')
+        root = zarr.open_group(str(f), mode='r')
+        logger.info('Loading project from file ' + f.name)
+        try:  # Create an empty project with old name
+            proj = Project(name=root.attrs['name'])
+        except Exception:  # Generate a new name if collision occurs
+            proj = Project()
+            logger.warning('A project named ' + root.attrs['name']
+                           + ' already exists, renaming to ' + proj.name)
+        logger.info('Created using OpenPNM version ' + root.attrs['version'])
+        names = list(root.group_keys())
+        if objects is not None:
+            if isinstance(objects, str):
+                objects = [objects]
+            missing = set(objects).difference(names)
+            if len(missing) > 0:
+                raise KeyError(f'{missing} not found in {f.name}')
+            names = [n for n in names if (n in objects)
+                     or ('network' in root[n].attrs['class'])]
+        names = sorted(names, key=lambda n: 'network' not in
+                       root[n].attrs['class'])
+        loglevel = ws.settings['loglevel']
+        ws.settings['loglevel'] = 50
+        for name in names:
+            proj, obj = create_obj(root, name, proj, lazy=lazy)
+            if '@time' in root[name].group_keys():
+                for key, arr in root[name]['@time'].arrays():
+                    times = arr.attrs['times']
+                    vals = arr[:len(times)]
+                    obj.update({key + '@' + t: v for t, v in zip(times, vals)})
+        ws.settings['loglevel'] = loglevel
+        return proj
+
+    @classmethod
+    def _get_compressor(cls, compressor, num_threads):
+        from numcodecs import Blosc, blosc
+        if num_threads is not None:
+            blosc.set_nthreads(num_threads)
+        if compressor is None:
+            compressor = Blosc(cname='zstd', clevel=3, shuffle=Blosc.SHUFFLE)
+        return compressor
+
+    @classmethod
+    def _append(cls, group, t, data, compressor, chunks):
+        series = group.require_group('@time')
+        for key, vals in data.items():
+            vals = np.asarray(vals)
+            if key not in series.array_keys():
+                c = _get_chunks(vals, chunks) or (1, ) + vals.shape[1:]
+                series.zeros(name=key, shape=(0, ) + vals.shape,
+                             chunks=(1, ) + c, dtype=vals.dtype,
+                             compressor=compressor)
+            arr = series[key]
+            times = list(arr.attrs.get('times', []))
+            if t in times:  # Overwrite existing time step
+                arr[times.index(t)] = vals
+                continue
+            # Write the data before the time so readers see complete steps
+            arr.append(vals[np.newaxis, ...], axis=0)
+            arr.attrs['times'] = times + [t]
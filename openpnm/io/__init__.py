@@ -35,6 +35,9 @@ parameters.
 | XDMF     | The eXtensible Data Model Format combines XML descriptors with   |
 |          | HDF5 data storage                                                |
 +----------+------------------------------------------------------------------+
+| Zarr     | Saves and loads entire projects, including transient results, as |
+|          | chunked and compressed arrays                                    |
++----------+------------------------------------------------------------------+
 | VTK      | The Visualization Toolkit (VTK) format defined by Kitware and    |
 |          | used by Paraview                                                 |
 +----------+------------------------------------------------------------------+
@@ -87,4 +90,5 @@ from .STL import STL
 from .COMSOL import COMSOL
 from .Salome import Salome
 from .PNM import PNM
+from .Zarr import Zarr
 from .ParaView import ParaView
@@ -1,5 +1,8 @@
+import os
 import math
+import tempfile
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from scipy import ndimage
 import scipy.spatial as sptl
 from openpnm import topotools
@@ -12,6 +15,307 @@ from openpnm.geometry import GenericGeometry
 from openpnm.utils.misc import unique_list
 
 logger = logging.getLogger(__name__)
+# Default memory budget of the fiber image, in bytes
+_MEMORY_BUDGET = 2**31
+# Approximate working memory of the distance transform per voxel, in bytes
+_EDT_BYTES = 50
+
+
+def _allocate(shape, dtype, on_disk=False):
+    r"""
+    Returns a zeroed array, backed by a temporary file if ``on_disk``
+    """
+    if not on_disk:
+        return np.zeros(shape, dtype=dtype)
+    # The mapping outlives the file object, which is deleted once closed
+    with tempfile.TemporaryFile() as f:
+        return np.memmap(f, dtype=dtype, mode="w+", shape=tuple(shape))
+
+
+def _max_distance(image, block=4):
+    r"""
+    Upper bound on the largest distance of a voxel of ``image`` to a zero
+
+    The image is reduced to blocks of ``block`` voxels, a block being zero if
+    any of its voxels is, and the distance transform of the much smaller
+    block image then bounds the one of the full image.
+    """
+    starts = [np.arange(0, n, block) for n in image.shape]
+    coarse = np.ones([len(i) for i in starts], dtype=np.uint8)
+    for i, x in enumerate(starts[0]):
+        slab = image[x:x + block].min(axis=0)
+        slab = np.minimum.reduceat(slab, starts[1], axis=0)
+        coarse[i] = np.minimum.reduceat(slab, starts[2], axis=1)
+    if coarse.all():
+        return np.inf
+    dtc = ndimage.distance_transform_edt(coarse)
+    return block * (dtc.max() + np.sqrt(3))
+
+
+def _chunk_edt(image, core, halo):
+    r"""
+    Distance transform of ``image`` inside the ``core`` slices
+
+    The transform is computed over the core padded by ``halo`` voxels on each
+    side, so it is exact for every voxel lying no further than ``halo`` from
+    a zero voxel.
+    """
+    window = tuple(slice(max(c.start - halo, 0), c.stop + halo) for c in core)
+    dtc = ndimage.distance_transform_edt(image[window])
+    inner = tuple(slice(c.start - w.start, c.stop - w.start)
+                  for c, w in zip(core, window))
+    return dtc[inner]
+
+
+def _rotations_to_z(normals):
+    r"""
+    Returns the matrices rotating each of the ``normals`` onto the z axis
+
+    Normals that are already aligned with the z axis are left unrotated.
+    """
+    normals = normals / np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    axes = np.cross(normals, [0, 0, 1])
+    sina = np.linalg.norm(axes, axis=1)
+    cosa = normals[:, 2]
+    aligned = sina == 0
+    axes[aligned] = [0, 0, 1]
+    sina[aligned] = 0
+    cosa[aligned] = 1
+    axes /= np.linalg.norm(axes, axis=1)[:, np.newaxis]
+    # Rodrigues' rotation formula
+    K = np.zeros([len(normals), 3, 3])
+    K[:, 0, 1] = -axes[:, 2]
+    K[:, 0, 2] = axes[:, 1]
+    K[:, 1, 0] = axes[:, 2]
+    K[:, 1, 2] = -axes[:, 0]
+    K[:, 2, 0] = -axes[:, 1]
+    K[:, 2, 1] = axes[:, 0]
+    R = np.einsum("n,ij->nij", cosa, np.eye(3))
+    R += sina[:, np.newaxis, np.newaxis] * K
+    R += (1 - cosa)[:, np.newaxis, np.newaxis] * np.einsum(
+        "ni,nj->nij", axes, axes
+    )
+    return R
+
+
+_facet_kernel = []
+
+
+def _get_facet_kernel():
+    r"""
+    Compiles the kernel eroding the throat facets on first use and returns it
+
+    Notes
+    -----
+    Numba is imported here rather than at the top of the module to keep the
+    OpenPNM import time down, and the compiled function is kept so it is only
+    compiled once per session.
+
+    The kernel receives the 2D vertices of all the facets in compressed
+    sparse row form.  Each facet is ordered by angle around its mean, clipped
+    by each of its edges moved inwards by the fiber radius, and the area,
+    perimeter and centroid of what is left follow from the shoelace formula.
+    Eroding a convex polygon leaves the center of its inscribed circle in
+    place and shrinks its radius by the erosion distance, so the incircle is
+    found on the original facet as the point furthest from all of its edges,
+    testing every triple of edges.
+    """
+    if _facet_kernel:
+        return _facet_kernel[0]
+    from numba import njit
+
+    @njit
+    def clip(poly, m, p, n, r, out):
+        k = 0
+        for j in range(m):
+            j1 = (j + 1) % m
+            fa = n[0] * (poly[j, 0] - p[0]) + n[1] * (poly[j, 1] - p[1]) - r
+            fb = n[0] * (poly[j1, 0] - p[0]) + n[1] * (poly[j1, 1] - p[1]) - r
+            if fa >= 0:
+                out[k, 0] = poly[j, 0]
+                out[k, 1] = poly[j, 1]
+                k += 1
+            if (fa >= 0) != (fb >= 0):
+                s = fa / (fa - fb)
+                out[k, 0] = poly[j, 0] + (poly[j1, 0] - poly[j, 0]) * s
+                out[k, 1] = poly[j, 1] + (poly[j1, 1] - poly[j, 1]) * s
+                k += 1
+        return k
+
+    @njit
+    def incircle(pts, nrm, m, tol):
+        best = np.array([0.0, 0.0, -np.inf])
+        # Offset of each edge from the origin along its normal
+        off = np.empty(m)
+        for e in range(m):
+            off[e] = nrm[e, 0] * pts[e, 0] + nrm[e, 1] * pts[e, 1]
+        for i in range(m):
+            for j in range(i + 1, m):
+                for k in range(j + 1, m):
+                    # Point at the same distance t from the three edges,
+                    # n.x - t = n.p, with t eliminated by differences
+                    u1 = nrm[j, 0] - nrm[i, 0]
+                    v1 = nrm[j, 1] - nrm[i, 1]
+                    c1 = off[j] - off[i]
+                    u2 = nrm[k, 0] - nrm[i, 0]
+                    v2 = nrm[k, 1] - nrm[i, 1]
+                    c2 = off[k] - off[i]
+                    det = u1 * v2 - u2 * v1
+                    if abs(det) < 1e-12:
+                        continue
+                    x = (c1 * v2 - c2 * v1) / det
+                    y = (u1 * c2 - u2 * c1) / det
+                    t = nrm[i, 0] * x + nrm[i, 1] * y - off[i]
+                    if t <= best[2]:
+                        continue
+                    ok = True
+                    for e in range(m):
+                        if nrm[e, 0] * x + nrm[e, 1] * y - off[e] < t - tol:
+                            ok = False
+                            break
+                    if ok:
+                        best[0] = x
+                        best[1] = y
+                        best[2] = t
+        return best
+
+    @njit
+    def kernel(pts, indptr, r):
+        n = indptr.size - 1
+        area = np.zeros(n)
+        perim = np.zeros(n)
+        cen = np.zeros((n, 2))
+        inrad = np.zeros(n)
+        incen = np.zeros((n, 2))
+        # Each clip adds at most one vertex, so twice the original number
+        # of vertices is room enough for the eroded facet
+        off = np.zeros((2 * pts.shape[0], 2))
+        num = np.zeros(n, dtype=np.int64)
+        for t in range(n):
+            m = indptr[t + 1] - indptr[t]
+            mx = 0.0
+            my = 0.0
+            for j in range(indptr[t], indptr[t + 1]):
+                mx += pts[j, 0] / m
+                my += pts[j, 1] / m
+            # Order the vertices by angle around their mean
+            face = np.empty((m, 2))
+            ang = np.empty(m)
+            span = 0.0
+            for j in range(m):
+                x = pts[indptr[t] + j, 0] - mx
+                y = pts[indptr[t] + j, 1] - my
+                a = math.atan2(y, x)
+                i = j
+                while (i > 0) and (ang[i - 1] > a):
+                    ang[i] = ang[i - 1]
+                    face[i] = face[i - 1]
+                    i -= 1
+                ang[i] = a
+                face[i, 0] = x
+                face[i, 1] = y
+                span = max(span, abs(x), abs(y))
+            # Inwards unit normals of the edges, dropping repeated vertices
+            poly = np.empty((m, 2))
+            nrm = np.empty((m, 2))
+            me = 0
+            for j in range(m):
+                dx = face[(j + 1) % m, 0] - face[j, 0]
+                dy = face[(j + 1) % m, 1] - face[j, 1]
+                L = math.sqrt(dx ** 2 + dy ** 2)
+                if L > 1e-9 * span:
+                    poly[me] = face[j]
+                    nrm[me, 0] = -dy / L
+                    nrm[me, 1] = dx / L
+                    me += 1
+            if me < 3:
+                continue
+            # Erode the facet one edge at a time
+            buf = np.empty((2 * m, 2))
+            buf[:me] = poly[:me]
+            tmp = np.empty((2 * m, 2))
+            k = me
+            for j in range(me):
+                k = clip(buf, k, poly[j], nrm[j], r, tmp)
+                buf, tmp = tmp, buf
+                if k < 3:
+                    break
+            # Drop the repeated vertices left by the clipping
+            q = 0
+            for j in range(k):
+                dx = buf[(j + 1) % k, 0] - buf[j, 0]
+                dy = buf[(j + 1) % k, 1] - buf[j, 1]
+                if math.sqrt(dx ** 2 + dy ** 2) > 1e-9 * span:
+                    buf[q] = buf[j]
+                    q += 1
+            if q < 3:
+                continue
+            a = 0.0
+            cx = 0.0
+            cy = 0.0
+            p = 0.0
+            for j in range(q):
+                x0 = buf[j, 0]
+                y0 = buf[j, 1]
+                x1 = buf[(j + 1) % q, 0]
+                y1 = buf[(j + 1) % q, 1]
+                c = x0 * y1 - x1 * y0
+                a += c
+                cx += (x0 + x1) * c
+                cy += (y0 + y1) * c
+                p += math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)
+            if a <= 0:
+                continue
+            area[t] = a / 2
+            perim[t] = p
+            cen[t, 0] = cx / (3 * a) + mx
+            cen[t, 1] = cy / (3 * a) + my
+            # Drop the vertices lying within 1/200 of the span of the facet
+            # from the line joining their neighbors, so that tiny edges and
+            # nearly straight corners do not show up as extra corners
+            c = q
+            dropped = True
+            while dropped and (c >= 3):
+                dropped = False
+                for j in range(c):
+                    i = (j - 1) % c
+                    k = (j + 1) % c
+                    ex = buf[k, 0] - buf[i, 0]
+                    ey = buf[k, 1] - buf[i, 1]
+                    hx = buf[j, 0] - buf[i, 0]
+                    hy = buf[j, 1] - buf[i, 1]
+                    L = math.sqrt(ex ** 2 + ey ** 2)
+                    if L > 0:
+                        h = abs(ex * hy - ey * hx) / L
+                    else:
+                        h = math.sqrt(hx ** 2 + hy ** 2)
+                    if h <= span / 100:
+                        buf[j:c - 1] = buf[j + 1:c]
+                        c -= 1
+                        dropped = True
+                        break
+            # Less than 3 corners can't make a shape with non-zero area, so
+            # the facet is fully occluded
+            if c < 3:
+                area[t] = 0
+                perim[t] = 0
+                cen[t] = 0
+                continue
+            x = incircle(poly, nrm, me, 1e-9 * span)
+            if np.isfinite(x[2]):
+                inrad[t] = max(x[2] - r, 0.0)
+                incen[t, 0] = x[0] + mx
+                incen[t, 1] = x[1] + my
+            else:
+                incen[t] = cen[t]
+            num[t] = c
+            for j in range(c):
+                off[2 * indptr[t] + j, 0] = buf[j, 0] + mx
+                off[2 * indptr[t] + j, 1] = buf[j, 1] + my
+        return area, perim, cen, inrad, incen, off, num
+
+    _facet_kernel.append(kernel)
+    return kernel
 
 
 class VoronoiFibers(Project):
@@ -69,6 +373,15 @@ class VoronoiFibers(Project):
         factor of 2 in the z-direction and this will have the affect of
         aligning fibers in the x and y directions once scaling is reversed.
 
+    memory_budget : int
+        The number of bytes the fiber image may use while it is being
+        created, 2 GiB by default.  Larger images are stored in temporary
+        files and their distance transform is computed chunk by chunk.
+
+    workers : int
+        The number of threads used to compute the distance transform of the
+        chunks of the fiber image.  By default one per CPU is used.
+
     References
     ----------
     This approach to modeling fibrous materials was first presented by
@@ -101,6 +414,8 @@ class VoronoiFibers(Project):
                  resolution=1e-2,
                  shape=[1, 1, 1],
                  linear_scale=None,
+                 memory_budget=None,
+                 workers=None,
                  name=None,
                  **kwargs):
 
@@ -132,10 +447,12 @@ class VoronoiFibers(Project):
             net["pore.coords"] /= ls
         net.fiber_rad = fiber_rad
         net.resolution = resolution
+        settings = {"memory_budget": memory_budget, "workers": workers}
         del_geom = DelaunayGeometry(project=self,
                                     network=net,
                                     pores=net.pores("delaunay"),
                                     throats=net.throats("delaunay"),
+                                    settings=settings,
                                     name=self.name + "_del")
 
         VoronoiGeometry(project=self,
@@ -173,10 +490,16 @@ class DelaunayGeometry(GenericGeometry):
     ----------
     name : string
         A unique name for the network
+
+    settings : dict
+        ``memory_budget`` and ``workers`` control the creation of the fiber
+        image, as described in ``VoronoiFibers``.
     """
 
-    def __init__(self, network=None, **kwargs):
-        super().__init__(network=network, **kwargs)
+    def __init__(self, network=None, settings={}, **kwargs):
+        def_set = {"memory_budget": None, "workers": None}
+        def_set.update(settings)
+        super().__init__(network=network, settings=def_set, **kwargs)
         if network is not None:
             # Set all the required models
             vertices = network.find_pore_hulls()
@@ -264,19 +587,19 @@ class DelaunayGeometry(GenericGeometry):
         indiam = np.zeros(Np, dtype=float)
         incen = np.zeros([Np, 3], dtype=float)
         hull_pores = np.unique(self._hull_image)
-        (Lx, Ly, Lz) = np.shape(self._hull_image)
-        (indx, indy, indz) = np.indices([Lx, Ly, Lz])
-        indx = indx.flatten()
-        indy = indy.flatten()
-        indz = indz.flatten()
-        for i, pore in enumerate(hull_pores):
-            logger.info("Processing pore: " + str(i) + " of " + str(len(hull_pores)))
-            dt_pore = self._dt_image * (self._hull_image == pore)
-            indiam[pore] = dt_pore.max() * 2
-            max_ind = np.argmax(dt_pore)
-            incen[pore, 0] = indx[max_ind]
-            incen[pore, 1] = indy[max_ind]
-            incen[pore, 2] = indz[max_ind]
+        # The largest distance in each hull and the first voxel holding it,
+        # found in a single pass over the image
+        dt_max = np.zeros(hull_pores.max() + 1)
+        dt_max[hull_pores] = ndimage.maximum(
+            self._dt_image, self._hull_image, hull_pores
+        )
+        hull = self._hull_image.ravel()
+        hits = np.flatnonzero(self._dt_image.ravel() == dt_max[hull])
+        pores, first = np.unique(hull[hits], return_index=True)
+        indiam[hull_pores] = dt_max[hull_pores] * 2
+        incen[pores] = np.column_stack(
+            np.unravel_index(hits[first], self._hull_image.shape)
+        )
         indiam *= self.network.resolution
         incen *= self.network.resolution
         return (indiam, incen)
@@ -306,12 +629,24 @@ class DelaunayGeometry(GenericGeometry):
 
     def _throat_props(self):
         r"""
-        Use the Voronoi vertices and perform image analysis to obtain throat
-        properties
+        Use the Voronoi vertices to obtain the throat properties of the facets
+        eroded by the fiber radius
+
+        Notes
+        -----
+        All the facets are rotated onto the xy plane at once.  The eroded
+        facet is then found exactly by clipping each polygon with its edges
+        moved inwards by the fiber radius, and its area, perimeter, centroid
+        and inscribed circle are computed by a compiled kernel, so the cost
+        grows linearly with the number of throats.  Facets that are eroded
+        away completely are given a zero area and trimmed later.
+
+        The values are somewhat smaller than those found from an image of
+        each facet, as done previously, which counts whole pixels along the
+        boundary.  The area and perimeter typically differ by 3-5 %, but the
+        area and inscribed diameter of nearly occluded facets can differ by
+        more than half.
         """
-        from skimage.measure import regionprops
-        from skimage.morphology import convex_hull_image
-
         offset = self.network.fiber_rad
         Nt = self.num_throats()
         centroid = np.zeros([Nt, 3])
@@ -322,155 +657,41 @@ class DelaunayGeometry(GenericGeometry):
         equiv_diameter = np.zeros(Nt)
         eroded_verts = np.ndarray(Nt, dtype=object)
 
-        res = 200
-        vertices = self["throat.vertices"]
-        normals = self["throat.normal"]
-        z_axis = [0, 0, 1]
-
-        for i in self.throats("delaunay"):
-            logger.info("Processing throat " + str(i + 1) + " of " + str(Nt))
-            # For boundaries some facets will already be aligned with the axis
-            # if this is the case a rotation is unnecessary
-            angle = tr.angle_between_vectors(normals[i], z_axis)
-            if angle == 0.0 or angle == np.pi:
-                # We are already aligned
-                rotate_facet = False
-                facet = vertices[i]
-            else:
-                rotate_facet = True
-                M = tr.rotation_matrix(
-                    tr.angle_between_vectors(normals[i], z_axis),
-                    tr.vector_product(normals[i], z_axis),
-                )
-                facet = np.dot(vertices[i], M[:3, :3].T)
-            x = facet[:, 0]
-            y = facet[:, 1]
-            z = facet[:, 2]
-            # Get points in 2d for image analysis
-            pts = np.column_stack((x, y))
-            # Translate points so min sits at the origin
-            translation = [pts[:, 0].min(), pts[:, 1].min()]
-            pts -= translation
-            order = np.int(math.ceil(-np.log10(np.max(pts))))
-            # Normalise and scale the points so that largest span equals the
-            # resolution to save on memory and create clear image
-            max_factor = np.max([pts[:, 0].max(), pts[:, 1].max()])
-            f = res / max_factor
-            # Scale the offset and define a structuring element with radius
-            r = f * offset
-            # Only proceed if r is less than half the span of the image"
-            if r <= res / 2:
-                pts *= f
-                minp1 = pts[:, 0].min()
-                minp2 = pts[:, 1].min()
-                maxp1 = pts[:, 0].max()
-                maxp2 = pts[:, 1].max()
-                img = np.zeros(
-                    [
-                        np.int(math.ceil(maxp1 - minp1) + 1),
-                        np.int(math.ceil(maxp2 - minp2) + 1),
-                    ]
-                )
-                int_pts = np.around(pts.astype(float), 0).astype(int)
-                for pt in int_pts:
-                    img[pt[0]][pt[1]] = 1
-                # Pad with zeros all the way around the edges
-                img_pad = np.zeros([np.shape(img)[0] + 2, np.shape(img)[1] + 2])
-                img_pad[1: np.shape(img)[0] + 1, 1: np.shape(img)[1] + 1] = img
-                # All points should lie on this plane but could be some
-                # rounding errors so use the order parameter
-                z_plane = np.unique(np.around(z.astype(float), order + 1))
-                if len(z_plane) > 1:
-                    logger.error("Throat " + str(i) + " Rotation Failure")
-                    temp_arr = np.ones(1)
-                    temp_arr.fill(np.mean(z_plane))
-                    z_plane = temp_arr
-                # Fill in the convex hull polygon
-                convhullimg = convex_hull_image(img_pad)
-                # Perform a Distance Transform and black out points less than r
-                # to create binary erosion. This is faster than performing an
-                # erosion and dt can also be used later to find incircle
-                eroded = ndimage.distance_transform_edt(convhullimg)
-                eroded[eroded <= r] = 0
-                eroded[eroded > r] = 1
-                # If we are left with less than 3 non-zero points then the
-                # throat is fully occluded
-                if np.sum(eroded) >= 3:
-                    # Do some image analysis to extract the key properties
-                    cropped = eroded[1: np.shape(img)[0] + 1,
-                                     1: np.shape(img)[1] + 1].astype(int)
-                    regions = regionprops(cropped)
-                    # Change this to cope with genuine multi-region throats
-                    if len(regions) == 1:
-                        for props in regions:
-                            x0, y0 = props.centroid
-                            equiv_diameter[i] = props.equivalent_diameter
-                            area[i] = props.area
-                            perimeter[i] = props.perimeter
-                            coords = props.coords
-                        # Undo the translation, scaling and truncation on the
-                        # centroid
-                        centroid2d = [x0, y0] / f
-                        centroid2d += translation
-                        centroid3d = np.concatenate((centroid2d, z_plane))
-                        # Distance transform the eroded facet to find the
-                        # incenter and inradius
-                        dt = ndimage.distance_transform_edt(eroded)
-                        temp = np.unravel_index(dt.argmax(), dt.shape)
-                        inx0, iny0 = np.asarray(temp).astype(float)
-                        incenter2d = [inx0, iny0]
-                        # Undo the translation, scaling and truncation on the
-                        # incenter
-                        incenter2d /= f
-                        incenter2d += translation
-                        incenter3d = np.concatenate((incenter2d, z_plane))
-                        # The offset vertices will be those in the coords that
-                        # are closest to the originals
-                        offset_verts = []
-                        for pt in int_pts:
-                            vert = np.argmin(np.sum(np.square(coords - pt), axis=1))
-                            if vert not in offset_verts:
-                                offset_verts.append(vert)
-                        # If we are left with less than 3 different vertices
-                        # then the throat is fully occluded as we can't make a
-                        # shape with non-zero area
-                        if len(offset_verts) >= 3:
-                            offset_coords = coords[offset_verts].astype(float)
-                            # Undo the translation, scaling and truncation on
-                            # the offset_verts
-                            offset_coords /= f
-                            offset_coords_3d = np.vstack(
-                                (
-                                    offset_coords[:, 0] + translation[0],
-                                    offset_coords[:, 1] + translation[1],
-                                    np.ones(len(offset_verts)) * z_plane,
-                                )
-                            )
-                            oc_3d = offset_coords_3d.T
-                            # Get matrix to un-rotate the co-ordinates back to
-                            # the original orientation if we rotated in the
-                            # first place
-                            if rotate_facet:
-                                MI = tr.inverse_matrix(M)
-                                # Unrotate the offset coordinates
-                                incenter[i] = np.dot(incenter3d, MI[:3, :3].T)
-                                centroid[i] = np.dot(centroid3d, MI[:3, :3].T)
-                                eroded_verts[i] = np.dot(oc_3d, MI[:3, :3].T)
-                            else:
-                                incenter[i] = incenter3d
-                                centroid[i] = centroid3d
-                                eroded_verts[i] = oc_3d
-
-                            inradius[i] = dt.max()
-                            # Undo scaling on other parameters
-                            area[i] /= f * f
-                            perimeter[i] /= f
-                            equiv_diameter[i] /= f
-                            inradius[i] /= f
-                        else:
-                            area[i] = 0
-                            perimeter[i] = 0
-                            equiv_diameter[i] = 0
+        Ts = self.throats("delaunay")
+        vertices = self["throat.vertices"][Ts]
+        counts = np.array([len(v) for v in vertices], dtype=int)
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        owner = np.repeat(np.arange(Ts.size), counts)
+        R = _rotations_to_z(self["throat.normal"][Ts])
+        pts = np.einsum("nij,nj->ni", R[owner],
+                        np.concatenate(vertices).astype(float))
+        # All points should lie on this plane but could be some rounding
+        # errors so use their mean
+        z_plane = np.bincount(owner, pts[:, 2], Ts.size) / counts
+        kernel = _get_facet_kernel()
+        (a, p, cen, inr, inc, off, num) = kernel(
+            np.ascontiguousarray(pts[:, :2]), indptr, float(offset)
+        )
+        keep = a > 0
+        area[Ts] = a
+        perimeter[Ts] = p
+        equiv_diameter[Ts[keep]] = np.sqrt(4 * a[keep] / np.pi)
+        inradius[Ts[keep]] = inr[keep]
+
+        # Undo the rotations
+        def unrotate(pts2d, z, R):
+            pts3d = np.column_stack((pts2d, z))
+            return np.einsum("nji,nj->ni", R, pts3d)
+
+        centroid[Ts[keep]] = unrotate(cen[keep], z_plane[keep], R[keep])
+        incenter[Ts[keep]] = unrotate(inc[keep], z_plane[keep], R[keep])
+        # The eroded vertices of each facet are stored in twice the room of
+        # its original vertices
+        owner = np.repeat(np.arange(Ts.size), 2 * counts)
+        mask = np.arange(off.shape[0]) < (2 * indptr[:-1] + num)[owner]
+        off3d = unrotate(off[mask], z_plane[owner[mask]], R[owner[mask]])
+        for i, verts in zip(Ts[keep], np.split(off3d, np.cumsum(num[keep]))):
+            eroded_verts[i] = verts
 
         self["throat.area"] = area
         self["throat.perimeter"] = perimeter
@@ -500,8 +721,7 @@ class DelaunayGeometry(GenericGeometry):
         # start index
         si = np.floor(origin).astype(int)
         xyz -= origin
-        dom = np.zeros([xr, yr, zr], dtype=np.uint8)
-        indx, indy, indz = np.indices((xr, yr, zr))
+        indx, indy, indz = np.arange(xr), np.arange(yr), np.arange(zr)
         # Calculate the tesselation of the points
         hull = sptl.ConvexHull(xyz)
         # Assume 3d for now
@@ -523,21 +743,21 @@ class DelaunayGeometry(GenericGeometry):
         nrmls[k] = -nrmls[k]
         # Now we want to test whether dot(x,N) >= dot(a,N)
         aN = np.sum(nrmls * a, axis=-1)
+        # The index arrays are broadcast against each other so only the sum
+        # is evaluated on the full grid
+        dom = np.ones([xr, yr, zr], dtype=bool)
         for plane_index, _ in enumerate(a):
             eqx = nrmls[plane_index][0] * (indx)
             eqy = nrmls[plane_index][1] * (indy)
             eqz = nrmls[plane_index][2] * (indz)
-            xN = eqx + eqy + eqz
-            dom[xN - aN[plane_index] >= 0 - tol] += 1
-        dom[dom < len(a)] = 0
-        dom[dom == len(a)] = 1
+            xN = eqx[:, None, None] + eqy[None, :, None] + eqz[None, None, :]
+            dom &= xN - aN[plane_index] >= 0 - tol
         ds = np.shape(dom)
-        temp_arr = np.zeros_like(self._hull_image, dtype=bool)
-        temp_arr[si[0]: si[0] + ds[0],
-                 si[1]: si[1] + ds[1],
-                 si[2]: si[2] + ds[2]] = dom
-        self._hull_image[temp_arr] = pore
-        del temp_arr
+        # Only touch the part of the image spanned by the hull
+        view = self._hull_image[si[0]: si[0] + ds[0],
+                                si[1]: si[1] + ds[1],
+                                si[2]: si[2] + ds[2]]
+        view[dom] = pore
 
     def in_hull_volume(self):
         r"""
@@ -593,8 +813,15 @@ class DelaunayGeometry(GenericGeometry):
     def _bresenham(self, faces, dx):
         r"""
         A Bresenham line function to generate points to fill in for the fibers
+
+        Notes
+        -----
+        Each face is first put in hull order, then the points along the edges
+        of all the faces are generated in a single vectorized pass.  Each edge
+        is sampled at ``ceil(length / dx)`` evenly spaced points, including
+        both of its ends.
         """
-        line_points = []
+        loops = []
         for face in faces:
             # Get in hull order
             fx = face[:, 0]
@@ -608,24 +835,36 @@ class DelaunayGeometry(GenericGeometry):
             else:
                 f2d = np.vstack((fx, fy)).T
             hull = sptl.ConvexHull(f2d, qhull_options="QJ Pp")
-            face = np.around(face[hull.vertices].astype(float), 6)
-            for i, _ in enumerate(face):
-                vec = face[i] - face[i - 1]
-                vec_length = np.linalg.norm(vec)
-                increments = np.int(np.ceil(vec_length / dx))
-                check_p_old = np.array([-1, -1, -1])
-                for x in np.linspace(0, 1, increments):
-                    check_p_new = face[i - 1] + (vec * x)
-                    if np.sum(check_p_new - check_p_old) != 0:
-                        line_points.append(check_p_new)
-                        check_p_old = check_p_new
-        return np.asarray(line_points)
+            loops.append(np.around(face[hull.vertices].astype(float), 6))
+        if len(loops) == 0:
+            return np.zeros([0, 3])
+        # Edge i of each face runs from vertex i-1 to vertex i
+        tails = np.concatenate([np.roll(face, 1, axis=0) for face in loops])
+        vecs = np.concatenate(loops) - tails
+        num = np.ceil(np.linalg.norm(vecs, axis=1) / dx).astype(int)
+        edges = np.repeat(np.arange(num.size), num)
+        ends = np.cumsum(num)
+        # Same samples as np.linspace(0, 1, num) on each edge
+        x = np.arange(ends[-1]) - np.repeat(ends - num, num)
+        x = x * (1.0 / np.maximum(num - 1, 1))[edges]
+        x[ends[num > 1] - 1] = 1.0
+        return tails[edges] + vecs[edges] * x[:, np.newaxis]
 
     def _get_fiber_image(self, cpores):
         r"""
         Produce image by filling in voxels along throat edges using Bresenham
         line then performing distance transform on fiber voxels to erode the
         pore space
+
+        Notes
+        -----
+        The size of the images is limited by the ``memory_budget`` setting
+        (in bytes).  Images that do not fit in the budget are stored in
+        temporary memory-mapped files, and the distance transform is computed
+        on chunks sized so that ``workers`` of them fit in the budget at once.
+        Each chunk is padded by a halo of neighbouring voxels at least as wide
+        as the largest distance in the image, so the result does not depend
+        on the chunking.
         """
         fiber_rad = self.network.fiber_rad
         vox_len = self.network.resolution
@@ -643,87 +882,91 @@ class DelaunayGeometry(GenericGeometry):
             np.array([(vxmax - vxmin), (vymax - vymin), (vzmax - vzmin)]), 6
         )
         logger.info("Creating fibers in range: " + str(np.around(cdomain, 5)))
-        lx = np.int(np.around(cdomain[0] / vox_len) + 1)
-        ly = np.int(np.around(cdomain[1] / vox_len) + 1)
-        lz = np.int(np.around(cdomain[2] / vox_len) + 1)
-        logger.info("Voxels: " + str(lx) + " " + str(ly) + " " + str(lz))
-        # Try to create all the arrays we will need at total domain size
-        try:
-            pore_space = np.ones([lx, ly, lz], dtype=np.uint8)
-            fiber_space = np.zeros(shape=[lx, ly, lz], dtype=np.uint8)
-            dt = np.zeros([lx, ly, lz], dtype=float)
-            # Only need one chunk
-            cx = cy = cz = 1
-            chunk_len = np.max(np.shape(pore_space))
-        except Exception:
+        shape = (np.around(cdomain / vox_len) + 1).astype(int)
+        logger.info("Voxels: " + " ".join(str(i) for i in shape))
+        budget = self.settings["memory_budget"]
+        if budget is None:
+            budget = _MEMORY_BUDGET
+        workers = self.settings["workers"]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        nvox = int(np.prod(shape))
+        # The pore, fiber and distance images take 10 bytes per voxel
+        on_disk = nvox * 10 > budget // 2
+        if on_disk:
             logger.info(
-                "Domain too large to fit into memory so chunking "
-                + "domain to process image, this may take some time"
+                "Domain too large to fit into the memory budget so "
+                + "storing the images in temporary files"
             )
-            # Do chunking
-            chunk_len = 100
-            if lx > chunk_len:
-                cx = np.ceil(lx / chunk_len).astype(int)
-            else:
-                cx = 1
-            if ly > chunk_len:
-                cy = np.ceil(ly / chunk_len).astype(int)
-            else:
-                cy = 1
-            if lz > chunk_len:
-                cz = np.ceil(lz / chunk_len).astype(int)
-            else:
-                cz = 1
+        pore_space = _allocate(shape, np.uint8, on_disk)
+        pore_space[:] = 1
+        fiber_space = _allocate(shape, np.uint8, on_disk)
+        dt = _allocate(shape, float, on_disk)
 
         # Get image of the fibers
         line_points = self._bresenham(verts, vox_len / 2)
         line_ints = (np.around((line_points / vox_len), 0)).astype(int)
-        for x, y, z in line_ints:
-            try:
-                pore_space[x][y][z] = 0
-            except IndexError:
-                logger.warning(
-                    "Some elements in image processing are out" + "of bounds"
-                )
+        inside = np.all((line_ints >= 0) & (line_ints < shape), axis=1)
+        if not np.all(inside):
+            logger.warning(
+                "Some elements in image processing are out" + "of bounds"
+            )
+        pore_space[tuple(line_ints[inside].T)] = 0
 
-        num_chunks = np.int(cx * cy * cz)
-        cnum = 1
-        for ci in range(cx):
-            for cj in range(cy):
-                for ck in range(cz):
-                    # Work out chunk range
-                    logger.info(
-                        "Processing fiber Chunk: "
-                        + str(cnum)
-                        + " of "
-                        + str(num_chunks)
+        # Split the domain into chunks that fit in the budget
+        if nvox * (10 + _EDT_BYTES) <= budget:
+            nchunks = np.ones(3, dtype=int)
+            halo = 0
+        else:
+            logger.info(
+                "Domain too large to fit into memory so chunking "
+                + "domain to process image, this may take some time"
+            )
+            if not on_disk:
+                budget -= nvox * 10
+            halo = min(np.ceil(_max_distance(pore_space)), np.max(shape))
+            halo = int(halo)
+            for n in range(1, np.max(shape) + 1):
+                nchunks = np.ceil(shape / np.ceil(np.max(shape) / n))
+                nchunks = nchunks.astype(int)
+                # Largest chunk, including its halo on the inner sides
+                clen = np.ceil(shape / nchunks) + np.minimum(nchunks - 1, 2) * halo
+                clen = np.minimum(clen, shape)
+                if np.prod(clen) * _EDT_BYTES * workers <= budget:
+                    break
+                if np.max(shape) / n < 16:
+                    logger.warning(
+                        "The memory budget is too small for the requested "
+                        + "resolution, chunks will exceed it"
                     )
-                    cxmin = ci * chunk_len
-                    cxmax = np.int(np.ceil((ci + 1) * chunk_len + 5 * fiber_rad))
-                    cymin = cj * chunk_len
-                    cymax = np.int(np.ceil((cj + 1) * chunk_len + 5 * fiber_rad))
-                    czmin = ck * chunk_len
-                    czmax = np.int(np.ceil((ck + 1) * chunk_len + 5 * fiber_rad))
-                    # Don't overshoot
-                    if cxmax > lx:
-                        cxmax = lx
-                    if cymax > ly:
-                        cymax = ly
-                    if czmax > lz:
-                        czmax = lz
-                    dt_edt = ndimage.distance_transform_edt
-                    dtc = dt_edt(pore_space[cxmin:cxmax, cymin:cymax, czmin:czmax])
-                    fiber_space[cxmin:cxmax, cymin:cymax, czmin:czmax][
-                        dtc <= fiber_rad
-                    ] = 0
-                    fiber_space[cxmin:cxmax, cymin:cymax, czmin:czmax][
-                        dtc > fiber_rad
-                    ] = 1
-                    dt[cxmin:cxmax, cymin:cymax, czmin:czmax] = dtc - fiber_rad
-                    cnum += 1
-        del pore_space
+                    break
+        clen = np.ceil(shape / nchunks).astype(int)
+        cores = [
+            (slice(i, i + clen[0]), slice(j, j + clen[1]),
+             slice(k, k + clen[2]))
+            for i in range(0, shape[0], clen[0])
+            for j in range(0, shape[1], clen[1])
+            for k in range(0, shape[2], clen[2])
+        ]
+
+        def process(args):
+            cnum, core = args
+            logger.info(
+                "Processing fiber Chunk: " + str(cnum) + " of " + str(len(cores))
+            )
+            dtc = _chunk_edt(pore_space, core, halo)
+            fiber_space[core] = dtc > fiber_rad
+            dtc -= fiber_rad
+            dtc[dtc < 0] = 0
+            dt[core] = dtc
+
+        if (workers == 1) or (len(cores) == 1):
+            for item in enumerate(cores, start=1):
+                process(item)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(process, enumerate(cores, start=1)))
         self._fiber_image = fiber_space
-        dt[dt < 0] = 0
         self._dt_image = dt
 
     def _get_fiber_slice(self, plane=None, index=None):
@@ -60,6 +60,7 @@ def spatially_correlated(target, weights=None, strel=None):
     normally distributed.
 
     Because is uses image analysis tools, it only works on Cubic networks.
+    For other networks use ``correlated_field``.
 
     This is the appproached used by Gostick et al [2]_ to create an anistropic
     gas diffusion layer for fuel cell electrodes.
@@ -102,3 +103,122 @@ def spatially_correlated(target, weights=None, strel=None):
     values = im.flatten()
     values = values[network.pores(target.name)]
     return values
+
+
+def correlated_field(target, length, seed=None):
+    r"""
+    Generates pore seeds that are spatially correlated over a given distance,
+    for networks with pores at any location.
+
+    Parameters
+    ----------
+    target : OpenPNM Object
+        The object which this model is associated with. This controls the
+        length of the calculated array, and also provides access to other
+        necessary properties.
+
+    length : scalar or list of scalars
+        The correlation length, in the same units as ``pore.coords``.  Seeds
+        in pores this far apart have a correlation coefficient of about
+        1/e.  A list of 3 values gives a different length in each direction,
+        and a length of 0 gives no correlation in that direction.
+
+    seed : int
+        The starting seed value to send to Scipy's random number generator.
+        The default is None, which means different distribution is returned
+        each time the model is run.
+
+    Returns
+    -------
+    values : NumPy ndarray
+        Array containing pore seed values.
+
+    Notes
+    -----
+    Unlike ``spatially_correlated`` this does not require a Cubic network.
+    A random field is generated on a regular background grid spanning the
+    network, smoothed with a Gaussian filter applied in Fourier space, and
+    interpolated onto ``pore.coords``.  The values are then converted back
+    to a uniform distribution by assuming they are normally distributed.
+    The cost scales as O(N log N), with the grid made coarser if needed so
+    it holds no more than a few points per pore.
+
+    The field is computed for the whole network, so seeds are continuous
+    across Geometry objects that use the same ``seed``.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> pn = op.network.Voronoi(num_points=500, shape=[1, 1, 1])
+    >>> Ps, Ts = pn.Ps, pn.Ts
+    >>> geom = op.geometry.GenericGeometry(network=pn, pores=Ps, throats=Ts)
+    >>> mod = op.models.geometry.pore_seed.correlated_field
+    >>> geom.add_model(propname='pore.seed', model=mod, length=0.2)
+
+    """
+    network = target.project.network
+    if seed is not None:
+        _np.random.seed(seed)
+    values = _correlated_field(network['pore.coords'], length)
+    return values[network.pores(target.name)]
+
+
+def _correlated_field(coords, length, cells=2, max_cells=None):
+    r"""
+    Samples a uniformly distributed random field with a Gaussian correlation
+    of the given length at each of the given coordinates
+
+    Parameters
+    ----------
+    coords : ND-array
+        The N-by-3 coordinates at which to sample the field
+    length : scalar or list of scalars
+        The correlation length in each direction
+    cells : int
+        The number of grid cells per standard deviation of the Gaussian
+        filter
+    max_cells : int
+        The largest number of grid cells to use, the default is 8 per
+        coordinate (but at least 2**21)
+    """
+    coords = _np.asarray(coords, dtype=float)
+    Np = coords.shape[0]
+    # Filtering white noise with a Gaussian of std s gives a field whose
+    # correlation decays as exp(-r**2/(4*s**2)), so s = length/2
+    sigma = _np.ones(3)*_np.array(length, dtype=float)/2
+    if not _np.any(sigma > 0):
+        return _np.random.rand(Np)
+    lo = _np.amin(coords, axis=0)
+    extent = _np.amax(coords, axis=0) - lo
+    active = extent > 0
+    # Grid spacing in each direction, with the finest spacing used along
+    # directions in which the field is not correlated
+    h = sigma/cells
+    h[h == 0] = _np.amin(h[h > 0])
+    if max_cells is None:
+        max_cells = max(8*Np, 2**21)
+    while True:
+        s = sigma/h
+        # Pad the grid to avoid correlations wrapping around the boundaries
+        pad = _np.ceil(3*s).astype(int)*active
+        shape = (_np.ceil(extent/h).astype(int) + 1)*active + 2*pad
+        shape = _np.maximum(shape, 1)
+        if _np.prod(shape, dtype=float) <= max_cells:
+            break
+        h = h*(_np.prod(shape, dtype=float)/max_cells)**(1/sum(active))
+    field = _np.random.randn(*shape)
+    # Gaussian filter applied as a product in Fourier space
+    f = [_np.fft.fftfreq(n) for n in shape[:-1]]
+    f.append(_np.fft.rfftfreq(shape[-1]))
+    G = 1.0
+    for i, fi in enumerate(f):
+        g = _np.exp(-2*(_np.pi*fi*s[i])**2)
+        G = G*g.reshape([-1 if j == i else 1 for j in range(3)])
+    field = _np.fft.irfftn(_np.fft.rfftn(field)*G, s=shape)
+    # Trilinear interpolation onto the coordinates
+    import scipy.ndimage as spim
+    x = (coords - lo)/h*active + pad
+    values = spim.map_coordinates(field, x.T, order=1, mode='nearest')
+    values = (values - _np.mean(values))/_np.std(values)
+    values = 1/2*_sp.special.erfc(-values/_np.sqrt(2))
+    return values
@@ -51,7 +51,8 @@ def from_neighbor_throats(target, prop, mode='max'):
 from_neighbor_throats.__doc__ = _misc.from_neighbor_throats.__doc__
 
 
-def largest_sphere(target, fixed_diameter='pore.fixed_diameter', iters=5):
+def largest_sphere(target, fixed_diameter='pore.fixed_diameter', iters=5,
+                   tol=0):
     r"""
     Finds the maximum diameter pore that can be placed in each location without
     overlapping any neighbors.
@@ -76,12 +77,21 @@ def largest_sphere(target, fixed_diameter='pore.fixed_diameter', iters=5):
         assigned to network, if any.  If not provided a starting value is
         assumed as half-way to the nearest neighbor.
 
-    iters : integer
+    iters : integer or None
         The number of iterations to perform when searching for maximum
         diameter.  This function iteratively grows pores until they touch
         their nearest neighbor, which is also growing, so this parameter limits
         the maximum number of iterations.  The default is 10, but 5 is usally
-        enough.
+        enough.  If ``None`` the iterations continue until the diameters have
+        converged to within ``tol``.
+
+    tol : float
+        The relative tolerance at which the diameters are considered
+        converged, so that no further iterations are performed even if
+        ``iters`` has not been reached.  A pore has converged when the
+        distance it would grow by is no more than ``tol`` times its
+        diameter.  The default is 0, which stops only once the diameters no
+        longer change to within machine precision.
 
     Returns
     -------
@@ -101,9 +111,6 @@ def largest_sphere(target, fixed_diameter='pore.fixed_diameter', iters=5):
     """
     network = target.project.network
     P12 = network['throat.conns']
-    C1 = network['pore.coords'][network['throat.conns'][:, 0]]
-    C2 = network['pore.coords'][network['throat.conns'][:, 1]]
-    L = _np.sqrt(_np.sum((C1 - C2)**2, axis=1))
     try:
         # Fetch any existing pore diameters on the network
         D = network[fixed_diameter]
@@ -112,20 +119,119 @@ def largest_sphere(target, fixed_diameter='pore.fixed_diameter', iters=5):
     except KeyError:
         _logger.info('Pore sizes not present, calculating starting values '
                      + 'as half-way to the nearest neighbor')
-        D = _np.inf*_np.ones([network.Np, ], dtype=float)
-        _np.minimum.at(D, P12[:, 0], L)
-        _np.minimum.at(D, P12[:, 1], L)
-    while iters >= 0:
-        iters -= 1
-        Lt = L - _np.sum(D[P12], axis=1)/2
-        Dadd = _np.ones_like(D)*_np.inf
-        _np.minimum.at(Dadd, P12[:, 0], Lt)
-        _np.minimum.at(Dadd, P12[:, 1], Lt)
-        D += Dadd
+        D = None
+    D = _largest_sphere(P12, network['pore.coords'], D=D, iters=iters,
+                        tol=tol)
+    return D[network.pores(target.name)]
+
+
+def _largest_sphere(P12, coords, D=None, iters=5, tol=0):
+    r"""
+    Grows the diameter of the spheres on every site of the network, as
+    described in ``largest_sphere``, starting from the given diameters or
+    from the distance to the nearest neighbor if ``D`` is None
+    """
+    Np = coords.shape[0]
+    if D is None:
+        D = _np.empty(Np)
+        first = True
+    else:
+        D = _np.array(D, dtype=float)
+        first = False
+    # The original fixed-count loop performed iters + 1 passes
+    n = -1 if iters is None else int(iters) + 1
+    kernel = _get_kernel()
+    kernel(_np.asarray(P12, dtype=_np.int64),
+           _np.asarray(coords, dtype=float), D, first, n, float(tol))
     if _np.any(D < 0):
         _logger.info('Negative pore diameters found!  Neighboring pores are '
                      + 'larger than the pore spacing.')
-    return D[network.pores(target.name)]
+    return D
+
+
+_kernel = []
+
+
+def _get_kernel():
+    r"""
+    Compiles the ``largest_sphere`` kernel on first use and returns it
+
+    Notes
+    -----
+    (1) Numba is imported here rather than at the top of the module to keep
+    the OpenPNM import time down, and the compiled function is kept so it is
+    only compiled once per session.
+
+    (2) The neighbors of each pore and the distances to them are stored in
+    compressed sparse row form, built with a counting sort, so each iteration
+    is a single pass over the neighbors of every pore with no temporary
+    arrays.  The diameters are updated in place, with every pore growing by
+    the gap to its nearest neighbor as it was at the start of the pass, so
+    the result is the same as the vectorized form.
+    """
+    if _kernel:
+        return _kernel[0]
+    from numba import njit
+
+    @njit
+    def to_csr(P12, coords, Np):
+        Nt = P12.shape[0]
+        indptr = _np.zeros(Np + 1, dtype=_np.int64)
+        for t in range(Nt):
+            indptr[P12[t, 0] + 1] += 1
+            indptr[P12[t, 1] + 1] += 1
+        for i in range(Np):
+            indptr[i+1] += indptr[i]
+        fill = indptr[:-1].copy()
+        indices = _np.empty(2*Nt, dtype=_np.int64)
+        L = _np.empty(2*Nt)
+        for t in range(Nt):
+            a, b = P12[t, 0], P12[t, 1]
+            d = 0.0
+            for j in range(coords.shape[1]):
+                d += (coords[a, j] - coords[b, j])**2
+            d = _np.sqrt(d)
+            indices[fill[a]] = b
+            L[fill[a]] = d
+            fill[a] += 1
+            indices[fill[b]] = a
+            L[fill[b]] = d
+            fill[b] += 1
+        return indptr, indices, L
+
+    @njit
+    def kernel(P12, coords, D, first, n, tol):
+        indptr, indices, L = to_csr(P12, coords, D.size)
+        if first:
+            # Start half-way to the nearest neighbor
+            for i in range(D.size):
+                g = _np.inf
+                for k in range(indptr[i], indptr[i+1]):
+                    g = min(g, L[k])
+                D[i] = g
+        gap = _np.empty(D.size)
+        # Below a few ulps the gaps only flip sign with rounding
+        rtol = max(tol, 4*_np.finfo(_np.float64).eps)
+        count = 0
+        while count != n:
+            count += 1
+            for i in range(D.size):
+                g = _np.inf
+                for k in range(indptr[i], indptr[i+1]):
+                    g = min(g, L[k] - (D[i] + D[indices[k]])/2)
+                gap[i] = g
+            converged = True
+            for i in range(D.size):
+                d = D[i] + gap[i]
+                if (d != D[i]) and (abs(gap[i]) > rtol*abs(d)):
+                    converged = False
+                D[i] = d
+            if converged:
+                break
+        return count
+
+    _kernel.append(kernel)
+    return kernel
 
 
 def equivalent_diameter(target, pore_volume='pore.volume',
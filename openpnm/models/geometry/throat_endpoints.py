@@ -128,36 +128,46 @@ def spherical_pores(target, pore_diameter='pore.diameter',
     Dt = network[throat_diameter][throats]
     D1 = network[pore_diameter][cn[:, 0]]
     D2 = network[pore_diameter][cn[:, 1]]
-    L1 = _np.zeros_like(L)
-    L2 = _np.zeros_like(L)
-    # Handle the case where Dt > Dp
-    mask = Dt > D1
-    L1[mask] = 0.5 * D1[mask]
-    L1[~mask] = _np.sqrt(D1[~mask]**2 - Dt[~mask]**2) / 2
-    mask = Dt > D2
-    L2[mask] = 0.5 * D2[mask]
-    L2[~mask] = _np.sqrt(D2[~mask]**2 - Dt[~mask]**2) / 2
-    # Handle non-colinear pores and throat centroids
     try:
         TC = network[throat_centroid][throats]
-        LP1T = _np.linalg.norm(TC - xyz[cn[:, 0]], axis=1) + 1e-15
-        LP2T = _np.linalg.norm(TC - xyz[cn[:, 1]], axis=1) + 1e-15
-        unit_vec_P1T = (TC - xyz[cn[:, 0]]) / LP1T[:, None]
-        unit_vec_P2T = (TC - xyz[cn[:, 1]]) / LP2T[:, None]
     except KeyError:
-        unit_vec_P1T = (xyz[cn[:, 1]] - xyz[cn[:, 0]]) / L[:, None]
+        TC = None
+    return _spherical_pores(xyz, cn, L, Dt, D1, D2, TC)
+
+
+def _spherical_pores(xyz, cn, L, Dt, D1, D2, TC=None):
+    r"""
+    Finds the throat endpoints as described in ``spherical_pores`` from the
+    pore coordinates, the throat connections, lengths (center-to-center),
+    diameters, the diameters of the pores on each end and optionally the
+    throat centroids
+    """
+    X1, X2 = xyz[cn[:, 0]], xyz[cn[:, 1]]
+    # Handle the case where Dt > Dp
+    with _np.errstate(invalid='ignore'):
+        L1 = _np.where(Dt > D1, 0.5 * D1, _np.sqrt(D1**2 - Dt**2) / 2)
+        L2 = _np.where(Dt > D2, 0.5 * D2, _np.sqrt(D2**2 - Dt**2) / 2)
+    # Handle non-colinear pores and throat centroids
+    if TC is not None:
+        LP1T = _np.linalg.norm(TC - X1, axis=1) + 1e-15
+        LP2T = _np.linalg.norm(TC - X2, axis=1) + 1e-15
+        unit_vec_P1T = (TC - X1) / LP1T[:, None]
+        unit_vec_P2T = (TC - X2) / LP2T[:, None]
+    else:
+        unit_vec_P1T = (X2 - X1) / L[:, None]
         unit_vec_P2T = -1 * unit_vec_P1T
     # Find throat endpoints
-    EP1 = xyz[cn[:, 0]] + L1[:, None] * unit_vec_P1T
-    EP2 = xyz[cn[:, 1]] + L2[:, None] * unit_vec_P2T
+    EP1 = X1 + L1[:, None] * unit_vec_P1T
+    EP2 = X2 + L2[:, None] * unit_vec_P2T
     # Handle throats w/ overlapping pores
     L1 = (4 * L**2 + D1**2 - D2**2) / (8 * L)
     L2 = (4 * L**2 + D2**2 - D1**2) / (8 * L)
     h = (2 * _np.sqrt(D1**2 / 4 - L1**2)).real
     overlap = L - 0.5 * (D1 + D2) < 0
     mask = overlap & (Dt < h)
-    EP1[mask] = (xyz[cn[:, 0]] + L1[:, None] * unit_vec_P1T)[mask]
-    EP2[mask] = (xyz[cn[:, 1]] + L2[:, None] * unit_vec_P2T)[mask]
+    if _np.any(mask):
+        EP1[mask] = X1[mask] + L1[mask, None] * unit_vec_P1T[mask]
+        EP2[mask] = X2[mask] + L2[mask, None] * unit_vec_P2T[mask]
     return {'head': EP1, 'tail': EP2}
 
 
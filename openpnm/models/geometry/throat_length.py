@@ -72,15 +72,22 @@ def piecewise(
     # Get throat endpoints
     EP1 = network[throat_endpoints + '.head'][throats]
     EP2 = network[throat_endpoints + '.tail'][throats]
-    # Calculate throat length
-    Lt = _norm(EP1 - EP2, axis=1)
     # Handle the case where pores & throat centroids are not colinear
     try:
         Ct = network[throat_centroid][throats]
-        Lt = _norm(Ct - EP1, axis=1) + _norm(Ct - EP2, axis=1)
     except KeyError:
-        pass
-    return Lt
+        Ct = None
+    return _piecewise(EP1, EP2, Ct)
+
+
+def _piecewise(EP1, EP2, Ct=None):
+    r"""
+    Returns the throat lengths from the endpoints and optionally the
+    centroids, see ``piecewise``
+    """
+    if Ct is None:
+        return _norm(EP1 - EP2, axis=1)
+    return _norm(Ct - EP1, axis=1) + _norm(Ct - EP2, axis=1)
 
 
 def conduit_lengths(
@@ -131,6 +138,14 @@ def conduit_lengths(
     except KeyError:
         # Calculate throat length otherwise based on piecewise model
         Lt = piecewise(target, throat_endpoints, throat_centroid)
+    return _conduit_lengths(C1, C2, EP1, EP2, Lt)
+
+
+def _conduit_lengths(C1, C2, EP1, EP2, Lt):
+    r"""
+    Returns the conduit lengths from the coordinates of the pores on each
+    end, the throat endpoints and lengths, see ``conduit_lengths``
+    """
     # Calculate conduit lengths for pore 1 and pore 2
     L1 = _norm(C1 - EP1, axis=1)
     L2 = _norm(C2 - EP2, axis=1)
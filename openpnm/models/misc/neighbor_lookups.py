@@ -20,42 +20,25 @@ def from_neighbor_throats(target, prop, mode='min', ignore_nans=True):
         used in the calculation.
     mode : string
         Controls how the pore property is calculated.  Options are 'min',
-        'max' and 'mean'.
+        'max', 'mean' and 'sum'.
+    ignore_nans : boolean (default is ``True``)
+        If ``True`` the result will ignore ``nans`` in the neighbors
 
     Returns
     -------
     value : ND-array
         Array containing customized values based on those of adjacent throats.
+        Pores with no neighboring throats, or with only ``nans`` when
+        ``ignore_nans`` is ``True``, are given ``nan``.
 
     """
     prj = target.project
     network = prj.network
     boss = prj.find_full_domain(target)
-    data = boss[prop]
-    nans = np.isnan(data)
-    im = network.create_incidence_matrix()
-    if mode == 'min':
-        if ignore_nans:
-            data[nans] = np.inf
-        values = np.ones((network.Np, ))*np.inf
-        np.minimum.at(values, im.row, data[im.col])
-    if mode == 'max':
-        if ignore_nans:
-            data[nans] = -np.inf
-        values = np.ones((network.Np, ))*-np.inf
-        np.maximum.at(values, im.row, data[im.col])
-    if mode == 'mean':
-        if ignore_nans:
-            data[nans] = 0
-        values = np.zeros((network.Np, ))
-        np.add.at(values, im.row, data[im.col])
-        counts = np.zeros((network.Np, ))
-        np.add.at(counts, im.row, np.ones((network.Nt, ))[im.col])
-        if ignore_nans:
-            np.subtract.at(counts, im.row, nans[im.col])
-        values = values/counts
-    Ps = boss.map_pores(target.pores(), target)
-    return np.array(values)[Ps]
+    indptr, indices = _incidence(network)
+    values = _reduce(boss[prop][indices], indptr, mode=mode,
+                     ignore_nans=ignore_nans)
+    return values[_locations(target, boss, 'pore')]
 
 
 def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
@@ -73,7 +56,7 @@ def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
         used in the calculation.
     mode : string
         Controls how the throat property is calculated.  Options are 'min',
-        'max' and 'mean'.
+        'max', 'mean' and 'sum'.
     ignore_nans : boolean (default is ``True``)
         If ``True`` the result will ignore ``nans`` in the neighbors
 
@@ -81,23 +64,118 @@ def from_neighbor_pores(target, prop, mode='min', ignore_nans=True):
     -------
     value : ND-array
         Array containing customized values based on those of adjacent pores.
+        Throats where both pores are ``nan`` when ``ignore_nans`` is ``True``
+        are given ``nan``.
 
     """
     prj = target.project
-    lookup = prj.find_full_domain(target)
+    boss = prj.find_full_domain(target)
     network = prj.network
-    throats = network.map_throats(target.throats(), target)
-    P12 = network.find_connected_pores(throats)
-    pvalues = lookup[prop][P12]
-    if ignore_nans:
-        pvalues = np.ma.MaskedArray(data=pvalues, mask=np.isnan(pvalues))
-    try:  # If pvalues is not empty
-        if mode == 'min':
-            value = np.amin(pvalues, axis=1)
-        if mode == 'max':
-            value = np.amax(pvalues, axis=1)
-        if mode == 'mean':
-            value = np.mean(pvalues, axis=1)
-    except np.AxisError:  # Handle case of empty pvalues
-        value = []
-    return np.array(value)
+    P12 = network['throat.conns'][_locations(target, boss, 'throat')]
+    pvalues = boss[prop][P12]
+    return _from_neighbor_pores(pvalues, mode=mode, ignore_nans=ignore_nans)
+
+
+def _from_neighbor_pores(pvalues, mode='min', ignore_nans=True):
+    r"""
+    Reduces the Nt-by-2 array of values in the pores on each end of some
+    throats, see ``from_neighbor_pores``.  Any further dimensions (e.g. of
+    vector properties) are kept.
+    """
+    pvalues = np.asarray(pvalues)
+    indptr = np.arange(0, 2*pvalues.shape[0] + 1, 2)
+    return _reduce(pvalues.reshape((-1, ) + pvalues.shape[2:]), indptr,
+                   mode=mode, ignore_nans=ignore_nans)
+
+
+def _locations(target, boss, element):
+    r"""
+    Returns the indices on the full domain object of the pores or throats
+    on the target, found from its label rather than by matching ids
+    """
+    if boss is target:
+        return target._get_indices(element=element)
+    return boss._get_indices(element=element, labels=target.name)
+
+
+def _incidence(network):
+    r"""
+    Returns the ``indptr`` and ``indices`` of the network's incidence matrix
+    in CSR format, so the throats connected to pore ``i`` are
+    ``indices[indptr[i]:indptr[i+1]]``
+
+    Notes
+    -----
+    The matrix is the one stored on the network by ``get_incidence_matrix``,
+    so it is only built once for each topology.
+    """
+    im = network.get_incidence_matrix(fmt='csr')
+    if im.shape != (network.Np, network.Nt):
+        network._im.clear()
+        im = network.get_incidence_matrix(fmt='csr')
+    return im.indptr, im.indices
+
+
+def _reduce(values, indptr, mode='min', ignore_nans=True):
+    r"""
+    Reduces the values in each segment of an array, such as the values on
+    the neighbors of each pore arranged as the rows of a CSR matrix
+
+    Parameters
+    ----------
+    values : ND-array
+        The values to reduce, arranged so each segment is contiguous along
+        the first axis
+    indptr : ND-array
+        The start of each segment in ``values``, followed by its end, so that
+        segment ``i`` is ``values[indptr[i]:indptr[i+1]]``
+    mode : string
+        The reduction to apply to each segment.  Options are 'min', 'max',
+        'mean' and 'sum'.
+    ignore_nans : boolean (default is ``True``)
+        If ``True`` any ``nans`` are left out of the segments
+
+    Returns
+    -------
+    value : ND-array
+        Array containing one value (or row, for vector values) per segment.
+        Empty segments, or segments containing only ``nans`` when
+        ``ignore_nans`` is ``True``, are given ``nan``.
+
+    Notes
+    -----
+    Each reduction is a single ``reduceat`` call over the whole array, which
+    is much faster than the unbuffered ``ufunc.at`` scatter.
+    """
+    funcs = {'min': np.minimum, 'max': np.maximum, 'mean': np.add,
+             'sum': np.add}
+    if mode not in funcs.keys():
+        raise Exception('Unrecognized mode ' + mode)
+    values = np.asarray(values)
+    counts = np.diff(indptr)
+    hit = counts > 0
+    starts = indptr[:-1][hit]
+    # Counts broadcast over any trailing dimensions of the values
+    counts = counts[hit].reshape((-1, ) + (1, )*(values.ndim - 1))
+    if values.dtype.kind in 'fc':
+        nans = np.isnan(values)
+    else:
+        nans = np.zeros(0, dtype=bool)
+    if ignore_nans and np.any(nans):
+        fill = {'min': np.inf, 'max': -np.inf}.get(mode, 0)
+        values = np.where(nans, fill, values)
+        counts = counts - np.add.reduceat(nans, starts, dtype=int)
+    if starts.size:
+        reduced = funcs[mode].reduceat(values, starts)
+    else:
+        reduced = np.zeros((0, ) + values.shape[1:], dtype=values.dtype)
+    if mode == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reduced = reduced/counts
+    elif np.any(counts == 0):
+        reduced = np.where(counts == 0, np.nan, reduced)
+    if np.all(hit):
+        return reduced
+    value = np.full((hit.size, ) + values.shape[1:], np.nan)
+    value[hit] = reduced
+    return value
@@ -0,0 +1,158 @@
+r"""
+Helpers shared by the conduit conductance models
+"""
+import numpy as _np
+from contextlib import contextmanager as _contextmanager
+
+# Conduit data fetched while sharing is enabled, keyed on the target and
+# the names of the arrays
+_shared = {'depth': 0, 'data': {}}
+
+
+@_contextmanager
+def _shared_conduit_data():
+    r"""
+    Within this context the geometric data of the conduits on each target
+    are only fetched once, so that several conductance models can use them
+
+    Notes
+    -----
+    This is entered by ``GenericPhysics.regenerate_models``, during which
+    the network geometry does not change.  The data are discarded when the
+    outermost context exits.
+
+    """
+    _shared['depth'] += 1
+    try:
+        yield
+    finally:
+        _shared['depth'] -= 1
+        if _shared['depth'] == 0:
+            _shared['data'].clear()
+
+
+def _get_throats(target, throats=None):
+    r"""
+    Returns the network indices of the throats on the target, or of the
+    given throats on the target if any
+
+    Notes
+    -----
+    This gives the same result as ``network.map_throats(target.Ts, target)``
+    but uses the label array on the full domain object rather than matching
+    the throat ids, which requires sorting them.
+
+    """
+    proj = target.project
+    boss = proj.find_full_domain(target)
+    if boss is target:
+        Ts = target.Ts
+    else:
+        Ts = boss._get_indices(element='throat', labels=target.name)
+    if throats is not None:
+        Ts = Ts[throats]
+    return Ts
+
+
+def _get_conduit_data(target, pore_size, throat_size, conduit_lengths,
+                      throats=None):
+    r"""
+    Returns the throats on the target and the connections, sizes (e.g.
+    areas) and lengths of the conduits they belong to
+
+    Parameters
+    ----------
+    target : OpenPNM Object
+        The object on which the conductance model is run
+    pore_size : str
+        Dictionary key of the pore size values (e.g. ``'pore.area'``)
+    throat_size : str
+        Dictionary key of the throat size values (e.g. ``'throat.area'``)
+    conduit_lengths : str
+        Dictionary key of the conduit length values
+    throats : array_like, optional
+        The indices of the throats on the target to fetch.  If not given
+        all throats on the target are used.
+
+    Returns
+    -------
+    data : tuple
+        The throat indices, the throat connections, the sizes of pore 1,
+        the throat and pore 2, and the lengths of pore 1, the throat and
+        pore 2, in that order
+
+    """
+    key = (id(target), pore_size, throat_size, conduit_lengths)
+    if key in _shared['data']:
+        data = _shared['data'][key]
+        if throats is not None:
+            data = tuple(x[throats] for x in data)
+        return data
+    network = target.project.network
+    Ts = _get_throats(target, throats)
+    cn = network['throat.conns'][Ts]
+    S1, S2 = network[pore_size][cn].T
+    St = network[throat_size][Ts]
+    L1 = network[conduit_lengths + '.pore1'][Ts]
+    Lt = network[conduit_lengths + '.throat'][Ts]
+    L2 = network[conduit_lengths + '.pore2'][Ts]
+    data = (Ts, cn, S1, St, S2, L1, Lt, L2)
+    # Only the data of all throats are kept, subsets are rarely reused
+    if (_shared['depth'] > 0) and (throats is None):
+        _shared['data'][key] = data
+    return data
+
+
+def _get_shape_factors(phase, conduit_shape_factors, throats):
+    r"""
+    Returns the shape factors of pore 1, the throat and pore 2, or 1.0 if
+    they are not defined
+    """
+    try:
+        SF1 = phase[conduit_shape_factors + '.pore1'][throats]
+        SFt = phase[conduit_shape_factors + '.throat'][throats]
+        SF2 = phase[conduit_shape_factors + '.pore2'][throats]
+    except KeyError:
+        SF1 = SF2 = SFt = 1.0
+    return SF1, SFt, SF2
+
+
+def _interpolate(X1, X2):
+    r"""
+    Returns the mean of the values at each end of the conduits, ignoring
+    nans, as done by ``interpolate_data``
+    """
+    Xt = (X1 + X2) / 2
+    Xt = _np.where(_np.isnan(X1), X2, Xt)
+    return _np.where(_np.isnan(X2), X1, Xt)
+
+
+def _series_conductance(L1, Lt, L2, k1, kt, k2, SF1=1.0, SFt=1.0, SF2=1.0):
+    r"""
+    Returns the conductance of conduits made of half of pore 1, the throat
+    and half of pore 2 in series
+
+    Parameters
+    ----------
+    L1, Lt, L2 : ndarray
+        The lengths of each element of the conduits
+    k1, kt, k2 : ndarray or float
+        The conductance of a unit length of each element (e.g. the product
+        of the diffusivity and the area)
+    SF1, SFt, SF2 : ndarray or float
+        The shape factors of each element
+
+    Notes
+    -----
+    The resistance of each element, L / (k * SF), is accumulated in a single
+    array.  Elements of zero length (e.g. boundary pores) have no resistance
+    even if their area is zero.
+
+    """
+    R = _np.zeros(_np.shape(Lt), dtype=float)
+    with _np.errstate(divide='ignore', invalid='ignore'):
+        for L, k, SF in ((L1, k1, SF1), (Lt, kt, SFt), (L2, k2, SF2)):
+            r = L / (k * SF)
+            r[L == 0] = 0.0
+            R += r
+        return 1 / R
@@ -3,6 +3,7 @@ Pore-scale models for calculating the advective-diffusive conductance of
 conduits.
 """
 import numpy as _np
+from ._utils import _get_throats
 
 __all__ = ["ad_dif"]
 
@@ -61,7 +62,7 @@ def ad_dif(target,
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     cn = network['throat.conns'][throats]
     # Getting conduit lengths
@@ -3,6 +3,7 @@ Pore-scale models for calculating the advective-diffusive-migrative
 conductance of conduits.
 """
 import numpy as _np
+from ._utils import _get_throats
 
 __all__ = ["ad_dif_mig"]
 
@@ -93,7 +94,7 @@ def ad_dif_mig(
     throat_valence = throat_valence + "." + ion
 
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     cn = network["throat.conns"][throats]
     # Getting conduit lengths
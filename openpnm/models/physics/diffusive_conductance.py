@@ -3,6 +3,9 @@ Pore-scale models for calculating the diffusive conductance of conduits.
 """
 import numpy as _np
 import scipy.constants as _const
+from openpnm.utils import locality as _locality
+from ._utils import _get_conduit_data, _get_shape_factors
+from ._utils import _get_throats, _interpolate, _series_conductance
 
 __all__ = [
     "ordinary_diffusion",
@@ -14,6 +17,7 @@ __all__ = [
 ]
 
 
+@_locality('throat')
 def ordinary_diffusion(
     target,
     pore_area="pore.area",
@@ -22,6 +26,7 @@ def ordinary_diffusion(
     throat_diffusivity="throat.diffusivity",
     conduit_lengths="throat.conduit_lengths",
     conduit_shape_factors="throat.poisson_shape_factors",
+    throats=None,
 ):
     r"""
     Calculates the diffusive conductance of conduits in network.
@@ -44,6 +49,9 @@ def ordinary_diffusion(
         Dictionary key of the conduit length values.
     conduit_shape_factors : str
         Dictionary key of the conduit diffusive shape factors' values.
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
 
     Returns
     -------
@@ -64,38 +72,18 @@ def ordinary_diffusion(
     factors.
 
     """
-    network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network["throat.conns"][throats]
-    # Getting equivalent areas
-    A1 = network[pore_area][cn[:, 0]]
-    At = network[throat_area][throats]
-    A2 = network[pore_area][cn[:, 1]]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + ".pore1"][throats]
-    Lt = network[conduit_lengths + ".throat"][throats]
-    L2 = network[conduit_lengths + ".pore2"][throats]
+    # Getting equivalent areas and conduit lengths
+    Ts, cn, A1, At, A2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_area, throat_area, conduit_lengths, throats)
     # Getting shape factors
-    try:
-        SF1 = phase[conduit_shape_factors + ".pore1"][throats]
-        SFt = phase[conduit_shape_factors + ".throat"][throats]
-        SF2 = phase[conduit_shape_factors + ".pore2"][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
     # Interpolate pore phase property values to throats
     D1, D2 = phase[pore_diffusivity][cn].T
-    Dt = phase.interpolate_data(propname=pore_diffusivity)[throats]
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1 = (D1 * A1) / L1
-    g2 = (D2 * A2) / L2
-    gt = (Dt * At) / Lt
-    # Ensure infinite conductance for elements with zero length
-    g1[L1 == 0] = _np.inf
-    g2[L2 == 0] = _np.inf
-    gt[Lt == 0] = _np.inf
+    Dt = _interpolate(D1, D2)
     # Apply shape factors and calculate the final conductance
-    return (1 / gt / SFt + 1 / g1 / SF1 + 1 / g2 / SF2) ** (-1)
+    return _series_conductance(L1, Lt, L2, D1 * A1, Dt * At, D2 * A2,
+                               SF1, SFt, SF2)
 
 
 def ordinary_diffusion_2d(
@@ -168,6 +156,7 @@ def ordinary_diffusion_2d(
     )
 
 
+@_locality('throat')
 def mixed_diffusion(
     target,
     pore_area="pore.area",
@@ -180,6 +169,7 @@ def mixed_diffusion(
     molecular_weight="pore.molecular_weight",
     conduit_lengths="throat.conduit_lengths",
     conduit_shape_factors="throat.poisson_shape_factors",
+    throats=None,
 ):
     r"""
     Calculates the diffusive conductance of conduits in network with
@@ -212,6 +202,9 @@ def mixed_diffusion(
         Dictionary key of the conduit lengths' values.
     conduit_shape_factors : str
         Dictionary key of the conduit diffusive shape factors' values.
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
 
     Returns
     -------
@@ -240,33 +233,22 @@ def mixed_diffusion(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network["throat.conns"][throats]
-    # Getting equivalent areas
-    A1, A2 = network[pore_area][cn].T
-    At = network[throat_area][throats]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + ".pore1"][throats]
-    Lt = network[conduit_lengths + ".throat"][throats]
-    L2 = network[conduit_lengths + ".pore2"][throats]
+    # Getting equivalent areas and conduit lengths
+    Ts, cn, A1, At, A2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_area, throat_area, conduit_lengths, throats)
     # Getting shape factors
-    try:
-        SF1 = phase[conduit_shape_factors + ".pore1"][throats]
-        SFt = phase[conduit_shape_factors + ".throat"][throats]
-        SF2 = phase[conduit_shape_factors + ".pore2"][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
     # Interpolate pore phase property values to throats
     D1, D2 = phase[pore_diffusivity][cn].T
-    Dt = phase.interpolate_data(propname=pore_diffusivity)[throats]
+    Dt = _interpolate(D1, D2)
     # Calculating Knudsen diffusivity
     d1, d2 = network[pore_diameter][cn].T
-    dt = network[throat_diameter][throats]
+    dt = network[throat_diameter][Ts]
     MW1, MW2 = phase[molecular_weight][cn].T
-    MWt = phase.interpolate_data(propname=molecular_weight)[throats]
+    MWt = _interpolate(MW1, MW2)
     T1, T2 = phase[pore_temperature][cn].T
-    Tt = phase.interpolate_data(propname=pore_temperature)[throats]
+    Tt = _interpolate(T1, T2)
     DK1 = d1 / 3 * (8 * _const.R * T1 / _const.pi / MW1) ** 0.5
     DK2 = d2 / 3 * (8 * _const.R * T2 / _const.pi / MW2) ** 0.5
     DKt = dt / 3 * (8 * _const.R * Tt / _const.pi / MWt) ** 0.5
@@ -274,18 +256,12 @@ def mixed_diffusion(
     D1e = (1 / DK1 + 1 / D1) ** (-1)
     D2e = (1 / DK2 + 1 / D2) ** (-1)
     Dte = (1 / DKt + 1 / Dt) ** (-1)
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1 = (D1e * A1) / L1
-    g2 = (D2e * A2) / L2
-    gt = (Dte * At) / Lt
-    # Ensure infinite conductance for elements with zero length
-    g1[L1 == 0] = _np.inf
-    g2[L2 == 0] = _np.inf
-    gt[Lt == 0] = _np.inf
     # Apply shape factors and calculate the final conductance
-    return (1 / gt / SFt + 1 / g1 / SF1 + 1 / g2 / SF2) ** (-1)
+    return _series_conductance(L1, Lt, L2, D1e * A1, Dte * At, D2e * A2,
+                               SF1, SFt, SF2)
 
 
+@_locality('throat')
 def taylor_aris_diffusion(
     target,
     pore_area="pore.area",
@@ -296,6 +272,7 @@ def taylor_aris_diffusion(
     throat_diffusivity="throat.diffusivity",
     conduit_lengths="throat.conduit_lengths",
     conduit_shape_factors="throat.poisson_shape_factors",
+    throats=None,
 ):
     r"""
     Calculates the diffusive conductance of conduits in network
@@ -323,6 +300,9 @@ def taylor_aris_diffusion(
         Dictionary key of the conduit length values.
     conduit_shape_factors : str
         Dictionary key of the conduit diffusive shape factors' values.
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
 
     Returns
     -------
@@ -348,31 +328,18 @@ def taylor_aris_diffusion(
     diffusion-like processes and fluid flow need different shape factors.
 
     """
-    network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network["throat.conns"][throats]
-    # Getting equivalent areas
-    A1 = network[pore_area][cn[:, 0]]
-    At = network[throat_area][throats]
-    A2 = network[pore_area][cn[:, 1]]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + ".pore1"][throats]
-    Lt = network[conduit_lengths + ".throat"][throats]
-    L2 = network[conduit_lengths + ".pore2"][throats]
+    # Getting equivalent areas and conduit lengths
+    Ts, cn, A1, At, A2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_area, throat_area, conduit_lengths, throats)
     # Getting shape factors
-    try:
-        SF1 = phase[conduit_shape_factors + ".pore1"][throats]
-        SFt = phase[conduit_shape_factors + ".throat"][throats]
-        SF2 = phase[conduit_shape_factors + ".pore2"][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
     # Interpolate pore phase property values to throats
     D1, D2 = phase[pore_diffusivity][cn].T
-    Dt = phase.interpolate_data(propname=pore_diffusivity)[throats]
+    Dt = _interpolate(D1, D2)
     # Fetch properties for calculating Peclet
     P = phase[pore_pressure]
-    gh = phase[throat_hydraulic_conductance]
+    gh = phase[throat_hydraulic_conductance][Ts]
     Qt = -gh * _np.diff(P[cn], axis=1).squeeze()
     # Find fluid velocity in elements
     u1 = Qt / A1
@@ -382,16 +349,12 @@ def taylor_aris_diffusion(
     Pe1 = u1 * ((4 * A1 / _np.pi) ** 0.5) / D1
     Pe2 = u2 * ((4 * A2 / _np.pi) ** 0.5) / D2
     Pet = ut * ((4 * At / _np.pi) ** 0.5) / Dt
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1 = D1 * (1 + (Pe1 ** 2) / 192) * A1 / L1
-    g2 = D2 * (1 + (Pe2 ** 2) / 192) * A2 / L2
-    gt = Dt * (1 + (Pet ** 2) / 192) * At / Lt
-    # Ensure infinite conductance for elements with zero length
-    g1[L1 == 0] = _np.inf
-    g2[L2 == 0] = _np.inf
-    gt[Lt == 0] = _np.inf
+    # Find g per unit length for half of pore 1, throat, and half of pore 2
+    k1 = D1 * (1 + (Pe1 ** 2) / 192) * A1
+    k2 = D2 * (1 + (Pe2 ** 2) / 192) * A2
+    kt = Dt * (1 + (Pet ** 2) / 192) * At
     # Apply shape factors and calculate the final conductance
-    return (1 / gt / SFt + 1 / g1 / SF1 + 1 / g2 / SF2) ** (-1)
+    return _series_conductance(L1, Lt, L2, k1, kt, k2, SF1, SFt, SF2)
 
 
 def classic_ordinary_diffusion(
@@ -447,7 +410,7 @@ def classic_ordinary_diffusion(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     # Get Nt-by-2 list of pores connected to each throat
     Ps = network["throat.conns"]
@@ -2,17 +2,22 @@ r"""
 Pore-scale models for calculating the electrical conductance of conduits.
 """
 import numpy as _np
+from openpnm.utils import locality as _locality
+from ._utils import _get_conduit_data, _get_shape_factors
+from ._utils import _interpolate, _series_conductance
 
 __all__ = ["series_resistors"]
 
 
+@_locality('throat')
 def series_resistors(target,
                      pore_area='pore.area',
                      throat_area='throat.area',
                      pore_conductivity='pore.electrical_conductivity',
                      throat_conductivity='throat.electrical_conductivity',
                      conduit_lengths='throat.conduit_lengths',
-                     conduit_shape_factors='throat.poisson_shape_factors'):
+                     conduit_shape_factors='throat.poisson_shape_factors',
+                     throats=None):
     r"""
     Calculate the electrical conductance of conduits in network, where a
     conduit is ( 1/2 pore - full throat - 1/2 pore ). See the notes section.
@@ -42,6 +47,10 @@ def series_resistors(target,
     conduit_shape_factors : string
         Dictionary key of the conduit DIFFUSION shape factor values
 
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
+
     Returns
     -------
     g : ndarray
@@ -64,45 +73,22 @@ def series_resistors(target,
     processes and fluid flow need different shape factors.
 
     """
-    network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network['throat.conns'][throats]
-    # Getting equivalent areas
-    A1 = network[pore_area][cn[:, 0]]
-    At = network[throat_area][throats]
-    A2 = network[pore_area][cn[:, 1]]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + '.pore1'][throats]
-    Lt = network[conduit_lengths + '.throat'][throats]
-    L2 = network[conduit_lengths + '.pore2'][throats]
-    # Preallocating g
-    g1, g2, gt = _np.zeros((3, len(Lt)))
-    # Setting g to inf when Li = 0 (ex. boundary pores)
-    # INFO: This is needed since area could also be zero, which confuses NumPy
-    m1, m2, mt = [Li != 0 for Li in [L1, L2, Lt]]
-    g1[~m1] = g2[~m2] = gt[~mt] = _np.inf
+    # Getting equivalent areas and conduit lengths
+    Ts, cn, A1, At, A2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_area, throat_area, conduit_lengths, throats)
     # Getting shape factors
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
+    # Interpolate phase property values between pores and throats
     try:
-        SF1 = phase[conduit_shape_factors+'.pore1'][throats]
-        SFt = phase[conduit_shape_factors+'.throat'][throats]
-        SF2 = phase[conduit_shape_factors+'.pore2'][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
-    # Interpolate pore phase property values to throats
-    try:
-        Dt = phase[throat_conductivity][throats]
-    except KeyError:
-        Dt = phase.interpolate_data(propname=pore_conductivity)[throats]
-    try:
-        D1 = phase[pore_conductivity][cn[:, 0]]
-        D2 = phase[pore_conductivity][cn[:, 1]]
+        D1, D2 = phase[pore_conductivity][cn].T
     except KeyError:
         D1 = phase.interpolate_data(propname=throat_conductivity)[cn[:, 0]]
         D2 = phase.interpolate_data(propname=throat_conductivity)[cn[:, 1]]
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1[m1] = (D1*A1)[m1] / L1[m1]
-    g2[m2] = (D2*A2)[m2] / L2[m2]
-    gt[mt] = (Dt*At)[mt] / Lt[mt]
+    try:
+        Dt = phase[throat_conductivity][Ts]
+    except KeyError:
+        Dt = _interpolate(D1, D2)
     # Apply shape factors and calculate the final conductance
-    return (1/gt/SFt + 1/g1/SF1 + 1/g2/SF2)**(-1)
+    return _series_conductance(L1, Lt, L2, D1*A1, Dt*At, D2*A2,
+                               SF1, SFt, SF2)
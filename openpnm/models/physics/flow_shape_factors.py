@@ -6,6 +6,7 @@ This submodule is deprecated and will be removed the near future. Use
 `openpnm.models.geometry.hydraulic_size_factors` instead.
 """
 import numpy as _np
+from ._utils import _get_throats
 
 __all__ = ["ball_and_stick", "ball_and_stick_2d", "conical_frustum_and_stick"]
 
@@ -63,7 +64,7 @@ def ball_and_stick(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
@@ -169,7 +170,7 @@ def conical_frustum_and_stick(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
@@ -261,7 +262,7 @@ def ball_and_stick_2d(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
@@ -2,6 +2,9 @@ r"""
 Pore-scale models for calculating hydraulic conductance of conduits.
 """
 import numpy as _np
+from openpnm.utils import locality as _locality
+from ._utils import _get_conduit_data, _get_shape_factors
+from ._utils import _get_throats, _series_conductance
 
 __all__ = [
     "hagen_poiseuille",
@@ -12,6 +15,7 @@ __all__ = [
 ]
 
 
+@_locality('throat')
 def hagen_poiseuille(
     target,
     pore_area="pore.area",
@@ -19,7 +23,8 @@ def hagen_poiseuille(
     pore_viscosity="pore.viscosity",
     throat_viscosity="throat.viscosity",
     conduit_lengths="throat.conduit_lengths",
-    conduit_shape_factors="throat.flow_shape_factors"
+    conduit_shape_factors="throat.flow_shape_factors",
+    throats=None
 ):
     r"""
     Calculates the hydraulic conductance of conduits in network.
@@ -42,6 +47,9 @@ def hagen_poiseuille(
         Dictionary key of the conduit length values.
     conduit_shape_factors : str
         Dictionary key of the conduit hydraulic (flow) shape factor values.
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
 
     Returns
     -------
@@ -66,41 +74,23 @@ def hagen_poiseuille(
     diffusion-like processes and fluid flow need different shape factors.
 
     """
-    network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network["throat.conns"][throats]
-    # Getting equivalent areas
-    A1 = network[pore_area][cn[:, 0]]
-    At = network[throat_area][throats]
-    A2 = network[pore_area][cn[:, 1]]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + ".pore1"][throats]
-    Lt = network[conduit_lengths + ".throat"][throats]
-    L2 = network[conduit_lengths + ".pore2"][throats]
-    # Preallocating g
-    g1, g2, gt = _np.zeros((3, len(Lt)))
-    # Setting g to inf when Li = 0 (ex. boundary pores)
-    # INFO: This is needed since area could also be zero, which confuses NumPy
-    m1, m2, mt = [Li != 0 for Li in [L1, L2, Lt]]
-    g1[~m1] = g2[~m2] = gt[~mt] = _np.inf
+    # Getting equivalent areas and conduit lengths
+    Ts, cn, A1, At, A2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_area, throat_area, conduit_lengths, throats)
     # Getting shape factors
-    try:
-        SF1 = phase[conduit_shape_factors + ".pore1"][throats]
-        SFt = phase[conduit_shape_factors + ".throat"][throats]
-        SF2 = phase[conduit_shape_factors + ".pore2"][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
-    Dt = phase[throat_viscosity][throats]
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
+    Dt = phase[throat_viscosity][Ts]
     D1, D2 = phase[pore_viscosity][cn].T
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1[m1] = A1[m1] ** 2 / (8 * _np.pi * D1 * L1)[m1]
-    g2[m2] = A2[m2] ** 2 / (8 * _np.pi * D2 * L2)[m2]
-    gt[mt] = At[mt] ** 2 / (8 * _np.pi * Dt * Lt)[mt]
+    # Find g per unit length for half of pore 1, throat, and half of pore 2
+    k1 = A1 ** 2 / (8 * _np.pi * D1)
+    k2 = A2 ** 2 / (8 * _np.pi * D2)
+    kt = At ** 2 / (8 * _np.pi * Dt)
     # Apply shape factors and calculate the final conductance
-    return 1 / (1 / gt / SFt + 1 / g1 / SF1 + 1 / g2 / SF2)
+    return _series_conductance(L1, Lt, L2, k1, kt, k2, SF1, SFt, SF2)
 
 
+@_locality('throat')
 def hagen_poiseuille_2d(
     target,
     pore_diameter="pore.diameter",
@@ -109,6 +99,7 @@ def hagen_poiseuille_2d(
     throat_viscosity="throat.viscosity",
     conduit_lengths="throat.conduit_lengths",
     conduit_shape_factors="throat.flow_shape_factors",
+    throats=None,
 ):
     r"""
     Calculates the hydraulic conductance of conduits in network.
@@ -131,6 +122,9 @@ def hagen_poiseuille_2d(
         Dictionary key of the conduit lengths' values.
     conduit_shape_factors : str
         Dictionary key of the conduit flow shape factors' values.
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute
+        the conductance. If not given, all throats are used.
 
     Returns
     -------
@@ -155,34 +149,21 @@ def hagen_poiseuille_2d(
     passing the proper flow_shape_factor argument.
 
     """
-    network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
     phase = target.project.find_phase(target)
-    cn = network["throat.conns"][throats]
-    # Getting pore/throat diameters
-    D1 = network[pore_diameter][cn[:, 0]]
-    Dt = network[throat_diameter][throats]
-    D2 = network[pore_diameter][cn[:, 1]]
-    # Getting conduit lengths
-    L1 = network[conduit_lengths + ".pore1"][throats]
-    Lt = network[conduit_lengths + ".throat"][throats]
-    L2 = network[conduit_lengths + ".pore2"][throats]
+    # Getting pore/throat diameters and conduit lengths
+    Ts, cn, D1, Dt, D2, L1, Lt, L2 = _get_conduit_data(
+        target, pore_diameter, throat_diameter, conduit_lengths, throats)
     # Getting shape factors
-    try:
-        SF1 = phase[conduit_shape_factors + ".pore1"][throats]
-        SFt = phase[conduit_shape_factors + ".throat"][throats]
-        SF2 = phase[conduit_shape_factors + ".pore2"][throats]
-    except KeyError:
-        SF1 = SF2 = SFt = 1.0
+    SF1, SFt, SF2 = _get_shape_factors(phase, conduit_shape_factors, Ts)
     # Getting viscosity values
-    mut = phase[throat_viscosity][throats]
+    mut = phase[throat_viscosity][Ts]
     mu1, mu2 = phase[pore_viscosity][cn].T
-    # Find g for half of pore 1, throat, and half of pore 2
-    g1 = D1 ** 3 / (12 * mu1 * L1)
-    g2 = D2 ** 3 / (12 * mu2 * L2)
-    gt = Dt ** 3 / (12 * mut * Lt)
+    # Find g per unit length for half of pore 1, throat, and half of pore 2
+    k1 = D1 ** 3 / (12 * mu1)
+    k2 = D2 ** 3 / (12 * mu2)
+    kt = Dt ** 3 / (12 * mut)
 
-    return 1 / (1 / gt / SFt + 1 / g1 / SF1 + 1 / g2 / SF2)
+    return _series_conductance(L1, Lt, L2, k1, kt, k2, SF1, SFt, SF2)
 
 
 def hagen_poiseuille_power_law(
@@ -262,7 +243,7 @@ def hagen_poiseuille_power_law(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     cn = network["throat.conns"][throats]
     # Getting equivalent areas
@@ -525,7 +506,7 @@ def classic_hagen_poiseuille(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     # Get Nt-by-2 list of pores connected to each throat
     Ps = network["throat.conns"]
     # Get properties in every pore in the network
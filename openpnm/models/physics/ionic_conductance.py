@@ -2,6 +2,7 @@ r"""
 Pore-scale models for calculating ionic conductance of conduits.
 """
 import numpy as _np
+from ._utils import _get_throats
 from openpnm.utils import logging
 logger = logging.getLogger(__name__)
 
@@ -92,7 +93,7 @@ def poisson(target,
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     cn = network['throat.conns'][throats]
     # Getting equivalent areas
@@ -514,7 +515,7 @@ def electroneutrality(target,
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     phase = target.project.find_phase(target)
     cn = network['throat.conns'][throats]
     # Getting equivalent areas
@@ -3,14 +3,17 @@ Pore-scale models relevant to multiphase simulations.
 """
 import numpy as np
 import scipy as sp
+from openpnm.utils import locality as _locality
+from ._utils import _get_throats
 
 __all__ = ["conduit_conductance", "late_filling"]
 
 
+@_locality('throat')
 def conduit_conductance(target, throat_conductance,
                         throat_occupancy='throat.occupancy',
                         pore_occupancy='pore.occupancy',
-                        mode='strict', factor=1e-6):
+                        mode='strict', factor=1e-6, throats=None):
     r"""
     Determines the conductance of a pore-throat-pore conduit based on the
     invaded state of each element.
@@ -51,6 +54,10 @@ def conduit_conductance(target, throat_conductance,
         The factor which becomes multiplied to the original conduit's
         conductance to severely limit transport, but not set it to zero.
 
+    throats : array_like, optional
+        The indices of the throats on the target at which to compute the
+        conductance.  If not given, all throats are used.
+
     Returns
     -------
     value : NumPy ndarray
@@ -59,8 +66,9 @@ def conduit_conductance(target, throat_conductance,
     """
     network = target.project.network
     phase = target.project.find_phase(target)
-    Tinv = phase[throat_occupancy] < 0.5
-    P12 = network['throat.conns']
+    Ts = _get_throats(target, throats)
+    Tinv = phase[throat_occupancy][Ts] < 0.5
+    P12 = network['throat.conns'][Ts]
     Pinv = phase[pore_occupancy][P12] < 0.5
     if mode == 'loose':
         mask = Tinv
@@ -70,11 +78,9 @@ def conduit_conductance(target, throat_conductance,
         mask = Tinv + np.any(Pinv, axis=1)
     else:
         raise Exception('Unrecongnized mode '+mode)
-    value = phase[throat_conductance].copy()
+    value = phase[throat_conductance][Ts]
     value[mask] = value[mask]*factor
-    # Now map throats onto target object
-    Ts = network.map_throats(throats=target.Ts, origin=target)
-    return value[Ts]
+    return value
 
 
 def late_filling(target, pressure='pore.pressure',
@@ -125,7 +131,7 @@ def late_filling(target, pressure='pore.pressure',
     values = np.clip(1 - Swp, 0.0, 1.0)
     # Now map element onto target object
     if element == 'throat':
-        Ts = network.map_throats(throats=target.Ts, origin=target)
+        Ts = _get_throats(target)
         values = values[Ts]
     else:
         Ps = network.map_pores(pores=target.Ps, origin=target)
@@ -7,6 +7,7 @@ This submodule is deprecated and will be removed the near future. Use
 `openpnm.models.geometry.diffusive_size_factors` instead.
 """
 import numpy as _np
+from ._utils import _get_throats
 
 __all__ = ["ball_and_stick", "ball_and_stick_2d", "conical_frustum_and_stick"]
 
@@ -60,7 +61,7 @@ def ball_and_stick(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
@@ -150,7 +151,7 @@ def conical_frustum_and_stick(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
@@ -232,7 +233,7 @@ def ball_and_stick_2d(
 
     """
     network = target.project.network
-    throats = network.map_throats(throats=target.Ts, origin=target)
+    throats = _get_throats(target)
     cn = network["throat.conns"][throats]
     # Get pore diameter
     D1 = network[pore_diameter][cn[:, 0]]
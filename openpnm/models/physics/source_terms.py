@@ -23,6 +23,8 @@ __all__ = [
     "butler_volmer_conc",
     "butler_volmer_voltage"
 ]
+# Compiled symbolic source terms, keyed on the equation and its arguments
+_kernels = {}
 
 
 def charge_conservation(target, phase, p_alg, e_alg, assumption):
@@ -481,7 +483,18 @@ def _build_func(eq, **args):
     r'''
     Take a symbolic equation and return the lambdified version plus the
     linearization of form S1 * x + S2
+
+    Notes
+    -----
+    The compiled functions are cached on the equation and its arguments, so
+    the equation is only differentiated and lambdified the first time it is
+    seen, rather than every time the model is regenerated.
     '''
+    key = (eq, tuple(args.items()))
+    try:
+        return _kernels[key]
+    except KeyError:
+        pass
     from sympy import lambdify
     eq_prime = eq.diff(args['x'])
     s1 = eq_prime
@@ -489,6 +502,7 @@ def _build_func(eq, **args):
     EQ = lambdify(args.values(), expr=eq, modules='numpy')
     S1 = lambdify(args.values(), expr=s1, modules='numpy')
     S2 = lambdify(args.values(), expr=s2, modules='numpy')
+    _kernels[key] = (EQ, S1, S2)
     return EQ, S1, S2
 
 
@@ -883,13 +897,11 @@ def general_symbolic(target, eqn=None, arg_map=None):
     >>> assert 'pore.general.S1' in water.props()
     >>> assert 'pore.general.S1' in water.props()
     '''
-    from sympy import postorder_traversal, srepr, symbols
+    from sympy import symbols
     # First make sure all the symbols have been allocated dict items
-    for arg in postorder_traversal(eqn):
-        if srepr(arg)[:6] == 'Symbol':
-            key = srepr(arg)[7:].strip('(').strip(')').strip("'")
-            if key not in arg_map.keys():
-                raise Exception('argument mapping incomplete, missing '+key)
+    for arg in eqn.free_symbols:
+        if arg.name not in arg_map.keys():
+            raise Exception('argument mapping incomplete, missing '+arg.name)
     if 'x' not in arg_map.keys():
         raise Exception('argument mapping must contain "x" for the '
                         + 'independent variable')
@@ -1,5 +1,5 @@
+from itertools import chain
 import numpy as np
-import scipy.sparse as sprs
 import scipy.spatial as sptl
 from openpnm import topotools
 from openpnm.utils import logging
@@ -84,32 +84,9 @@ class DelaunayVoronoiDual(GenericNetwork):
 
         # Combine points
         pts_all = np.vstack((vor.points, vor.vertices))
-        Nall = np.shape(pts_all)[0]
-
-        # Create adjacency matrix in lil format for quick construction
-        am = sprs.lil_matrix((Nall, Nall))
-        for ridge in vor.ridge_dict.keys():
-            # Make Delaunay-to-Delauny connections
-            for i in ridge:
-                am.rows[i].extend([ridge[0], ridge[1]])
-            # Get voronoi vertices for current ridge
-            row = vor.ridge_dict[ridge].copy()
-            # Index Voronoi vertex numbers by number of delaunay points
-            row = [i + vor.npoints for i in row if i > -1]
-            # Make Voronoi-to-Delaunay connections
-            for i in ridge:
-                am.rows[i].extend(row)
-            # Make Voronoi-to-Voronoi connections
-            row.append(row[0])
-            for i in range(len(row)-1):
-                am.rows[row[i]].append(row[i+1])
-
-        # Finalize adjacency matrix by assigning data values
-        am.data = am.rows  # Values don't matter, only shape, so use 'rows'
-        # Convert to COO format for direct acces to row and col
-        am = am.tocoo()
-        # Extract rows and cols
-        conns = np.vstack((am.row, am.col)).T
+
+        # Make all three types of connections from the ridges at once
+        conns = _ridge_conns(vor)
 
         # Convert to sanitized adjacency matrix
         am = topotools.conns_to_am(conns)
@@ -149,6 +126,9 @@ class DelaunayVoronoiDual(GenericNetwork):
         else:
             self._trim_external_pores(shape=shape)
             self._label_faces()
+        # Store the connections in the smallest integer type that fits
+        if self.Np < np.iinfo(np.int32).max:
+            self['throat.conns'] = self['throat.conns'].astype(np.int32)
 
     @property
     def tri(self):
@@ -173,11 +153,13 @@ class DelaunayVoronoiDual(GenericNetwork):
         Ps = (~self['pore.external'])*self['pore.delaunay']
 
         # Find all pores connected to an internal delaunay pore
-        Ps = self.find_neighbor_pores(pores=Ps, include_input=True)
+        Ps = np.where(Ps)[0]
+        Ns = _neighbors(self, Ps, self['pore.all'])[1]
 
         # Mark them all as keepers
         self['pore.keep'] = False
         self['pore.keep'][Ps] = True
+        self['pore.keep'][Ns] = True
 
         # Trim all bad pores
         topotools.trim(network=self, pores=~self['pore.keep'])
@@ -187,9 +169,9 @@ class DelaunayVoronoiDual(GenericNetwork):
         self['pore.boundary'] = self['pore.delaunay']*self['pore.external']
 
         # Label Voronoi pores on boundary
-        Ps = self.find_neighbor_pores(pores=self.pores('boundary'))
-        Ps = self['pore.voronoi']*self.tomask(pores=Ps)
-        self['pore.boundary'][Ps] = True
+        Ps = self.pores('boundary')
+        Ns = _neighbors(self, Ps, self['pore.voronoi'])[1]
+        self['pore.boundary'][Ns] = True
 
         # Label Voronoi and interconnect throats on boundary
         self['throat.boundary'] = False
@@ -204,11 +186,13 @@ class DelaunayVoronoiDual(GenericNetwork):
 
         # Move Delaunay boundary pores to centroid of Voronoi facet
         Ps = self.pores(labels=['boundary', 'delaunay'], mode='xnor')
-        for P in Ps:
-            Ns = self.find_neighbor_pores(pores=P)
-            Ns = Ps = self['pore.voronoi']*self.tomask(pores=Ns)
-            coords = np.mean(self['pore.coords'][Ns], axis=0)
-            self['pore.coords'][P] = coords
+        Ps, Ns = _neighbors(self, Ps, self['pore.voronoi'])
+        coords = self['pore.coords']
+        counts = np.bincount(Ps, minlength=self.Np)[Ps]
+        for ax in range(coords.shape[1]):
+            # Sums are accumulated in the order of the sorted neighbors
+            total = np.bincount(Ps, weights=coords[Ns, ax], minlength=self.Np)
+            coords[Ps, ax] = total[Ps]/counts
 
         self['pore.internal'] = ~self['pore.boundary']
         Ps = self.pores('internal')
@@ -240,23 +224,21 @@ class DelaunayVoronoiDual(GenericNetwork):
             from the 'delaunay' network. If no throats are specified, all
             'delaunay' throats are assumed.
 
-        Notes
-        -----
-        The method is not well optimized as it scans through each given throat
-        inside a for-loop, so it could be slow for large networks.
-
         """
         if throats is None:
             throats = self.throats('delaunay')
-        temp = []
-        tvals = self['throat.interconnect'].astype(int)
-        am = self.create_adjacency_matrix(weights=tvals, fmt='lil',
-                                          drop_zeros=True)
-        for t in throats:
-            P12 = self['throat.conns'][t]
-            Ps = list(set(am.rows[P12][0]).intersection(am.rows[P12][1]))
-            temp.append(Ps)
-        return np.array(temp, dtype=object)
+        throats = self._parse_indices(throats)
+        # Voronoi nodes that are neighbors of both Delaunay nodes
+        P12 = self['throat.conns'][throats]
+        Vs = self['pore.voronoi']
+        T1, V1 = _neighbors(self, P12[:, 0], Vs, owners=True)
+        T2, V2 = _neighbors(self, P12[:, 1], Vs, owners=True)
+        owner = np.concatenate((T1, T2))
+        nodes = np.concatenate((V1, V2))
+        order = np.lexsort((nodes, owner))
+        owner, nodes = owner[order], nodes[order]
+        both = (owner[1:] == owner[:-1]) * (nodes[1:] == nodes[:-1])
+        return _split(nodes[1:][both], owner[1:][both], throats.size)
 
     def find_pore_hulls(self, pores=None):
         r"""
@@ -270,21 +252,13 @@ class DelaunayVoronoiDual(GenericNetwork):
             from the 'delaunay' network.  If no pores are given, then the hull
             is found for all 'delaunay' pores.
 
-        Notes
-        -----
-        This metod is not fully optimized as it scans through each pore in a
-        for-loop, so could be slow for large networks.
         """
         if pores is None:
             pores = self.pores('delaunay')
-        temp = []
-        tvals = self['throat.interconnect'].astype(int)
-        am = self.create_adjacency_matrix(weights=tvals, fmt='lil',
-                                          drop_zeros=True)
-        for p in pores:
-            Ps = am.rows[p]
-            temp.append(Ps)
-        return np.array(temp, dtype=object)
+        pores = self._parse_indices(pores)
+        owner, nodes = _neighbors(self, pores, self['pore.voronoi'],
+                                  owners=True)
+        return _split(nodes, owner, pores.size)
 
     def _parse_points(self, shape, points, num_points):
         # Deal with input arguments
@@ -349,3 +323,70 @@ class DelaunayVoronoiDual(GenericNetwork):
                 ax_off = -1*ax_off
             topotools.add_boundary_pores(network=self, pores=Ps, offset=ax_off,
                                          apply_label=item + '_boundary')
+
+
+def _ridge_conns(vor):
+    r"""
+    Returns the Delaunay-Delaunay, Delaunay-Voronoi and Voronoi-Voronoi
+    connections defined by the ridges of a Voronoi tessellation, with the
+    Voronoi vertices numbered after the Delaunay points
+
+    Notes
+    -----
+    Each ridge lies between two Delaunay points, which are connected to each
+    other and to every finite vertex of the ridge, while the vertices are
+    connected to their neighbors around the ridge.  The connections may
+    contain duplicates and self-connections, which are removed by
+    ``conns_to_am``.
+    """
+    Np = vor.npoints
+    lengths = np.fromiter(map(len, vor.ridge_vertices), dtype=int,
+                          count=len(vor.ridge_vertices))
+    verts = np.fromiter(chain.from_iterable(vor.ridge_vertices), dtype=int,
+                        count=lengths.sum())
+    ridge = np.repeat(np.arange(lengths.size), lengths)
+    keep = verts > -1
+    verts, ridge = verts[keep] + Np, ridge[keep]
+    # Index of the next vertex around each ridge, wrapping back to the first
+    lengths = np.bincount(ridge, minlength=lengths.size)
+    ends = np.cumsum(lengths)
+    nxt = np.arange(1, verts.size + 1)
+    nxt[ends[lengths > 0] - 1] = (ends - lengths)[lengths > 0]
+    P12 = vor.ridge_points
+    conns = np.vstack((P12,
+                       np.vstack((P12[ridge, 0], verts)).T,
+                       np.vstack((P12[ridge, 1], verts)).T,
+                       np.vstack((verts, verts[nxt])).T))
+    return conns
+
+
+def _neighbors(network, pores, mask, owners=False):
+    r"""
+    Finds the neighbors of the given pores which are in ``mask``
+
+    Returns
+    -------
+    Two arrays of the same length, the first containing the given pores (or
+    their position in ``pores`` if ``owners`` is ``True``) and the second
+    each of their neighbors, sorted by pore then by neighbor.
+    """
+    am = network.get_adjacency_matrix(fmt='csr')
+    counts = am.indptr[pores + 1] - am.indptr[pores]
+    start = np.repeat(am.indptr[pores] - np.cumsum(counts) + counts, counts)
+    Ns = am.indices[start + np.arange(counts.sum())]
+    Ps = np.repeat(np.arange(pores.size) if owners else pores, counts)
+    keep = mask[Ns]
+    return Ps[keep], Ns[keep]
+
+
+def _split(nodes, owner, size):
+    r"""
+    Splits the sorted ``nodes`` into a list for each owner, returned as an
+    object array of length ``size``
+
+    As with ``np.array(lists, dtype=object)``, the array is 2D if every
+    owner has the same number of nodes (e.g. the facets of a 2D network).
+    """
+    counts = np.bincount(owner, minlength=size)
+    temp = [row.tolist() for row in np.split(nodes, np.cumsum(counts)[:-1])]
+    return np.array(temp, dtype=object)
@@ -41,6 +41,11 @@ class Gabriel(Delaunay):
 
         [x, y, 0] - will produce a 2D square domain of size x by y
 
+    workers : int
+        The number of processes used to query the KD-tree when checking
+        the Gabriel criterion.  The default is 1; -1 uses all of the
+        available processors.
+
     name : string
         An optional name for the object to help identify it.  If not given,
         one will be generated.
@@ -70,20 +75,55 @@ class Gabriel(Delaunay):
 
     """
 
-    def __init__(self, shape=[1, 1, 1], num_points=None, points=None, **kwargs):
+    def __init__(self, shape=[1, 1, 1], num_points=None, points=None,
+                 workers=1, **kwargs):
         # Generate Delaunay tessellation from super class, then trim
         super().__init__(shape=shape, num_points=num_points, points=points, **kwargs)
         if 'pore.coords' in self.keys():
-            points = self['pore.coords']
-            conns = self['throat.conns']
-            # Find centroid of each pair of nodes
-            c = points[conns]
-            m = (c[:, 0, :] + c[:, 1, :])/2
-            # Find radius of circle connecting each pair of nodes
-            r = np.sqrt(np.sum((c[:, 0, :] - c[:, 1, :])**2, axis=1))/2
-            # Use KD-Tree to find distance to nearest neighbors
-            tree = sptl.cKDTree(points)
-            n = tree.query(x=m, k=1)[0]
-            # Identify throats whose centroid is not near an unconnected node
-            g = np.around(n, decimals=5) == np.around(r, decimals=5)
+            g = _find_gabriel_throats(self['pore.coords'],
+                                      self['throat.conns'], workers=workers)
             trim(self, throats=~g)
+
+
+def _find_gabriel_throats(points, conns, workers=1):
+    r"""
+    Finds which connections satisfy the Gabriel criterion, that is no other
+    point lies inside the sphere whose diameter is the connection
+
+    Parameters
+    ----------
+    points : ND-array
+        The coordinates of the points
+    conns : ND-array
+        The connections between points, such as the edges of a Delaunay
+        tessellation
+    workers : int
+        The number of processes used to query the KD-tree, with -1 meaning
+        all available processors
+
+    Returns
+    -------
+    A boolean array which is ``True`` for the connections to keep
+
+    Notes
+    -----
+    All connections are checked in a single pass by finding the distance
+    from the centre of each one to its nearest point, which is the radius of
+    the sphere if it is empty.  The distances are compared to 5 decimal
+    places after scaling by the size of the domain.
+    """
+    c1 = points[conns[:, 0]]
+    c2 = points[conns[:, 1]]
+    # Find centroid of each pair of nodes
+    m = (c1 + c2)/2
+    # Find radius of circle connecting each pair of nodes
+    r = np.sqrt(np.sum((c1 - c2)**2, axis=1))/2
+    # Use KD-Tree to find distance to nearest neighbors
+    tree = sptl.cKDTree(points)
+    n = tree.query(x=m, k=1, workers=workers)[0]
+    # Identify throats whose centroid is not near an unconnected node
+    scale = np.amax(np.ptp(points, axis=0))
+    if scale > 0:
+        n, r = n/scale, r/scale
+    g = np.around(n, decimals=5) == np.around(r, decimals=5)
+    return g
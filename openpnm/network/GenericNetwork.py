@@ -144,6 +144,9 @@ class GenericNetwork(Base, ModelsMixin):
                     logger.warning('Converting throat.conns to be upper '
                                    + 'triangular')
                     value = np.sort(value, axis=1)
+                # The stored matrices no longer match the topology
+                self._am.clear()
+                self._im.clear()
         super().__setitem__(key, value)
 
     def __getitem__(self, key):
@@ -107,6 +107,25 @@ class MultiPhase(GenericPhase):
             dict_.pop(f"{elem}.occupancy.all")
             self[f"{elem}.occupancy.all"] = np.sum(list(dict_.values()), axis=0)
 
+    def _update_occupancy_at(self, element, locs):
+        r"""
+        Updates 'occupancy.all' at the given locations only, after the
+        occupancy of some phase changed there
+        """
+        occs = [self[f"{element}.occupancy.{name}"]
+                for name in self.settings['phases']]
+        total = self[f"{element}.occupancy.all"]
+        total[locs] = np.sum([occ[locs] for occ in occs], axis=0)
+
+    def _check_occupancy(self, element):
+        r"""
+        Checks that the occupancies add up to one
+        """
+        if np.any(self[f"{element}.occupancy.all"] != 1.0):
+            self._update_occupancy()
+            if np.any(self[f"{element}.occupancy.all"] != 1.0):
+                raise Exception(f"Occupancy doesn't add to unity in all {element}s")
+
     def add_phases(self, phases):
         r"""
         Adds supplied phases to the MultiPhase object and initializes
@@ -304,23 +323,30 @@ class MultiPhase(GenericPhase):
             component phase and assembled based on the specified mixing
             rule.
 
+        Notes
+        -----
+        The values are assembled from the current arrays on every access,
+        so changes to the component properties or occupancies are always
+        picked up, including those made in place.
+
         """
         element = self._parse_element(prop)[0]
-        vals = np.zeros([self._count(element=element)], dtype=float)
-        # Retrieve property from constituent phases (weight = occupancy)
         try:
-            for phase in self.phases.values():
-                vals += phase[prop] * self[f"{element}.occupancy.{phase.name}"]
+            arrays = [phase[prop] for phase in self.phases.values()]
         # Otherwise - if not found - retrieve from super class
         except KeyError:
             vals = super().interleave_data(prop)
-
+            # Check for consistency of occupancy values (i.e. add up to 1)
+            self._check_occupancy(element)
+            return vals
+        # Retrieve property from constituent phases (weight = occupancy)
+        vals = np.zeros([self._count(element=element)], dtype=float)
+        temp = np.empty_like(vals)
+        for phase, x in zip(self.phases.values(), arrays):
+            occ = self[f"{element}.occupancy.{phase.name}"]
+            vals += np.multiply(x, occ, out=temp)
         # Check for consistency of occupancy values (i.e. add up to 1)
-        if np.any(self[f"{element}.occupancy.all"] != 1.0):
-            self._update_occupancy()
-            if np.any(self[f"{element}.occupancy.all"] != 1.0):
-                raise Exception(f"Occupancy doesn't add to unity in all {element}s")
-
+        self._check_occupancy(element)
         return vals
 
     def regenerate_models(self, propnames=None, exclude=[], deep=False):
@@ -404,6 +430,12 @@ class MultiPhase(GenericPhase):
         throats : array_like
             The location of throats whose occupancy is to be set.
 
+        Notes
+        -----
+        Only the given locations are updated, including the total occupancy
+        in ``'occupancy.all'``, so the cost of setting the occupancy of a few
+        pores or throats does not depend on the size of the network.
+
         """
         # TODO: pores/throats could also be masks
 
@@ -446,14 +478,15 @@ class MultiPhase(GenericPhase):
         if pores.size:
             Pvals = Pvals if Pvals.size else 1.0
             self['pore.occupancy.' + phase.name][pores] = Pvals
+            self._update_occupancy_at('pore', pores)
         if throats.size:
             Tvals = Tvals if Tvals.size else 1.0
             self['throat.occupancy.' + phase.name][throats] = Tvals
+            self._update_occupancy_at('throat', throats)
 
         if self.settings["throat_occupancy"] == "automatic":
             self.regenerate_models(propnames=f"throat.occupancy.{phase.name}")
-
-        self._update_occupancy()
+            self._update_occupancy()
 
 
 def _dummy(target, **kwargs):
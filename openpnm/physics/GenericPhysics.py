@@ -1,6 +1,7 @@
 import numpy as np
 from openpnm.core import Subdomain, ModelsMixin
 from openpnm.utils import Workspace, logging
+from openpnm.models.physics._utils import _shared_conduit_data
 logger = logging.getLogger(__name__)
 ws = Workspace()
 
@@ -67,6 +68,23 @@ class GenericPhysics(Subdomain, ModelsMixin):
                 else:
                     self.set_geometry(geometry=geometry)
 
+    def regenerate_models(self, propnames=None, exclude=[], deep=False,
+                          pores=None, throats=None):
+        r"""
+        Re-runs the specified model or models, as described in
+        ``ModelsMixin.regenerate_models``.
+
+        Notes
+        -----
+        The conductance models run together share the conduit data (i.e.
+        the areas and lengths of each conduit), which are fetched from the
+        network only once.
+
+        """
+        with _shared_conduit_data():
+            super().regenerate_models(propnames=propnames, exclude=exclude,
+                                      deep=deep, pores=pores, throats=throats)
+
     def set_phase(self, phase=None, mode='swap'):
         r"""
         Sets the association between this physics and a phase.
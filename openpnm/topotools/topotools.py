@@ -1,8 +1,6 @@
 import numpy as np
 import scipy as sp
-import scipy.ndimage as spim
 from scipy.sparse import csgraph
-from scipy.spatial import ConvexHull
 from openpnm.utils import logging, Workspace
 logger = logging.getLogger(__name__)
 ws = Workspace()
@@ -1281,6 +1279,7 @@ def hull_centroid(points):
         A 3 by 1 Numpy array containing coordinates of the centroid.
 
     """
+    from scipy.spatial import ConvexHull
     dim = [np.unique(points[:, i]).size != 1 for i in range(3)]
     hull = ConvexHull(points[:, dim])
     centroid = points.mean(axis=0)
@@ -1401,7 +1400,7 @@ def template_cylinder_annulus(height, outer_radius, inner_radius=0):
 
 
 def generate_base_points(num_points, domain_size, density_map=None,
-                         reflect=True):
+                         reflect=True, seed=None):
     r"""
     Generates a set of base points for passing into the Tessellation-based
     Network classes.  The points can be distributed in spherical, cylindrical,
@@ -1449,6 +1448,12 @@ def generate_base_points(num_points, domain_size, density_map=None,
         tessellation functions into creating smooth flat faces at the
         boundaries once these excess pores are trimmed.
 
+    seed : int or numpy.random.Generator, optional
+        The seed for a new random number ``Generator``, or the ``Generator``
+        to draw the points from.  If not given, NumPy's global random state
+        is used, so the points are the same as those obtained after calling
+        ``np.random.seed`` in previous versions.
+
     Notes
     -----
     The reflection approach tends to create larger pores near the surfaces, so
@@ -1487,18 +1492,41 @@ def generate_base_points(num_points, domain_size, density_map=None,
     def _try_points(num_points, prob):
         prob = np.atleast_3d(prob)
         prob = np.array(prob)/np.amax(prob)  # Ensure prob is normalized
+        rate = np.mean(prob)
+        if not rate > 0:
+            raise Exception('The density_map must contain non-zero values')
+        shape = np.array(prob.shape)
         base_pts = []
         N = 0
         while N < num_points:
-            pt = np.random.rand(3)  # Generate a point
-            # Test whether to keep it or not
-            [indx, indy, indz] = np.floor(pt*np.shape(prob)).astype(int)
-            if np.random.rand(1) <= prob[indx][indy][indz]:
-                base_pts.append(pt)
-                N += 1
-        base_pts = np.array(base_pts)
+            # Draw a block of candidates big enough to give the remaining
+            # number of points on average, each being a point and the
+            # number used to test whether to keep it or not
+            n = int((num_points - N)/rate*1.05) + 16
+            if rng is None:
+                state = np.random.get_state()
+                pts = np.random.rand(n, 4)
+            else:
+                pts = rng.random((n, 4))
+            ind = np.floor(pts[:, :3]*shape).astype(int)
+            keep = pts[:, 3] <= prob[ind[:, 0], ind[:, 1], ind[:, 2]]
+            keep = np.where(keep)[0][:num_points - N]
+            if (rng is None) and (N + keep.size == num_points):
+                # Leave the global state as if the candidates had been
+                # drawn one at a time, up to the last one kept
+                np.random.set_state(state)
+                np.random.rand(keep[-1] + 1, 4)
+            base_pts.append(pts[keep, :3])
+            N += keep.size
+        base_pts = np.concatenate(base_pts, axis=0)
         return base_pts
 
+    import scipy.ndimage as spim
+    if (seed is None) or isinstance(seed, np.random.Generator):
+        rng = seed
+    else:
+        rng = np.random.default_rng(seed)
+
     if len(domain_size) == 1:  # Spherical
         domain_size = np.array(domain_size)
         r = domain_size[0]
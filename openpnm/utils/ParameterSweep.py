@@ -0,0 +1,181 @@
+import pickle
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from openpnm.utils import Workspace, logging
+logger = logging.getLogger(__name__)
+ws = Workspace()
+# Templates and shared arrays attached in each worker process
+_worker = {}
+
+
+class ParameterSweep:
+    r"""
+    Runs a function on independent copies of a template Project for each of
+    a list of parameter sets, optionally distributed over a pool of
+    processes
+
+    Parameters
+    ----------
+    project : OpenPNM Project
+        The template project.  Each task receives its own copy, so changes
+        made by one task are not seen by the others.
+    func : callable
+        The function to run for each parameter set, called as
+        ``func(project, **params)``.  Whatever it returns is collected.  When
+        processes are used it must be picklable (i.e. defined at the top
+        level of a module), as must the models on the template project and
+        the returned values.
+    processes : int, optional
+        The number of worker processes.  The default is the number of
+        available processors.  If 1, the tasks are run one after the other
+        in the current process, which is useful for debugging.
+    seed : int, optional
+        The base seed from which an independent seed is derived for each
+        task, using ``numpy.random.SeedSequence``.  Numpy's global random
+        number generator is seeded with it before calling ``func``, so the
+        results are reproducible and do not depend on the number of
+        processes or the order in which the tasks are run.
+    shared : list of strings
+        The network arrays to place in shared memory rather than copying to
+        each task.  The default is ``['pore.coords', 'throat.conns']``.
+        These are read-only in the tasks, so any function modifying them
+        in-place will raise an error (assigning a new array is fine).
+
+    Notes
+    -----
+    The template is pickled once and sent to each worker when it starts,
+    rather than once per task.  Each worker then unpickles a fresh copy for
+    every task into its own Workspace and closes it when the task finishes.
+
+    Examples
+    --------
+    >>> import openpnm as op
+    >>> pn = op.network.Cubic(shape=[5, 5, 5])
+    >>> def porosity(project, seed_max):
+    ...     net = project.network
+    ...     geo = op.geometry.StickAndBall(network=net, pores=net.Ps,
+    ...                                    throats=net.Ts)
+    ...     geo.models['pore.seed']['num_range'] = [0, seed_max]
+    ...     geo.regenerate_models()
+    ...     return geo['pore.volume'].sum()
+    >>> sweep = op.utils.ParameterSweep(pn.project, porosity, processes=1,
+    ...                                 seed=0)
+    >>> vols = sweep.run([{'seed_max': 0.5}, {'seed_max': 1.0}])
+    >>> vols[0] < vols[1]
+    True
+
+    """
+
+    def __init__(self, project, func, processes=None, seed=None,
+                 shared=['pore.coords', 'throat.conns']):
+        self.project = project
+        self.func = func
+        self.processes = processes
+        self.seed = seed
+        self.shared = list(shared)
+
+    def seeds(self, n):
+        r"""
+        Returns the seeds used for the first ``n`` tasks
+        """
+        children = np.random.SeedSequence(self.seed).spawn(n)
+        return [int(c.generate_state(1)[0]) for c in children]
+
+    def run(self, params):
+        r"""
+        Runs the function for each of the given parameter sets
+
+        Parameters
+        ----------
+        params : list of dicts
+            The keyword arguments to pass to the function for each task
+
+        Returns
+        -------
+        results : list
+            The values returned by the function, in the same order as
+            ``params``
+
+        """
+        params = list(params)
+        seeds = self.seeds(len(params))
+        net = self.project.network
+        arrays = {k: dict.__getitem__(net, k) for k in self.shared
+                  if k in net.keys()}
+        # Pickle the template with empty placeholders for the shared arrays
+        for k, arr in arrays.items():
+            dict.__setitem__(net, k, np.empty((0, ) + arr.shape[1:], arr.dtype))
+        try:
+            template = pickle.dumps(list(self.project))
+        finally:
+            net.update(arrays)
+
+        if self.processes == 1:
+            _init_worker(template, arrays, self.project.name)
+            try:
+                return [_run_task(self.func, p, s)
+                        for p, s in zip(params, seeds)]
+            finally:
+                _worker.clear()
+
+        blocks, specs = [], {}
+        try:
+            from multiprocessing import shared_memory
+            for k, arr in arrays.items():
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(arr.nbytes, 1))
+                np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+                blocks.append(shm)
+                specs[k] = (shm.name, arr.shape, arr.dtype.str)
+        except ImportError:  # Python < 3.8, so copy the arrays instead
+            specs = arrays
+        try:
+            with ProcessPoolExecutor(max_workers=self.processes,
+                                     initializer=_init_worker,
+                                     initargs=(template, specs,
+                                               self.project.name)) as pool:
+                futures = [pool.submit(_run_task, self.func, p, s)
+                           for p, s in zip(params, seeds)]
+                results = [f.result() for f in futures]
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+        return results
+
+
+def _init_worker(template, arrays, name):
+    r"""
+    Stores the template and attaches the shared arrays in a worker process
+    """
+    _worker['template'] = template
+    _worker['name'] = name
+    _worker['arrays'] = {}
+    _worker['blocks'] = []
+    for k, spec in arrays.items():
+        if isinstance(spec, tuple):
+            from multiprocessing import shared_memory
+            shm = shared_memory.SharedMemory(name=spec[0])
+            arr = np.ndarray(spec[1], np.dtype(spec[2]), buffer=shm.buf)
+            _worker['blocks'].append(shm)
+        else:
+            arr = spec.view()
+        arr.flags.writeable = False
+        _worker['arrays'][k] = arr
+
+
+def _run_task(func, params, seed):
+    r"""
+    Runs a single task on a fresh copy of the template project
+    """
+    objs = pickle.loads(_worker['template'])
+    name = _worker['name'] if _worker['name'] not in ws.keys() else None
+    proj = ws.new_project(name=name)
+    for obj in objs:
+        proj.append(obj)
+    proj.network.update(_worker['arrays'])
+    np.random.seed(seed)
+    try:
+        return func(proj, **params)
+    finally:
+        ws.close_project(proj)
@@ -25,8 +25,11 @@ from .misc import tic, toc
 from .misc import is_symmetric
 from .misc import nbr_to_str
 from .misc import prettify_logger_message
+from .misc import AndersonMixer
+from .misc import locality
 from .Workspace import Workspace
 from .Project import Project
+from .ParameterSweep import ParameterSweep
 
 
 # You can add info to the logger message by inserting the desired %(item)
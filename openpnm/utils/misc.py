@@ -249,6 +249,109 @@ class HealthDict(PrintableDict):
     health = property(fget=_get_health)
 
 
+class AndersonMixer:
+    r"""
+    Accelerates a fixed point iteration :math:`x = G(x)` by extrapolating
+    from the history of previous iterates (Anderson mixing)
+
+    Parameters
+    ----------
+    depth : int
+        The number of previous iterates used to extrapolate.  If 0 the
+        iteration reduces to damped Picard.
+    beta : float (default = 1.0)
+        The damping factor applied to each step.  1.0 means no damping.
+    restart : float (default = 2.0)
+        If the norm of the residual :math:`G(x) - x` grows by more than this
+        factor from one iterate to the next, the history is discarded and a
+        damped Picard step is taken instead.
+
+    Notes
+    -----
+    Given the iterates :math:`x_k` and :math:`g_k = G(x_k)`, with residuals
+    :math:`f_k = g_k - x_k`, the next iterate is
+
+    .. math::
+
+        x_{k+1} = g_k - \Delta G \gamma - (1 - \beta)(f_k - \Delta F \gamma)
+
+    where :math:`\Delta F` and :math:`\Delta G` hold the differences of the
+    last ``depth`` residuals and iterates, and :math:`\gamma` minimizes
+    :math:`\|f_k - \Delta F \gamma\|` (Walker and Ni, 2011).  The
+    quantities should be scaled so that their entries are of similar
+    magnitude, since the least squares problem is not scale invariant.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from openpnm.utils import AndersonMixer
+    >>> mixer = AndersonMixer(depth=3)
+    >>> x = np.array([1.0])
+    >>> for i in range(8):
+    ...     x = mixer.update(x, np.cos(x))
+    >>> np.allclose(x, np.cos(x))
+    True
+
+    """
+
+    def __init__(self, depth=5, beta=1.0, restart=2.0):
+        self.depth = depth
+        self.beta = beta
+        self.restart = restart
+        self.reset()
+
+    def reset(self):
+        r"""
+        Discards the history of previous iterates
+        """
+        self._x = []
+        self._g = []
+        self._fnorm = None
+
+    def update(self, x, g):
+        r"""
+        Returns the next iterate given the current iterate and its image
+
+        Parameters
+        ----------
+        x : ndarray
+            The current iterate
+        g : ndarray
+            The result of applying the fixed point map to ``x``
+
+        Returns
+        -------
+        x_new : ndarray
+            The extrapolated next iterate
+
+        """
+        x = _np.array(x, dtype=float, copy=True)
+        g = _np.array(g, dtype=float, copy=True)
+        f = g - x
+        fnorm = _np.linalg.norm(f)
+        if (self._fnorm is not None) and (fnorm > self.restart*self._fnorm):
+            self.reset()
+        self._fnorm = fnorm
+        self._x.append(x)
+        self._g.append(g)
+        if len(self._x) > self.depth + 1:
+            self._x.pop(0)
+            self._g.pop(0)
+        if len(self._x) == 1:
+            return x + self.beta*f
+        X = _np.array(self._x).T
+        G = _np.array(self._g).T
+        F = G - X
+        dF = _np.diff(F, axis=1)
+        dG = _np.diff(G, axis=1)
+        gamma = _np.linalg.lstsq(dF, f, rcond=1e-10)[0]
+        x_new = (g - dG @ gamma) - (1 - self.beta)*(f - dF @ gamma)
+        if not _np.all(_np.isfinite(x_new)):
+            self.reset()
+            return x + self.beta*f
+        return x_new
+
+
 def tic():
     r"""
     Homemade version of matlab tic and toc function, tic starts or resets
@@ -475,6 +578,51 @@ def ignore_warnings(warning=RuntimeWarning):
     return _ignore_warning
 
 
+def locality(element):
+    r"""
+    Decorator declaring that a pore-scale model can be run on a subset of
+    the locations of its target.
+
+    Parameters
+    ----------
+    element : str
+        Either 'pore' or 'throat'.  A 'pore' model computes the value in
+        each pore from data in that pore only, while a 'throat' model
+        computes the value in each throat from data in that throat and the
+        two pores it connects.
+
+    Notes
+    -----
+    The model must accept a keyword argument named ``pores`` or ``throats``
+    (according to ``element``) with the indices of the locations on the
+    target, and return the values at those locations only.  When it is
+    ``None`` (the default) the values at all locations are returned.  This
+    allows ``regenerate_models`` to only update the locations affected by a
+    local change, see ``ModelsMixin.regenerate_models``.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from openpnm.utils.misc import locality
+    >>> @locality('pore')
+    ... def double(target, prop='pore.x', pores=None):
+    ...     if pores is None:
+    ...         pores = target.Ps
+    ...     return 2*target[prop][pores]
+    >>> double.locality
+    'pore'
+
+    """
+    if element not in ['pore', 'throat']:
+        raise Exception('element must be either \'pore\' or \'throat\'')
+
+    def _locality(function):
+        function.locality = element
+        return function
+
+    return _locality
+
+
 def is_symmetric(a, rtol=1e-10):
     r"""
     Is ``a`` a symmetric matrix?
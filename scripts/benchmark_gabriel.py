@@ -0,0 +1,44 @@
+r"""
+Times the Gabriel filtering of the edges of a Delaunay tessellation of
+random points, and the construction of a complete Gabriel network.
+
+Usage: python benchmark_gabriel.py [num_points [num_network_points]]
+"""
+import sys
+import time
+import numpy as np
+import scipy.spatial as sptl
+import openpnm as op
+from openpnm.network.Gabriel import _find_gabriel_throats
+
+
+def delaunay_edges(points):
+    tri = sptl.Delaunay(points)
+    indptr, indices = tri.vertex_neighbor_vertices
+    P1 = np.repeat(np.arange(points.shape[0]), np.diff(indptr))
+    conns = np.vstack((P1, indices)).T
+    return conns[conns[:, 0] < conns[:, 1]]
+
+
+if __name__ == '__main__':
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    M = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    np.random.seed(0)
+    points = np.random.rand(N, 3)
+    tic = time.perf_counter()
+    conns = delaunay_edges(points)
+    toc = time.perf_counter() - tic
+    print(f'Delaunay tessellation of {N} points: {toc:.1f} s, '
+          f'{conns.shape[0]} edges')
+    for workers in [1, -1]:
+        tic = time.perf_counter()
+        g = _find_gabriel_throats(points, conns, workers=workers)
+        toc = time.perf_counter() - tic
+        print(f'  Gabriel filter, workers={workers}: {toc:.1f} s, '
+              f'{np.sum(g)} edges kept')
+    np.random.seed(0)
+    tic = time.perf_counter()
+    gn = op.network.Gabriel(shape=[1, 1, 1], num_points=M)
+    toc = time.perf_counter() - tic
+    print(f'Gabriel network from {M} base points: {toc:.1f} s, '
+          f'{gn.Np} pores, {gn.Nt} throats')
@@ -0,0 +1,44 @@
+r"""
+Times importing OpenPNM, and a few typical first steps, in fresh interpreters
+and lists the heavy dependencies each of them ends up importing.
+
+Usage: python benchmark_import.py [repeats]
+"""
+import sys
+import subprocess
+import numpy as np
+
+statements = {
+    'import openpnm':
+        'import openpnm',
+    'Cubic network':
+        'import openpnm as op; op.network.Cubic(shape=[3, 3, 3])',
+    'Water on a Cubic network':
+        'import openpnm as op; pn = op.network.Cubic(shape=[3, 3, 3]); '
+        'op.phases.Water(network=pn)',
+    'all submodules':
+        'import openpnm as op; op.core, op.utils, op.network, op.geometry, '
+        'op.phases, op.physics, op.models, op.algorithms, op.materials, '
+        'op.topotools, op.io',
+}
+heavy = ['scipy.sparse', 'scipy.spatial', 'scipy.ndimage', 'scipy.io',
+         'h5py', 'json_tricks', 'pandas', 'networkx', 'sympy', 'matplotlib',
+         'numba', 'skimage']
+report = ('; import sys, time; print(time.perf_counter() - t0); '
+          f'print(" ".join(m for m in {heavy} if m in sys.modules))')
+
+
+def run(stmt):
+    code = 'import time; t0 = time.perf_counter(); ' + stmt + report
+    out = subprocess.run([sys.executable, '-c', code], check=True,
+                         capture_output=True, text=True).stdout.splitlines()
+    return float(out[0]), out[1] if len(out) > 1 else ''
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, stmt in statements.items():
+        run(stmt)  # Warm up the file system cache
+        times, modules = zip(*[run(stmt) for _ in range(repeats)])
+        print(f'{name}: {np.median(times)*1000:.0f} ms')
+        print(f'  imports: {modules[0] or "none of the above"}')
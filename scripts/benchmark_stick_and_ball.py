@@ -0,0 +1,39 @@
+r"""
+Compares the time taken to build a StickAndBall geometry in a single fused
+pass (the default) against running its models one after the other.
+
+Usage: python benchmark_stick_and_ball.py [Nx Ny Nz]
+"""
+import sys
+import time
+import numpy as np
+import openpnm as op
+
+
+def build(shape, fused):
+    ws = op.Workspace()
+    ws.clear()
+    pn = op.network.Cubic(shape=shape)
+    np.random.seed(0)
+    tic = time.perf_counter()
+    if fused:
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps,
+                                       throats=pn.Ts)
+    else:
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps,
+                                       throats=pn.Ts,
+                                       settings={'regen_mode': 'deferred'})
+        geo.regenerate_models()
+    toc = time.perf_counter() - tic
+    return toc, {k: geo[k].copy() for k in geo.props()}
+
+
+if __name__ == '__main__':
+    shape = [int(i) for i in sys.argv[1:4]] or [100, 100, 100]
+    print(f'StickAndBall on a {shape} Cubic network')
+    t_models, ref = build(shape, fused=False)
+    print(f'  model by model: {t_models:.2f} s')
+    t_fused, vals = build(shape, fused=True)
+    print(f'  fused:          {t_fused:.2f} s')
+    same = all(np.array_equal(vals[k], ref[k], equal_nan=True) for k in ref)
+    print(f'  identical results: {same}')
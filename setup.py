@@ -72,8 +72,8 @@ setup(
         'openpnm.materials',
     ],
     install_requires=[
-        'numpy>=1.15',
-        'scipy>=1.1',
+        'numpy>=1.17',
+        'scipy>=1.6',
         'scikit-image>=0.14',
         'networkx>=2',
         'h5py>=2.8',
@@ -98,7 +98,19 @@ class MixedPercolationCoopTest:
         ip.setup_coop_filling(inv_points=points)
         ip.set_inlets(pores=pn.pores('bottom'))
         ip.run()
-        assert np.any(~np.isnan(ip.tt_Pc.data[0]))
+        assert np.any(~np.isnan(ip.tt_Pc.getrow(0).data))
+        # A zero pressure is replaced by a small one in the menisci model
+        target_Pcs = []
+
+        def meniscus(target, target_Pc, **kwargs):
+            target_Pcs.append(target_Pc)
+            return op.models.physics.meniscus.purcell(target,
+                                                      target_Pc=target_Pc,
+                                                      **kwargs)
+        phys.models['throat.meniscus']['model'] = meniscus
+        ip.setup_coop_filling(inv_points=[0.0, 0.5*ip._max_pressure()])
+        assert 0.0 not in target_Pcs
+        assert 1e-6 in target_Pcs
 
 
 if __name__ == '__main__':
@@ -459,6 +459,24 @@ class MixedPercolationTest:
         # Single invasion point
         assert np.any(alg_data.S_pore < 1.0)
 
+    def test_many_cluster_merging(self):
+        self.setup_class(Np=10)
+        net = self.net
+        np.random.seed(0)
+        self.phys['throat.entry_pressure'] = np.random.random(net.Nt)
+        self.phys['pore.entry_pressure'] = np.random.random(net.Np)
+        IP_1 = mp(network=self.net)
+        IP_1.setup(phase=self.phase)
+        IP_1.set_inlets(clusters=[[i] for i in net.pores('left')])
+        IP_1.run()
+        assert np.all(IP_1['pore.invasion_sequence'] > -1)
+        assert np.all(IP_1['throat.invasion_sequence'] > -1)
+        seq = np.concatenate((IP_1['pore.invasion_sequence'],
+                              IP_1['throat.invasion_sequence']))
+        seq = seq[seq > 0]
+        assert np.all(np.unique(seq) == np.arange(1, seq.size + 1))
+        assert sum([len(q) for q in IP_1.queue]) == 0
+
 
 if __name__ == '__main__':
     t = MixedPercolationTest()
@@ -213,6 +213,30 @@ class MultiphysicsNernstPlanckSolverTest:
         y = np.around(self.phys['pore.charge_conservation.rate'], decimals=5)
         assert_allclose(actual=y, desired=x)
 
+    def _rerun(self, **settings):
+        # Start again from zero fields and return the converged fields
+        algs = [self.p, self.eA, self.eB]
+        x_ref = [alg[alg.settings['quantity']].copy() for alg in algs]
+        for alg in algs:
+            alg[alg.settings['quantity']] = np.zeros(alg.Np)
+            self.sw[alg.settings['quantity']] = np.zeros(alg.Np)
+        self.mnp.settings.update(settings)
+        self.mnp.run()
+        x = [alg[alg.settings['quantity']].copy() for alg in algs]
+        self.mnp.settings.update({'coupling': 'gummel', 'anderson_depth': 0})
+        return x_ref, x
+
+    def test_run_algs_anderson(self):
+        x_ref, x = self._rerun(anderson_depth=3)
+        for a, b in zip(x_ref, x):
+            assert_allclose(actual=b, desired=a, rtol=1e-5)
+
+    def test_run_algs_newton(self):
+        x_ref, x = self._rerun(coupling='newton')
+        for a, b in zip(x_ref, x):
+            assert_allclose(actual=b, desired=a, rtol=1e-5)
+
+
 if __name__ == '__main__':
     t = MultiphysicsNernstPlanckSolverTest()
     t.setup_class()
@@ -129,6 +129,19 @@ class ReactiveTransportTest:
         c_mean_relaxed = self.alg['pore.concentration'].mean()
         assert_allclose(c_mean_base, c_mean_relaxed, rtol=1e-6)
 
+    def test_anderson_acceleration_consistency_w_base_solution(self):
+        self.alg.reset(bcs=True, source_terms=True)
+        self.alg.set_source(pores=self.net.pores('bottom'), propname='pore.reaction')
+        self.alg.set_value_BC(pores=self.net.pores('top'), values=1.0)
+        self.alg.settings['relaxation_quantity'] = 1.0
+        self.alg.run()
+        c_mean_base = self.alg['pore.concentration'].mean()
+        self.alg.setup(anderson_depth=3)
+        self.alg.run()
+        self.alg.settings['anderson_depth'] = 0
+        c_mean_accelerated = self.alg['pore.concentration'].mean()
+        assert_allclose(c_mean_base, c_mean_accelerated, rtol=1e-6)
+
     def test_set_source_with_modes(self):
         self.alg.reset(bcs=True, source_terms=True)
         self.alg.set_source(pores=self.net.pores('left'),
@@ -168,6 +181,29 @@ class ReactiveTransportTest:
         c_mean_relaxed = self.alg['pore.concentration'].mean()
         assert_allclose(c_mean_base, c_mean_relaxed, rtol=1e-6)
 
+    def test_apply_sources_without_relaxation(self):
+        self.alg.reset(bcs=True, source_terms=True)
+        self.alg.set_source(pores=self.net.pores('bottom'), propname='pore.reaction')
+        self.alg.set_value_BC(pores=self.net.pores('top'), values=1.0)
+        self.alg.settings['relaxation_source'] = 0.5
+        self.alg.run()
+        S1_old = self.alg['pore._reaction.S1.old'].copy()
+        S1 = self.phase['pore.reaction.S1'].copy()
+        self.alg['pore.concentration'] *= 2
+        self.alg._update_iterative_props()
+        S1_new = self.phase['pore.reaction.S1'].copy()
+        self.alg._build_A()
+        self.alg._build_b()
+        self.alg._apply_BCs()
+        A = self.alg.A.diagonal().copy()
+        self.alg._apply_sources(relax=False)
+        Ps = self.net.pores('bottom')
+        assert_allclose(self.alg.A.diagonal()[Ps], A[Ps] - S1_new[Ps])
+        assert_allclose(self.alg['pore._reaction.S1.old'], S1_old)
+        assert_allclose(self.phase['pore.reaction.S1'], S1_new)
+        assert not (S1_new[Ps] == S1[Ps]).all()
+        self.alg.settings['relaxation_source'] = 1.0
+
     def test_solution_should_diverge_w_large_relaxation(self):
         self.alg.reset(bcs=True, source_terms=True)
         self.alg.setup(nlin_max_iter=25)
@@ -174,6 +174,19 @@ class TransientMultiphysicsNernstPlanckSolverTest:
         ]
         assert set(times).issubset(set(self.sw.keys()))
 
+    def test_run_algs_newton(self):
+        algs = [self.p, self.eA, self.eB]
+        x_ref = [alg[alg.settings['quantity']].copy() for alg in algs]
+        for alg in algs:
+            alg.set_IC(0)
+            self.sw[alg.settings['quantity']] = np.zeros(alg.Np)
+        self.mnp.settings['coupling'] = 'newton'
+        self.mnp.run()
+        self.mnp.settings['coupling'] = 'gummel'
+        for alg, x in zip(algs, x_ref):
+            y = alg[alg.settings['quantity']]
+            assert_allclose(actual=y, desired=x, rtol=1e-4)
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
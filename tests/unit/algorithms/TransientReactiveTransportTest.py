@@ -50,6 +50,17 @@ class TransientImplicitReactiveTransportTest:
         y = self.alg["pore.concentration"]
         nt.assert_allclose(y, x, rtol=1e-5)
 
+    def test_transient_reactive_transport_anderson(self):
+        self.alg.setup(t_scheme='implicit', anderson_depth=3)
+        self.alg.set_IC(0)
+        self.alg.run()
+        self.alg.settings['anderson_depth'] = 0
+        x = [2, 0.95029957, 0.41910096,
+             2, 0.95029957, 0.41910096,
+             2, 0.95029957, 0.41910096]
+        y = self.alg["pore.concentration"]
+        nt.assert_allclose(y, x, rtol=1e-5)
+
     def test_transient_cranknicolson_reactive_transport(self):
         self.alg.setup(t_scheme='cranknicolson')
         self.alg.run()
@@ -125,6 +136,33 @@ class TransientImplicitReactiveTransportTest:
         with pytest.raises(Exception):
             alg.run()
 
+    def test_output_sinks(self):
+        alg = op.algorithms.TransientReactiveTransport(network=self.net,
+                                                       phase=self.phase,
+                                                       settings=self.settings)
+        alg.setup(t_initial=0, t_final=1, t_step=0.1, t_output=0.2,
+                  t_scheme='implicit')
+        alg.set_value_BC(pores=self.net.pores('back'), values=2)
+        alg.set_IC(0)
+        alg.run()
+        expected = alg.results()
+        sink = op.algorithms.sinks.MemorySink(max_steps=2)
+        alg.set_output_sink(sink)
+        for k in [k for k in alg.keys() if '@' in k]:
+            del alg[k]
+        alg.run()
+        assert not any(['@' in k for k in alg.keys()])
+        assert sink.times(alg, 'pore.concentration') == ['8e-1', '1']
+        results = alg.results()
+        assert set(results.keys()) == set(["pore.concentration",
+                                           "pore.concentration@8e-1",
+                                           "pore.concentration@1"])
+        for k in results.keys():
+            nt.assert_allclose(results[k], expected[k])
+        results = alg.results(times=1)
+        nt.assert_allclose(results["pore.concentration@1"],
+                           expected["pore.concentration@1"])
+
     def teardown_class(self):
         ws = op.Workspace()
         ws.clear()
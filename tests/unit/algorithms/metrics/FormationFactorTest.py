@@ -47,6 +47,36 @@ class FormationFactorTest:
         val_2 = FF.results['x']
         np.testing.assert_allclose(val_1, val_2)
 
+    def test_run_tensor(self):
+        FF = op.algorithms.metrics.FormationFactor(network=self.net)
+        FF.run()
+        FF.run_tensor(directions={'xy': [1, 1, 0]})
+        F = FF.tensor
+        np.testing.assert_allclose(F, F.T, rtol=1e-8)
+        # Diagonal is close to the values with impermeable side faces
+        for i, ax in enumerate('xyz'):
+            np.testing.assert_allclose(F[i, i], FF.results[ax], rtol=0.1)
+        # Off-axis value follows from the tensor
+        e = np.array([1, 1, 0])/np.sqrt(2)
+        D = np.linalg.inv(F)
+        np.testing.assert_allclose(FF.results['xy'], 1/(e @ D @ e))
+        assert len(self.net.project.phases()) == 0
+
+    def test_run_tensor_2D(self):
+        net = op.network.Cubic(shape=[6, 6, 1])
+        geo = op.geometry.StickAndBall(network=net, pores=net.Ps,
+                                       throats=net.Ts)
+        FF = op.algorithms.metrics.FormationFactor(network=net)
+        FF.settings['inlets'] = {'x': 'left', 'y': 'front'}
+        FF.settings['outlets'] = {'x': 'right', 'y': 'back'}
+        FF.set_area(direction='x', area=6)
+        FF.set_length(direction='x', length=5)
+        FF.run_tensor()
+        assert np.all(np.isfinite(FF.tensor[:2, :2]))
+        assert np.all(np.isnan(FF.tensor[2]))
+        assert np.all(np.isnan(FF.tensor[:, 2]))
+        net.project.purge_object(geo)
+
 
 if __name__ == '__main__':
 
@@ -107,6 +107,36 @@ class RelativePermeabilityTest:
         nt.assert_allclose(kx, kz, rtol=1e-6)
         nt.assert_allclose(kx, kr, rtol=1e-6)
 
+    def test_reuse_assembly_matches_models(self):
+        results = []
+        for reuse in [False, True]:
+            rp = op.algorithms.metrics.RelativePermeability(network=self.net)
+            rp.setup(invading_phase=self.non_wet_phase.name,
+                     defending_phase=self.wet_phase.name,
+                     invasion_sequence='invasion_sequence')
+            rp.settings['reuse_assembly'] = reuse
+            rp.run(Snwp_num=10)
+            results.append(rp.get_Kr_data())
+        for key in ['sat', 'kr_wp', 'kr_nwp']:
+            for d in results[0][key].keys():
+                nt.assert_allclose(results[1][key][d], results[0][key][d],
+                                   rtol=1e-8)
+
+    def test_reuse_assembly_processes(self):
+        rp = op.algorithms.metrics.RelativePermeability(network=self.net)
+        rp.setup(invading_phase=self.non_wet_phase.name,
+                 defending_phase=self.wet_phase.name,
+                 invasion_sequence='invasion_sequence')
+        rp.run(Snwp_num=10)
+        serial = rp.get_Kr_data()
+        serial = {k: dict(serial[k]) for k in ['kr_wp', 'kr_nwp']}
+        rp.settings['processes'] = 2
+        rp.run(Snwp_num=10)
+        parallel = rp.get_Kr_data()
+        for key in ['kr_wp', 'kr_nwp']:
+            for d in serial[key].keys():
+                nt.assert_allclose(parallel[key][d], serial[key][d])
+
     def setup_2D_model(self, shape):
         self.net = op.network.Cubic(shape=shape, spacing=0.0005)
         self.geo = op.geometry.StickAndBall(network=self.net,
@@ -22,7 +22,7 @@ class ModelsTest:
         geo = op.geometry.StickAndBall(network=net, pores=net.Ps,
                                        throats=net.Ts)
         s = geo.models.__str__().split('\n')
-        assert len(s) == 69
+        assert len(s) == 70
         assert s.count('―'*85) == 15
 
     def test_regenerate_models(self):
@@ -193,6 +193,59 @@ class ModelsTest:
         _ = geo['pore.seed']
         assert len(geo) == 3
 
+    def test_regenerate_models_on_subset_of_locations(self):
+        net = op.network.Cubic(shape=[5, 5, 5])
+        Ps = net.pores('left')
+        Ts = net.find_neighbor_throats(pores=Ps, mode='xnor')
+        geo1 = op.geometry.StickAndBall(network=net, pores=Ps, throats=Ts)
+        geo2 = op.geometry.StickAndBall(network=net,
+                                        pores=net.pores('left', mode='not'),
+                                        throats=net.Ts[~net.tomask(throats=Ts)])
+        water = op.phases.Water(network=net)
+        phys1 = op.physics.Standard(network=net, phase=water, geometry=geo1)
+        phys2 = op.physics.Standard(network=net, phase=water, geometry=geo2)
+        props = ['throat.hydraulic_conductance',
+                 'throat.diffusive_conductance']
+        old = {k: water[k].copy() for k in props}
+        # Change the viscosity in a few pores then only update around them
+        pores = [0, 1, 30]
+        water['pore.viscosity'][pores] *= 2
+        water.regenerate_models(propnames=props, pores=pores)
+        Ts = net.find_neighbor_throats(pores=pores)
+        g = water['throat.hydraulic_conductance']
+        assert np.all(g[Ts] < old['throat.hydraulic_conductance'][Ts])
+        mask = ~net.tomask(throats=Ts)
+        assert np.all(g[mask] == old['throat.hydraulic_conductance'][mask])
+        # The result is the same as regenerating everywhere
+        new = {k: water[k].copy() for k in props}
+        for phys in [phys1, phys2]:
+            phys.regenerate_models(propnames=props)
+        for k in props:
+            assert np.allclose(water[k], new[k], rtol=1e-12)
+
+    def test_regenerate_models_on_subset_of_throats(self):
+        net = op.network.Cubic(shape=[4, 4, 4])
+        geo = op.geometry.StickAndBall(network=net, pores=net.Ps,
+                                       throats=net.Ts)
+        air = op.phases.Air(network=net)
+        phys = op.physics.GenericPhysics(network=net, phase=air,
+                                         geometry=geo)
+        phys.add_model(propname='throat.hydraulic_conductance',
+                       model=mods.physics.hydraulic_conductance.hagen_poiseuille)
+        assert 'throats' not in phys.models['throat.hydraulic_conductance']
+        # Models without a declared locality are run everywhere
+        phys.add_model(propname='throat.g_copy',
+                       model=mods.misc.scaled,
+                       prop='throat.hydraulic_conductance', factor=1.0)
+        g = phys['throat.hydraulic_conductance'].copy()
+        geo['throat.area'][[2, 5]] *= 2
+        phys.regenerate_models(throats=[2, 5])
+        assert np.all(phys['throat.hydraulic_conductance'][[2, 5]] > g[[2, 5]])
+        mask = ~net.tomask(throats=[2, 5])
+        assert np.all(phys['throat.hydraulic_conductance'][mask] == g[mask])
+        assert np.all(phys['throat.g_copy']
+                      == phys['throat.hydraulic_conductance'])
+
 
 if __name__ == '__main__':
 
@@ -0,0 +1,75 @@
+import openpnm as op
+import numpy as np
+
+
+class StickAndBallTest:
+
+    def setup_class(self):
+        self.net = op.network.Cubic(shape=[6, 6, 6])
+
+    def teardown_class(self):
+        ws = op.Workspace()
+        ws.clear()
+
+    def _check_same_as_models(self, geos):
+        np.random.seed(0)
+        for geo in geos:
+            vals = {k: geo[k].copy() for k in geo.props()}
+            geo.regenerate_models()
+            for k in vals:
+                assert np.array_equal(geo[k], vals[k], equal_nan=True)
+
+    def test_fused_same_as_models(self):
+        np.random.seed(0)
+        geo = op.geometry.StickAndBall(network=self.net, pores=self.net.Ps,
+                                       throats=self.net.Ts)
+        assert len(geo.props()) == 16
+        assert all([v['regen_mode'] == 'normal'
+                    for v in geo.models.values()])
+        self._check_same_as_models([geo])
+        self.net.project.purge_object(geo)
+
+    def test_fused_same_as_models_on_subdomains(self):
+        pn = op.network.CubicDual(shape=[5, 5, 5])
+        np.random.seed(0)
+        geo1 = op.geometry.StickAndBall(network=pn,
+                                        pores=pn.pores('primary'),
+                                        throats=pn.throats('primary'))
+        Ts = pn.throats(['secondary', 'interconnect'])
+        geo2 = op.geometry.StickAndBall(network=pn,
+                                        pores=pn.pores('secondary'),
+                                        throats=Ts)
+        self._check_same_as_models([geo1, geo2])
+
+    def test_fused_same_as_models_with_throat_centroids(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        C1, C2 = pn['pore.coords'][pn['throat.conns']].transpose(1, 0, 2)
+        np.random.seed(1)
+        pn['throat.centroid'] = (C1 + C2)/2 + 0.2*np.random.rand(pn.Nt, 3)
+        np.random.seed(0)
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps,
+                                       throats=pn.Ts)
+        self._check_same_as_models([geo])
+
+    def test_deferred_regen_mode(self):
+        geo = op.geometry.StickAndBall(network=self.net, pores=self.net.Ps,
+                                       throats=self.net.Ts,
+                                       settings={'regen_mode': 'deferred'})
+        assert 'pore.diameter' not in geo.keys()
+        assert geo.settings['regen_mode'] == 'deferred'
+        assert all([v['regen_mode'] == 'deferred'
+                    for v in geo.models.values()])
+        geo.regenerate_models()
+        assert 'throat.conduit_lengths.throat' in geo.keys()
+        self.net.project.purge_object(geo)
+
+
+if __name__ == '__main__':
+
+    t = StickAndBallTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print('running test: '+item)
+            t.__getattribute__(item)()
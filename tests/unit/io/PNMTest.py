@@ -1,6 +1,7 @@
 import py
 import os
 import shutil
+import pickle
 import pytest
 import numpy as np
 import openpnm as op
@@ -83,6 +84,73 @@ class PNMTest:
         shutil.rmtree(f, ignore_errors=True)
         os.remove("test4.pnm")
 
+    def test_save_and_reload_with_compression_options(self):
+        pn = op.network.Cubic(shape=[5, 5, 5])
+        pn['pore.random'] = np.random.rand(pn.Np)
+        pn['throat.random'] = np.random.rand(pn.Nt, 2)
+        options = [{'compression': None, 'chunks': False},
+                   {'compression': 'lzf'},
+                   {'compression': 'gzip', 'compression_opts': 9,
+                    'chunks': 7, 'num_workers': 2}]
+        for i, kwargs in enumerate(options):
+            f = f'test5_{i}.pnm'
+            op.io.PNM.save_project(project=pn.project, filename=f, **kwargs)
+            proj = op.io.PNM.load_project(f)
+            net = proj.network
+            assert np.all(net['pore.random'] == pn['pore.random'])
+            assert np.all(net['throat.random'] == pn['throat.random'])
+            assert np.all(net['throat.conns'] == pn['throat.conns'])
+            ws.close_project(proj)
+            os.remove(f)
+        with pytest.raises(Exception):
+            op.io.PNM.save_project(project=pn.project, filename='test5.pnm',
+                                   compression='gzip', chunks=False)
+
+    def test_lazy_and_partial_load(self):
+        f = 'test6.pnm'
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps, throats=pn.Ts)
+        air = op.phases.Air(network=pn)
+        op.io.PNM.save_project(project=pn.project, filename=f)
+        ws.clear()
+        proj = op.io.PNM.load_project(f, objects=[air.name], lazy=True)
+        assert set(proj.names) == set([pn.name, air.name])
+        net = proj.network
+        assert not isinstance(dict.get(net, 'pore.coords'), np.ndarray)
+        assert 'pore.coords' in net.props()
+        assert np.all(net['pore.coords'] == pn['pore.coords'])
+        assert isinstance(dict.get(net, 'pore.coords'), np.ndarray)
+        phase = proj.phases()[air.name]
+        assert np.all(phase['pore.viscosity'] == air['pore.viscosity'])
+        ws.clear()
+        proj = op.io.PNM.load_project(f, lazy=True)
+        g = proj.geometries()[geo.name]
+        assert np.all(g['pore.diameter'] == geo['pore.diameter'])
+        assert np.all(proj.network['throat.diameter'] == geo['throat.diameter'])
+        ws.clear()
+        os.remove(f)
+
+    def test_copy_and_pickle_lazy_project(self):
+        f = 'test7.pnm'
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps, throats=pn.Ts)
+        op.io.PNM.save_project(project=pn.project, filename=f)
+        ws.clear()
+        proj = op.io.PNM.load_project(f, lazy=True)
+        new = proj.copy()
+        net = new.network
+        assert isinstance(dict.get(net, 'pore.coords'), np.ndarray)
+        assert np.all(net['pore.coords'] == pn['pore.coords'])
+        g = new.geometries()[geo.name]
+        assert np.all(g['throat.length'] == geo['throat.length'])
+        assert not isinstance(dict.get(proj.network, 'pore.coords'),
+                              np.ndarray)
+        net = pickle.loads(pickle.dumps(proj.network))
+        assert isinstance(dict.get(net, 'pore.coords'), np.ndarray)
+        assert np.all(net['pore.coords'] == pn['pore.coords'])
+        ws.clear()
+        os.remove(f)
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
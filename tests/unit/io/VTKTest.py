@@ -100,6 +100,33 @@ class VTKTest:
         assert np.shape(net['throat.conns']) == (12, 2)
         assert len(project.phases()) == 1
 
+    def test_save_and_load_binary(self, tmpdir):
+        for encoding in ['base64', 'appended']:
+            fname = Path(tmpdir, f'test_save_vtk_{encoding}.vtp')
+            op.io.VTK.export_data(network=self.net, phases=self.phase_1,
+                                  filename=fname, encoding=encoding)
+            project = op.io.VTK.import_data(filename=fname)
+            assert len(project) == 2
+            net = project.network
+            assert np.all(net['pore.coords'] == self.net['pore.coords'])
+            assert np.all(net['throat.conns'] == self.net['throat.conns'])
+            phase = project.phases()[self.phase_1.name]
+            assert np.all(phase['throat.baz'] == self.phase_1['throat.baz'])
+            os.remove(fname)
+
+    def test_save_pieces(self, tmpdir):
+        fname = Path(tmpdir, 'test_save_vtk_3')
+        op.io.VTK.export_data(network=self.net, filename=fname,
+                              encoding='appended', pieces=2)
+        assert Path(tmpdir, 'test_save_vtk_3.pvtp').is_file()
+        Np, Nt = 0, 0
+        for i in range(2):
+            project = op.io.VTK.import_data(Path(tmpdir, f'test_save_vtk_3_{i}.vtp'))
+            Np += project.network.Np
+            Nt += project.network.Nt
+        assert Np >= self.net.Np
+        assert Nt == self.net.Nt
+
 
 if __name__ == '__main__':
     # All the tests in this file can be run with 'playing' this file
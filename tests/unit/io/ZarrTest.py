@@ -0,0 +1,98 @@
+import py
+import shutil
+import pytest
+import numpy as np
+import openpnm as op
+ws = op.Workspace()
+
+
+class ZarrTest:
+
+    def setup_class(self):
+        ws.settings['local_data'] = True
+
+    def teardown_class(self):
+        ws = op.Workspace()
+        ws.clear()
+
+    def test_save_and_reload(self):
+        f = 'test1.zarr'
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        geo = op.geometry.StickAndBall(network=pn, pores=pn.Ps, throats=pn.Ts)
+        pn['pore.random'] = np.random.rand(pn.Np)
+        op.io.Zarr.save_project(project=pn.project, filename=f)
+        ws.clear()
+        proj = op.io.Zarr.load_project(f)
+        net = proj.network
+        assert np.all(net['pore.random'] == pn['pore.random'])
+        assert np.all(net['throat.conns'] == pn['throat.conns'])
+        g = proj.geometries()[geo.name]
+        assert np.all(g['pore.diameter'] == geo['pore.diameter'])
+        del g['pore.diameter']
+        g.regenerate_models('pore.diameter')
+        assert np.all(g['pore.diameter'] == geo['pore.diameter'])
+        shutil.rmtree(f, ignore_errors=True)
+
+    def test_save_and_reload_object_arrays(self):
+        f = 'test4.zarr'
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        pn['pore.label_names'] = np.array(['a', 'b', 'c']*9)
+        pn['pore.objects'] = np.array([None, 1.0, 'c']*9, dtype=object)
+        op.io.Zarr.save_project(project=pn.project, filename=f)
+        ws.clear()
+        proj = op.io.Zarr.load_project(f)
+        net = proj.network
+        assert np.all(net['pore.label_names'] == pn['pore.label_names'])
+        assert list(net['pore.objects']) == list(pn['pore.objects'])
+        assert np.all(net['pore.coords'] == pn['pore.coords'])
+        shutil.rmtree(f, ignore_errors=True)
+
+    def test_save_and_append_transient_results(self):
+        f = 'test2.zarr'
+        pn = op.network.Cubic(shape=[3, 3, 3])
+        alg = op.algorithms.GenericAlgorithm(network=pn)
+        alg['pore.quantity@0'] = 0.0
+        alg['pore.quantity@1'] = 1.0
+        op.io.Zarr.save_project(project=pn.project, filename=f)
+        times = op.io.Zarr.load_times(f, alg, 'pore.quantity')
+        assert times == ['0', '1']
+        op.io.Zarr.append_time_step(f, alg, t='2',
+                                    data={'pore.quantity': np.ones(pn.Np)*2})
+        alg['pore.quantity@3'] = 3.0
+        op.io.Zarr.save_project(project=pn.project, filename=f, append=True)
+        times = op.io.Zarr.load_times(f, alg, 'pore.quantity')
+        assert times == ['0', '1', '2', '3']
+        ws.clear()
+        proj = op.io.Zarr.load_project(f, objects=[alg.name])
+        alg = proj.algorithms()[alg.name]
+        for t in range(4):
+            assert np.all(alg[f'pore.quantity@{t}'] == t)
+        shutil.rmtree(f, ignore_errors=True)
+
+    def test_zarr_sink(self):
+        f = 'test3.zarr'
+        pn = op.network.Cubic(shape=[3, 3, 1])
+        alg = op.algorithms.GenericAlgorithm(network=pn)
+        sink = op.algorithms.sinks.ZarrSink(f)
+        for t in ['0', '5e-1', '1']:
+            sink.write(alg, 'pore.quantity', t, np.ones(pn.Np)*float(t))
+        assert sink.times(alg, 'pore.quantity') == ['0', '5e-1', '1']
+        assert np.all(sink.read(alg, 'pore.quantity', '5e-1') == 0.5)
+        with pytest.raises(KeyError):
+            sink.read(alg, 'pore.quantity', '2')
+        assert sink.times(alg, 'pore.other') == []
+        shutil.rmtree(f, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    # All the tests in this file can be run with 'playing' this file
+    t = ZarrTest()
+    self = t  # For interacting with the tests at the command line
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print(f'Running test: {item}')
+            try:
+                t.__getattribute__(item)()
+            except TypeError:
+                t.__getattribute__(item)(tmpdir=py.path.local())
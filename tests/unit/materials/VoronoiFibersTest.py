@@ -116,6 +116,101 @@ class VoronoiTest:
         assert del_geom.vertex_dimension(B1, B2, 'volume') == 8.0
         assert del_geom.vertex_dimension(B1, B2, 'length') == 2.0
 
+    def test_chunked_fiber_image(self):
+        geoms = []
+        for name, budget in [('test5', None), ('test6', 2e6)]:
+            np.random.seed(0)
+            prj = VoronoiFibers(num_points=20,
+                                fiber_rad=3e-6,
+                                resolution=1e-6,
+                                shape=[1e-4, 8e-5, 6e-5],
+                                memory_budget=budget,
+                                workers=2,
+                                name=name)
+            geoms.append(prj.geometries()[name + '_del'])
+        assert isinstance(geoms[1]._fiber_image, np.memmap)
+        assert np.array_equal(geoms[0]._fiber_image, geoms[1]._fiber_image)
+        assert np.array_equal(geoms[0]._dt_image, geoms[1]._dt_image)
+        assert np.allclose(geoms[0]['pore.indiameter'],
+                           geoms[1]['pore.indiameter'])
+
+    def test_eroded_facets(self):
+        from openpnm.materials.VoronoiFibers import _get_facet_kernel
+        kernel = _get_facet_kernel()
+        # A square with a repeated vertex and a 3-4-5 right triangle, given
+        # out of order
+        pts = np.array([[0, 0], [10, 10], [10, 0], [0, 10], [10, 0],
+                        [4, 0], [0, 0], [0, 3]], dtype=float)
+        indptr = np.array([0, 5, 8])
+        area, perim, cen, inrad, incen, off, num = kernel(pts, indptr, 0.5)
+        assert np.allclose(area, [81, 1.5])
+        assert np.allclose(perim, [36, 6])
+        assert np.allclose(cen, [[5, 5], [7/6, 1]])
+        assert np.allclose(inrad, [4.5, 0.5])
+        assert np.allclose(incen, [[5, 5], [1, 1]])
+        assert np.all(num == [4, 3])
+        assert np.allclose(np.sort(off[:4], axis=0),
+                           [[0.5, 0.5], [0.5, 0.5], [9.5, 9.5], [9.5, 9.5]])
+        # The triangle's incircle has a radius of 1 so it is fully eroded
+        area, perim, cen, inrad, incen, off, num = kernel(pts, indptr, 1.0)
+        assert np.allclose(area, [64, 0])
+        assert np.all(num == [4, 0])
+
+    def test_eroded_facets_against_images(self):
+        from openpnm.materials.VoronoiFibers import (_get_facet_kernel,
+                                                     _rotations_to_z)
+        kernel = _get_facet_kernel()
+        np.random.seed(0)
+        prj = VoronoiFibers(num_points=20,
+                            fiber_rad=3e-6,
+                            resolution=1e-6,
+                            shape=[1e-4, 8e-5, 6e-5],
+                            name='test7')
+        geom = prj.geometries()['test7_del']
+        R = _rotations_to_z(geom['throat.normal'])
+        exact = []
+        images = []
+        for i in range(geom.Nt):
+            pts = (geom['throat.vertices'][i] @ R[i].T)[:, :2]
+            props = kernel(np.ascontiguousarray(pts),
+                           np.array([0, len(pts)]), 3e-6)
+            exact.append([props[0][0], props[1][0], props[3][0]])
+            images.append(_eroded_facet_image(pts, 3e-6))
+        exact = np.array(exact)
+        images = np.array(images)
+        # Both agree on which facets are fully occluded
+        assert np.all((exact[:, 0] > 0) == (images[:, 0] > 0))
+        # The images overestimate the area, perimeter and inradius by a few
+        # pixels along the boundary, which matters most on nearly occluded
+        # facets, so only those with an inradius over twice the fiber
+        # radius are compared
+        Ts = exact[:, 2] > 6e-6
+        assert np.sum(Ts) > 20
+        diff = np.abs(exact[Ts] / images[Ts] - 1)
+        assert np.all(diff < [0.08, 0.1, 0.05])
+        assert np.all(np.median(diff, axis=0) < [0.04, 0.06, 0.02])
+
+
+def _eroded_facet_image(pts, r, res=200):
+    r"""
+    Returns the area, perimeter and inradius of a 2D convex facet eroded by
+    ``r``, found from an image of the facet as VoronoiFibers used to do
+    """
+    from scipy import ndimage
+    from skimage.measure import regionprops
+    from skimage.morphology import convex_hull_image
+    pts = pts - pts.min(axis=0)
+    f = res / pts.max()
+    ind = np.around(pts * f).astype(int)
+    img = np.zeros(ind.max(axis=0) + 3)
+    img[ind[:, 0] + 1, ind[:, 1] + 1] = 1
+    eroded = ndimage.distance_transform_edt(convex_hull_image(img)) > r * f
+    if np.sum(eroded) < 3:
+        return 0, 0, 0
+    props = regionprops(eroded.astype(int))[0]
+    inradius = ndimage.distance_transform_edt(eroded).max()
+    return props.area / f**2, props.perimeter / f, inradius / f
+
 
 if __name__ == '__main__':
 
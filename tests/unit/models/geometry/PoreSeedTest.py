@@ -38,6 +38,36 @@ class PoreSeedTest:
         assert np.amin(self.geo['pore.seed'] > 0)
         assert np.amax(self.geo['pore.seed'] < 1)
 
+    def test_correlated_field(self):
+        pn = op.network.Voronoi(num_points=1000, shape=[1, 1, 1])
+        geo = op.geometry.GenericGeometry(network=pn, pores=pn.Ps,
+                                          throats=pn.Ts)
+        geo.add_model(propname='pore.seed',
+                      model=mods.correlated_field,
+                      length=0.2, seed=0)
+        seeds = geo['pore.seed']
+        assert np.all((seeds > 0) * (seeds < 1))
+        P12 = pn['throat.conns']
+        r_corr = np.corrcoef(seeds[P12[:, 0]], seeds[P12[:, 1]])[0, 1]
+        geo.models['pore.seed']['length'] = 0
+        geo.regenerate_models()
+        seeds = geo['pore.seed']
+        r_rand = np.corrcoef(seeds[P12[:, 0]], seeds[P12[:, 1]])[0, 1]
+        assert r_corr > 0.8
+        assert abs(r_rand) < 0.2
+        # The same seed gives the same field
+        geo.models['pore.seed']['length'] = [0.2, 0.2, 0]
+        geo.regenerate_models()
+        seeds = geo['pore.seed'].copy()
+        geo.regenerate_models()
+        assert np.all(geo['pore.seed'] == seeds)
+
+    def test_correlated_field_2D(self):
+        pn = op.network.Cubic(shape=[20, 20, 1])
+        vals = mods.correlated_field(target=pn, length=4, seed=0)
+        P12 = pn['throat.conns']
+        assert np.corrcoef(vals[P12[:, 0]], vals[P12[:, 1]])[0, 1] > 0.8
+
 
 if __name__ == '__main__':
 
@@ -54,6 +54,29 @@ class PoreSizeTest:
         geo.regenerate_models()
         assert dmin <= np.amin(geo['pore.diameter'])
 
+    def test_largest_sphere_converged(self):
+        net = op.network.Cubic(shape=[5, 5, 5])
+        np.random.seed(0)
+        net['pore.coords'] += np.random.rand(net.Np, 3)*0.4
+        geo = op.geometry.GenericGeometry(network=net, pores=net.Ps,
+                                          throats=net.Ts)
+        geo.add_model(propname='pore.diameter',
+                      model=mods.largest_sphere,
+                      iters=None)
+        D = geo['pore.diameter']
+        # Every pore touches its nearest neighbor
+        L = np.linalg.norm(np.diff(net['pore.coords'][net.conns], axis=1),
+                           axis=2).flatten()
+        gap = L - D[net.conns].sum(axis=1)/2
+        nearest = np.full(net.Np, np.inf)
+        np.minimum.at(nearest, net.conns.flatten(), np.repeat(gap, 2))
+        assert np.allclose(nearest, 0, atol=1e-12)
+        # A looser tolerance stops sooner but close to the same answer
+        geo.models['pore.diameter']['tol'] = 1e-3
+        geo.regenerate_models()
+        assert np.all(geo['pore.diameter'] <= D)
+        assert np.allclose(geo['pore.diameter'], D, rtol=1e-2)
+
     def test_largest_sphere_multiple_geometries(self):
         net = op.network.Cubic(shape=[5, 5, 5], spacing=[5, 5, 5])
         net['pore.coords'][net.pores('top')] += [0, 0, -3.0]
@@ -1,4 +1,6 @@
+import warnings
 import numpy as np
+import pytest
 import openpnm as op
 import openpnm.models.misc as mods
 from numpy.testing import assert_approx_equal, assert_array_almost_equal_nulp
@@ -216,6 +218,60 @@ class MiscTest:
                                               0.48484848, 0.54545455,
                                               0.57575758, 0.63636364]))
 
+    def test_neighbor_lookups_sum_and_empty(self):
+        net = op.network.Cubic(shape=[3, 1, 1])
+        net['throat.values'] = [1.0, np.nan]
+        net['pore.values'] = [1.0, np.nan, np.nan]
+        f = mods.from_neighbor_throats
+        vals = f(target=net, prop='throat.values', mode='sum')
+        assert np.allclose(vals, [1, 1, np.nan], equal_nan=True)
+        vals = f(target=net, prop='throat.values', mode='min',
+                 ignore_nans=False)
+        assert np.allclose(vals, [1, np.nan, np.nan], equal_nan=True)
+        # The source data is left untouched
+        assert np.isnan(net['throat.values'][1])
+        f = mods.from_neighbor_pores
+        vals = f(target=net, prop='pore.values', mode='max')
+        assert np.allclose(vals, [1, np.nan], equal_nan=True)
+        with pytest.raises(Exception):
+            f(target=net, prop='pore.values', mode='median')
+
+    def test_neighbor_lookups_vector_values(self):
+        net = op.network.Cubic(shape=[4, 3, 2])
+        geo = op.geometry.GenericGeometry(network=net, pores=net.Ps,
+                                          throats=net.Ts)
+        np.random.seed(0)
+        vec = np.random.rand(net.Np, 3)
+        vec[0] = np.nan
+        vec[1, 0] = np.nan
+        geo['pore.vec'] = vec
+        P12 = net['throat.conns']
+        for mode, func in [('min', np.nanmin), ('max', np.nanmax),
+                           ('mean', np.nanmean)]:
+            vals = mods.from_neighbor_pores(target=geo, prop='pore.vec',
+                                            mode=mode)
+            assert vals.shape == (net.Nt, 3)
+            with warnings.catch_warnings():  # All-nan slices
+                warnings.simplefilter('ignore')
+                desired = func(vec[P12], axis=1)
+            assert np.allclose(vals, desired, equal_nan=True)
+        vals = mods.from_neighbor_pores(target=geo, prop='pore.vec',
+                                        ignore_nans=False)
+        assert np.allclose(vals, np.amin(vec[P12], axis=1), equal_nan=True)
+        # Throats between pores 0 and 1 only have nans in the first column
+        T = net.find_connecting_throat(0, 1)[0]
+        assert np.isnan(vals[T]).all()
+        vals = mods.from_neighbor_pores(target=geo, prop='pore.vec')
+        assert np.isnan(vals[T, 0]) and not np.isnan(vals[T, 1:]).any()
+        coords = net.interpolate_data('pore.coords')
+        assert coords.shape == (net.Nt, 3)
+        assert np.allclose(coords, net['pore.coords'][P12].mean(axis=1))
+        geo['throat.vec'] = np.random.rand(net.Nt, 2)
+        vals = geo.interpolate_data('throat.vec')
+        assert vals.shape == (net.Np, 2)
+        Ts = net.find_neighbor_throats(pores=5)
+        assert np.allclose(vals[5], geo['throat.vec'][Ts].mean(axis=0))
+
     def test_from_neighbor_pores_min(self):
         self.geo.remove_model('throat.seed')
         self.geo['pore.seed'] = np.random.rand(self.net.Np,)
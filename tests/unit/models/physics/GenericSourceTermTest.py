@@ -1,4 +1,5 @@
 import collections
+import pytest
 import numpy as np
 import openpnm as op
 import openpnm.models.physics as pm
@@ -320,6 +321,30 @@ class GenericSourceTermTest:
         assert np.allclose(phys['pore.source1.S1'], phys['pore.general.S1'])
         assert np.allclose(phys['pore.source1.S2'], phys['pore.general.S2'])
 
+    def test_general_symbolic_is_compiled_once(self):
+        u, v, x = symbols('u,v,x')
+        phys = self.phys
+        phys['pore.item1'] = 2.0
+        phys['pore.item2'] = 3.0
+        arg_map = {'u': 'pore.item1', 'v': 'pore.item2',
+                   'x': 'pore.mole_fraction'}
+        n = len(pm.source_terms._kernels)
+        vals1 = pm.source_terms.general_symbolic(target=phys, eqn=u*x + v,
+                                                 arg_map=arg_map)
+        assert len(pm.source_terms._kernels) == n + 1
+        # An equal expression built anew reuses the compiled functions
+        u, v, x = symbols('u,v,x')
+        vals2 = pm.source_terms.general_symbolic(target=phys, eqn=u*x + v,
+                                                 arg_map=arg_map)
+        assert len(pm.source_terms._kernels) == n + 1
+        assert np.allclose(vals1['rate'], vals2['rate'])
+        assert np.allclose(vals1['S1'], 2.0)
+        assert np.allclose(vals1['S2'], 3.0)
+        with pytest.raises(Exception):
+            pm.source_terms.general_symbolic(target=phys, eqn=u*x + v,
+                                             arg_map={'u': 'pore.item1',
+                                                      'x': 'pore.item2'})
+
     def test_butler_volmer_kinetics(self):
         np.random.seed(10)
         self.net["pore.reaction_area"] = np.random.rand(self.net.Np)
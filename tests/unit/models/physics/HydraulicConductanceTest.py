@@ -81,6 +81,34 @@ class HydraulicConductanceTest:
         desired = 7216.8783  # This is what it gets now
         assert_allclose(actual, desired=desired)
 
+    def test_conduit_data_shared_between_models(self):
+        net = op.network.Cubic(shape=[4, 4, 4])
+        Ps = net.pores('left')
+        Ts = net.find_neighbor_throats(pores=Ps, mode='xnor')
+        geo1 = op.geometry.StickAndBall(network=net, pores=Ps, throats=Ts)
+        geo2 = op.geometry.StickAndBall(network=net,
+                                        pores=net.pores('left', mode='not'),
+                                        throats=net.Ts[~net.tomask(throats=Ts)])
+        water = op.phases.Water(network=net)
+        phys1 = op.physics.Standard(network=net, phase=water, geometry=geo1)
+        op.physics.Standard(network=net, phase=water, geometry=geo2)
+        from openpnm.models.physics import _utils as utils
+        assert _np.all(utils._get_throats(phys1)
+                       == net.map_throats(throats=phys1.Ts, origin=phys1))
+        mods = op.models.physics
+        g_h = mods.hydraulic_conductance.hagen_poiseuille(phys1)
+        g_d = mods.diffusive_conductance.mixed_diffusion(phys1)
+        g_t = mods.thermal_conductance.series_resistors(phys1)
+        phys1.regenerate_models()
+        assert_allclose(phys1['throat.hydraulic_conductance'], g_h,
+                        rtol=1e-12)
+        assert_allclose(phys1['throat.diffusive_conductance'], g_d,
+                        rtol=1e-12)
+        assert_allclose(phys1['throat.thermal_conductance'], g_t,
+                        rtol=1e-12)
+        assert utils._shared['depth'] == 0
+        assert utils._shared['data'] == {}
+
 
 if __name__ == '__main__':
 
@@ -30,6 +30,15 @@ class DelaunayGabrielTest:
         assert dn.num_pores(['internal', 'surface'], mode='union') == 50
         assert gn.num_pores('boundary') == 24
 
+    def test_gabriel_independent_of_units(self):
+        np.random.seed(0)
+        pts = op.topotools.generate_base_points(num_points=50,
+                                                domain_size=[1, 1, 0])
+        gn1 = op.network.Gabriel(shape=[1, 1, 0], points=pts)
+        gn2 = op.network.Gabriel(shape=[1e-4, 1e-4, 0], points=pts*1e-4)
+        assert gn1.Nt == gn2.Nt
+        assert np.all(gn1['throat.conns'] == gn2['throat.conns'])
+
     def test_add_boundary_pores(self):
         np.random.seed(0)
         dn = op.network.Delaunay(shape=[1, 1, 1], num_points=50)
@@ -0,0 +1,71 @@
+import numpy as np
+import openpnm as op
+
+
+class DelaunayVoronoiDualTest:
+
+    def setup_class(self):
+        np.random.seed(0)
+        self.net = op.network.DelaunayVoronoiDual(num_points=100,
+                                                  shape=[1, 1, 1])
+
+    def teardown_class(self):
+        ws = op.Workspace()
+        ws.clear()
+
+    def test_labels(self):
+        net = self.net
+        assert net.num_pores(['delaunay', 'voronoi'], mode='xor') == net.Np
+        Ts = net.throats(['delaunay', 'voronoi', 'interconnect'], mode='xor')
+        assert Ts.size == net.Nt
+        assert net['throat.conns'].dtype == np.int32
+        P12 = net['throat.conns'][net.throats('interconnect')]
+        assert np.all(np.sum(net['pore.delaunay'][P12], axis=1) == 1)
+
+    def test_boundary_pores_on_faces(self):
+        net = self.net
+        Ps = net.pores(['boundary', 'delaunay'], mode='and')
+        coords = net['pore.coords'][Ps]
+        on_face = np.any(np.isclose(coords, 0) + np.isclose(coords, 1),
+                         axis=1)
+        assert np.all(on_face)
+
+    def test_find_throat_facets(self):
+        net = self.net
+        Ts = net.throats('delaunay')[:20]
+        facets = net.find_throat_facets(throats=Ts)
+        assert facets.shape[0] == 20
+        for t, facet in zip(Ts, facets):
+            P1, P2 = net['throat.conns'][t]
+            N1 = set(net.find_neighbor_pores(P1)).intersection(
+                net.pores('voronoi'))
+            N2 = set(net.find_neighbor_pores(P2))
+            assert list(facet) == sorted(N1.intersection(N2))
+
+    def test_find_throat_facets_2D(self):
+        np.random.seed(0)
+        net = op.network.DelaunayVoronoiDual(num_points=30, shape=[1, 1, 0])
+        Ts = net.throats('delaunay')
+        facets = net.find_throat_facets()
+        # Every facet in 2D is a pair of Voronoi nodes
+        assert facets.shape == (Ts.size, 2)
+        assert np.all(net['pore.voronoi'][facets.astype(int)])
+
+    def test_find_pore_hulls(self):
+        net = self.net
+        Ps = net.pores('delaunay')[:20]
+        hulls = net.find_pore_hulls(pores=Ps)
+        for p, hull in zip(Ps, hulls):
+            Ns = net.find_neighbor_pores(p)
+            assert hull == Ns[net['pore.voronoi'][Ns]].tolist()
+
+
+if __name__ == '__main__':
+
+    t = DelaunayVoronoiDualTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print('running test: '+item)
+            t.__getattribute__(item)()
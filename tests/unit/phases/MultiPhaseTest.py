@@ -1,3 +1,4 @@
+import os
 import pytest
 import numpy as np
 from numpy.testing import assert_allclose
@@ -278,6 +279,95 @@ class MultiPhaseTest:
         K_actual = m._assemble_partition_coef_global()
         assert_allclose(K_actual, [1., 1/0.7, 1., 1.1, 1])
 
+    def test_multiphase_mixture_values_are_updated(self):
+        m = op.phases.MultiPhase(network=self.net,
+                                 phases=[self.water, self.air])
+        self.water['pore.temperature'] = 300.
+        self.air['pore.temperature'] = 200.
+        Ps = self.net['pore.coords'][:, 0] < 3
+        Ts = self.net.tomask(throats=self.net.find_neighbor_throats(Ps))
+        m.set_occupancy(phase=self.water, Pvals=Ps, Tvals=Ts)
+        m.set_occupancy(phase=self.air, Pvals=~Ps, Tvals=~Ts)
+        T = m['pore.temperature']
+        assert_allclose(T, np.where(Ps, 300., 200.))
+        # Changing the returned array does not affect the mixture
+        T[:] = 0.
+        assert_allclose(m['pore.temperature'], np.where(Ps, 300., 200.))
+        # Occupancy changed on a few pores
+        pores = [0, 5, 999]
+        m.set_occupancy(phase=self.water, pores=pores, Pvals=0.25)
+        m.set_occupancy(phase=self.air, pores=pores, Pvals=0.75)
+        desired = np.where(Ps, 300., 200.)
+        desired[pores] = 225.
+        assert_allclose(m['pore.temperature'], desired)
+        assert_allclose(m['pore.occupancy.all'], 1.)
+        # The property of a phase is replaced
+        self.air['pore.temperature'] = 100.
+        desired = np.where(Ps, 300., 100.)
+        desired[pores] = 150.
+        assert_allclose(m['pore.temperature'], desired)
+        # Occupancies that don't add up to one are still caught
+        m.set_occupancy(phase=self.air, pores=[3], Pvals=0.5)
+        with pytest.raises(Exception):
+            m['pore.temperature']
+
+    def test_multiphase_in_place_changes(self):
+        pn = op.network.Cubic(shape=[4, 4, 4])
+        water = op.phases.Water(network=pn)
+        air = op.phases.Air(network=pn)
+        water['pore.diffusivity'] = 1.0
+        air['pore.diffusivity'] = 3.0
+        m = op.phases.MultiPhase(network=pn, phases=[water, air])
+        m.set_occupancy(phase=water, Pvals=1.0, Tvals=1.0)
+        m.set_occupancy(phase=air, Pvals=0.0, Tvals=0.0)
+        assert_allclose(m['pore.diffusivity'], 1.0)
+        # Component values changed in place
+        water['pore.diffusivity'] *= 2
+        assert_allclose(m['pore.diffusivity'], 2.0)
+        water['pore.diffusivity'][:] = 5.0
+        assert_allclose(m['pore.diffusivity'], 5.0)
+        # Occupancies changed in place
+        m['pore.occupancy.' + water.name][[0, 1]] = 0.5
+        m['pore.occupancy.' + air.name][[0, 1]] = 0.5
+        desired = np.full(pn.Np, 5.0)
+        desired[[0, 1]] = 4.0
+        assert_allclose(m['pore.diffusivity'], desired)
+        # Assigning new arrays
+        occ = np.ones(pn.Np)
+        occ[[0, 1]] = 0.
+        m['pore.occupancy.' + water.name] = occ
+        m['pore.occupancy.' + air.name] = 1 - occ
+        desired = np.full(pn.Np, 5.0)
+        desired[[0, 1]] = 3.0
+        assert_allclose(m['pore.diffusivity'], desired)
+        # Copies are independent
+        proj = pn.project.copy()
+        m2 = proj[m.name]
+        assert_allclose(m2['pore.diffusivity'], desired)
+        m2['pore.occupancy.' + water.name][3] = 0.
+        m2['pore.occupancy.' + air.name][3] = 1.
+        assert_allclose(m['pore.diffusivity'], desired)
+        desired[3] = 3.0
+        assert_allclose(m2['pore.diffusivity'], desired)
+
+    def test_multiphase_save_and_load(self):
+        pn = op.network.Cubic(shape=[4, 4, 4])
+        water = op.phases.Water(network=pn)
+        air = op.phases.Air(network=pn)
+        m = op.phases.MultiPhase(network=pn, phases=[water, air])
+        m.set_occupancy(phase=water, Pvals=1.0, Tvals=1.0)
+        f = 'multiphase.pnm'
+        op.io.PNM.save_project(project=pn.project, filename=f)
+        proj = op.io.PNM.load_project(f)
+        m2 = proj[m.name]
+        assert_allclose(m2['pore.viscosity'], water['pore.viscosity'])
+        m2['pore.occupancy.' + water.name][0] = 0.
+        m2['pore.occupancy.' + air.name][0] = 1.
+        desired = np.copy(water['pore.viscosity'])
+        desired[0] = air['pore.viscosity'][0]
+        assert_allclose(m2['pore.viscosity'], desired)
+        os.remove(f)
+
 
 if __name__ == '__main__':
 
@@ -476,6 +476,29 @@ class TopotoolsTest:
         alg.run()
         assert np.ptp(alg['pore.concentration']) == 0.5
 
+    def test_generate_base_points_with_density_map(self):
+        prob = np.zeros([10, 10, 10])
+        prob[:5, ...] = 1.0
+        prob[5:, ...] = 0.5
+        pts = topotools.generate_base_points(num_points=20000,
+                                             domain_size=[1, 1, 1],
+                                             density_map=prob,
+                                             reflect=False, seed=0)
+        assert pts.shape == (20000, 3)
+        assert np.all((pts >= 0) * (pts < 1))
+        frac = np.mean(pts[:, 0] < 0.5)
+        assert np.isclose(frac, 2/3, atol=0.02)
+        rng = np.random.default_rng(0)
+        pts2 = topotools.generate_base_points(num_points=20000,
+                                              domain_size=[1, 1, 1],
+                                              density_map=prob,
+                                              reflect=False, seed=rng)
+        assert np.all(pts == pts2)
+        with pytest.raises(Exception):
+            topotools.generate_base_points(num_points=10,
+                                           domain_size=[1, 1, 1],
+                                           density_map=prob*0)
+
 
 if __name__ == '__main__':
 
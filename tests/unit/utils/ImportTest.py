@@ -0,0 +1,58 @@
+import sys
+import subprocess
+import pytest
+import openpnm as op
+
+
+class ImportTest:
+
+    def setup_class(self):
+        pass
+
+    def teardown_class(self):
+        pass
+
+    def _run(self, code):
+        out = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True)
+        return out.stdout.split()
+
+    def test_import_is_lazy(self):
+        code = ('import sys, openpnm; '
+                'print(" ".join(m for m in sys.modules '
+                'if m.startswith("openpnm.")))')
+        loaded = self._run(code)
+        assert loaded == ['openpnm.__version__']
+
+    def test_heavy_dependencies_not_imported(self):
+        heavy = ['scipy.ndimage', 'scipy.io', 'h5py', 'json_tricks', 'pandas',
+                 'networkx', 'sympy', 'matplotlib']
+        code = ('import sys, openpnm as op; '
+                'pn = op.network.Cubic(shape=[3, 3, 3]); '
+                'op.phases.Water(network=pn); op.io; '
+                f'print(" ".join(m for m in {heavy} if m in sys.modules))')
+        assert self._run(code) == []
+
+    def test_submodules_and_utils_attributes(self):
+        for name in ['core', 'utils', 'network', 'geometry', 'phases',
+                     'physics', 'models', 'algorithms', 'materials',
+                     'topotools', 'io']:
+            assert getattr(op, name) is sys.modules['openpnm.' + name]
+            assert name in dir(op)
+        assert op.Workspace is op.utils.Workspace
+        assert op.Project is op.utils.Project
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            op.not_a_submodule
+
+
+if __name__ == '__main__':
+
+    t = ImportTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print('running test: '+item)
+            t.__getattribute__(item)()
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import openpnm as op
+
+
+def mean_seed(project, high):
+    net = project.network
+    geo = op.geometry.GenericGeometry(network=net, pores=net.Ps,
+                                      throats=net.Ts)
+    geo.add_model(propname='pore.seed', model=op.models.misc.random,
+                  element='pore', num_range=[0, high])
+    return geo['pore.seed'].mean()
+
+
+def modify_coords(project):
+    project.network['pore.coords'] += 1.0
+
+
+def replace_coords(project):
+    net = project.network
+    net['pore.coords'] = net['pore.coords'] * 2
+    return net['pore.coords'][:, 0].max()
+
+
+class ParameterSweepTest:
+
+    def setup_class(self):
+        self.ws = op.Workspace()
+        self.ws.clear()
+        self.net = op.network.Cubic(shape=[5, 5, 5])
+
+    def teardown_class(self):
+        self.ws.clear()
+
+    def test_serial(self):
+        sweep = op.utils.ParameterSweep(self.net.project, mean_seed,
+                                        processes=1, seed=0)
+        vals = sweep.run([{'high': 1}, {'high': 2}, {'high': 3}])
+        assert len(vals) == 3
+        assert vals[0] < vals[1] < vals[2]
+        # Template project is untouched and task projects are closed
+        assert len(self.net.project) == 1
+        assert len(self.ws) == 1
+        assert self.net['pore.coords'].flags.writeable
+
+    def test_reproducible(self):
+        sweep = op.utils.ParameterSweep(self.net.project, mean_seed,
+                                        processes=1, seed=7)
+        vals1 = sweep.run([{'high': 1}, {'high': 1}])
+        vals2 = sweep.run([{'high': 1}, {'high': 1}])
+        assert np.allclose(vals1, vals2)
+        # Each task gets a different seed
+        assert vals1[0] != vals1[1]
+
+    def test_parallel_matches_serial(self):
+        params = [{'high': h} for h in [1, 2, 3, 4]]
+        sweep = op.utils.ParameterSweep(self.net.project, mean_seed,
+                                        processes=1, seed=3)
+        vals1 = sweep.run(params)
+        sweep.processes = 2
+        vals2 = sweep.run(params)
+        assert np.allclose(vals1, vals2)
+
+    def test_shared_arrays_are_read_only(self):
+        sweep = op.utils.ParameterSweep(self.net.project, modify_coords,
+                                        processes=1)
+        with pytest.raises(ValueError):
+            sweep.run([{}])
+        sweep = op.utils.ParameterSweep(self.net.project, replace_coords,
+                                        processes=1)
+        vals = sweep.run([{}])
+        assert vals[0] == 2 * self.net['pore.coords'][:, 0].max()
+        assert len(self.ws) == 1
+
+
+if __name__ == '__main__':
+
+    t = ParameterSweepTest()
+    self = t
+    t.setup_class()
+    for item in t.__dir__():
+        if item.startswith('test'):
+            print(f"Running test {item}")
+            t.__getattribute__(item)()